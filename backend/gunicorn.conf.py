@@ -0,0 +1,67 @@
+"""
+Production launcher config for the FastAPI backend.
+
+    gunicorn -c gunicorn.conf.py main:app        (run from backend/)
+
+The model is loaded once in the master process before workers are forked,
+so every worker shares the booster's pages copy-on-write instead of holding
+its own copy; the first prediction (warm-up) happens in each worker. Worker count and inference threads per worker are tuned to the
+available cores and can be overridden through environment variables:
+
+    WEB_CONCURRENCY       number of worker processes (default: cores, max 8)
+    MODEL_THREADS         inference threads per worker (default: cores // workers)
+    GUNICORN_TIMEOUT      worker timeout in seconds (default: 120)
+    PRELOAD_MODEL         set to "0" to load the model in each worker instead
+"""
+import gc
+import os
+
+# ─── Sizing ───────────────────────────────────────────────────────────────────
+def _available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))  # Respects container CPU pinning
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+CORES = _available_cores()
+
+workers = int(os.getenv("WEB_CONCURRENCY", min(CORES, 8)))
+threads_per_worker = int(os.getenv("MODEL_THREADS", max(1, CORES // workers)))
+
+# Must be in the environment before the app (and xgboost/OpenMP) is imported
+os.environ["MODEL_THREADS"] = str(threads_per_worker)
+os.environ.setdefault("OMP_NUM_THREADS", str(threads_per_worker))
+
+# ─── Server ───────────────────────────────────────────────────────────────────
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+keepalive = 5
+preload_app = os.getenv("PRELOAD_MODEL", "1") != "0"
+
+
+# ─── Hooks ────────────────────────────────────────────────────────────────────
+def when_ready(server):
+    # Runs once in the master, before the first worker is forked (pre_fork
+    # would repeat this for every re-forked worker)
+    if preload_app:
+        from services.churn_predictor import get_model
+        from services.feature_store import get_table
+
+        # Load the model without scoring anything: a prediction would start
+        # XGBoost's OpenMP thread pool in the master, and children forked
+        # from a process with live libgomp threads can hang on their first
+        # predict. Each worker warms up in its own startup event.
+        get_model()
+        get_table()  # Map the feature table once; workers share the mapping
+
+        # Move everything allocated so far into the permanent generation so
+        # the cyclic GC in each worker never writes to (and un-shares) those
+        # pages
+        gc.freeze()
+
+    server.log.info(
+        f"Serving with {workers} workers x {threads_per_worker} inference threads "
+        f"on {CORES} cores (preload={'on' if preload_app else 'off'})"
+    )
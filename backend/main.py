@@ -1,7 +1,22 @@
-from fastapi import FastAPI, Form
+import os
+import time
+import uuid
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from services.churn_predictor import get_model, preprocess_input
-from typing import Dict
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from starlette.datastructures import FormData
+from services.churn_predictor import (
+    MODEL_BACKEND, get_model, preprocess_input, encode_record, decode_features,
+    rows_to_array, rows_to_frame, decode_float32_rows, decode_arrow_stream,
+    aggregate_customers, GROUP_FIELDS
+)
+from services.schemas import CustomerRecord, CustomerBatch, CustomerOverride
+from services.explainer import explain_rows
+from services import admission, audit_log, drift_monitor, feature_store, model_registry
+from services import metrics
+from typing import Dict, List, Literal, Optional
 
 app = FastAPI(
     title="Churn Prediction API",
@@ -18,13 +33,78 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ─── Request Metrics ──────────────────────────────────────────────────────────
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Count and time every request, labelled by route template"""
+    start = time.perf_counter()
+    status = "500"
+    admission.start_request(request.headers.get(admission.DEADLINE_HEADER))
+    model_registry.start_request(
+        request.headers.get(model_registry.ROUTING_HEADER), request.headers.get(model_registry.VARIANT_HEADER)
+    )
+    try:
+        if admission.guards(request.url.path):
+            # Admit before the body is read, so shed requests cost next to nothing
+            try:
+                async with admission.admit():
+                    response = await call_next(request)
+            except admission.Overloaded as e:
+                response = overloaded_response(e)
+        else:
+            response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        # Route templates keep label cardinality bounded (no raw paths)
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", "unmatched")
+        metrics.REQUEST_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+        metrics.REQUESTS.inc(endpoint=endpoint, method=request.method, status=status)
+
+def overloaded_response(exc: admission.Overloaded) -> JSONResponse:
+    """Fast rejection from admission control (see services/admission.py)"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+# ─── Rejected Inputs ──────────────────────────────────────────────────────────
+# Bodies that fail validation never reach the scoring endpoints; they still
+# feed the drift monitor, whose null / unknown-value rates track input quality
+OBSERVED_ON_REJECTION = {"/predict", "/predict/json", "/predict/json/batch"}
+
+@app.exception_handler(RequestValidationError)
+async def observe_rejected_input(request: Request, exc: RequestValidationError):
+    if request.url.path in OBSERVED_ON_REJECTION:
+        for record in _raw_records(exc.body):
+            drift_monitor.observe(record)
+    return await request_validation_exception_handler(request, exc)
+
+def _raw_records(body) -> list:
+    """Customer records in a rejected body: a form, one JSON object, or a
+    {"customers": [...]} batch (anything else yields nothing)"""
+    if isinstance(body, FormData):
+        return [dict(body)]
+    if not isinstance(body, dict):
+        return []
+    customers = body.get("customers")
+    if isinstance(customers, list):
+        return [c for c in customers if isinstance(c, dict)]
+    return [body]
+
 # ─── Startup Event: Preload Model ────────────────────────────────────────────
 @app.on_event("startup")
 async def startup_event():
     """Download and load model on startup to avoid cold start delays"""
     try:
         print("🚀 Starting up FastAPI server...")
-        model = get_model()  # This triggers download if needed
+        model_registry.get_registry().load()  # Downloads, loads and warms up every variant
+        model = get_model()
+        drift_monitor.get_monitor()  # Load the reference profile up front
+        feature_store.get_table()  # Map the customer feature table up front
+        metrics.record_cold_start()
         print(f"✅ Model ready: {type(model).__name__}")
         print("✅ Server ready to accept requests")
     except Exception as e:
@@ -33,6 +113,19 @@ async def startup_event():
         # Don't raise - let server start so /health still works
         # But predictions will fail until model loads
 
+    # Optional streaming scoring server sharing this process's model
+    if os.getenv("GRPC_PORT"):
+        from services.grpc_server import start_server
+
+        app.state.grpc_server = await start_server()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    audit_log.get_audit_log().close()
+    server = getattr(app.state, "grpc_server", None)
+    if server is not None:
+        await server.stop(grace=5)
+
 # ─── Health Check ─────────────────────────────────────────────────────────────
 @app.get("/health")
 def health_check():
@@ -51,6 +144,33 @@ def health_check():
             "error": str(e)
         }
 
+# ─── Metrics ──────────────────────────────────────────────────────────────────
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """Prometheus text exposition of request, stage and model metrics"""
+    return PlainTextResponse(
+        metrics.REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+# ─── Model Variants ───────────────────────────────────────────────────────────
+@app.get("/models")
+def list_models():
+    """Model variants with their role, traffic, version, file size and the
+    resident memory each added, plus the process total (see
+    services/model_registry.py)"""
+    return model_registry.get_registry().describe()
+
+# ─── Drift Monitoring ─────────────────────────────────────────────────────────
+@app.get("/monitoring/drift")
+def drift_report():
+    """Per-feature PSI/KS drift and null/unknown rates of live inputs over
+    the rolling window, against the training reference profile"""
+    monitor = drift_monitor.get_monitor()
+    if monitor is None:
+        return {"enabled": False, "reason": f"No reference profile at {drift_monitor.REFERENCE_PROFILE_PATH}"}
+    return {"enabled": True, **monitor.report()}
+
 # ─── Root Endpoint ────────────────────────────────────────────────────────────
 from fastapi.responses import HTMLResponse
 
@@ -74,7 +194,16 @@ async def root():
             <h2>Endpoints:</h2>
             <ul>
                 <li><code>GET /health</code> - Check API and model status</li>
+                <li><code>GET /metrics</code> - Prometheus metrics (latency, errors, model version)</li>
+                <li><code>GET /models</code> - Served, ensemble and shadow model variants, traffic split and memory use</li>
+                <li><code>GET /monitoring/drift</code> - Input drift and data-quality report</li>
                 <li><code>POST /predict</code> - Get churn prediction (19 fields required)</li>
+                <li><code>POST /predict/json</code>, <code>/predict/json/batch</code> - Same, as validated JSON</li>
+                <li><code>POST /predict/binary</code> - Pre-encoded float32 feature rows (23 per row) or Arrow IPC</li>
+                <li><code>GET|POST /predict/{customer_id}</code> - Score a known customer from the feature table (POST: with changed fields)</li>
+                <li><code>POST /aggregate/segments</code> - Upload a customer CSV, get count and average churn probability per group (<code>?group_by=Contract&amp;group_by=risk_level</code>)</li>
+                <li><code>POST /explain</code>, <code>/explain/batch</code> - Per-feature contributions (TreeSHAP; <code>?mode=fast</code> for approximate)</li>
+                <li><code>gRPC churn.ChurnScoring/ScoreStream</code> - Bidirectional scoring stream (when <code>GRPC_PORT</code> is set)</li>
                 <li><code>GET /docs</code> - Interactive API documentation (Swagger UI)</li>
             </ul>
             
@@ -123,6 +252,7 @@ async def predict_churn(
         - churn: Human-readable prediction
         - churn_probability: Percentage (0-100)
         - risk_level: High Risk / Medium Risk / Low Risk
+        - request_id: Key of this prediction in the audit log
     """
     form_data: Dict = {
         "gender": gender,
@@ -146,20 +276,203 @@ async def predict_churn(
         "TotalCharges": TotalCharges,
     }
     
+    started = time.perf_counter()
+    # Before preprocessing, so rejected values still count as unknown
+    drift_monitor.observe(form_data)
     try:
-        model = get_model()
-        processed = preprocess_input(form_data)
-        prediction = int(model.predict(processed)[0])
-        probability = float(model.predict_proba(processed)[0][1]) * 100
+        with metrics.track_stage("preprocess"):
+            processed = preprocess_input(form_data)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    variant, probabilities = await _score(processed)
+    return _audited_results("/predict", [form_data], variant, probabilities, started)[0]
 
-        return {
-            "prediction": prediction,
-            "churn": "Yes - Customer will likely churn" if prediction == 1 else "No - Customer will likely stay",
-            "churn_probability": round(probability, 1),
-            "risk_level": "High Risk" if probability > 70 else "Medium Risk" if probability > 40 else "Low Risk"
-        }
-    except Exception as e:
-        return {
-            "error": str(e),
-            "message": "Prediction failed. Check model and input data."
-        }
\ No newline at end of file
+async def _score(processed, customer_id: Optional[str] = None):
+    """Score model-ready rows with the variant the request routes to, in the
+    inference pool, recording batch size; shadow variants are queued after.
+    Returns (variant, probabilities)."""
+    metrics.BATCH_SIZE.observe(len(processed))
+    registry = model_registry.get_registry()
+    try:
+        variant = registry.route(processed, customer_id)
+    except model_registry.UnknownVariant as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    probabilities = await admission.run(_timed_score, variant, processed)
+    registry.shadow(processed, variant, probabilities, customer_id)
+    return variant, probabilities
+
+def _timed_score(variant, processed):
+    with metrics.track_stage("inference"):
+        return variant.score(processed, role="served")
+
+def _audited_results(endpoint: str, records: list, variant, probabilities, started: float) -> list:
+    """Format results at the serving variant's threshold, tagging each with a
+    request_id that is also written (with inputs, score, model version and
+    latency) to the audit log"""
+    request_ids = _audit(endpoint, records, variant, probabilities, started)
+    return [
+        {"request_id": request_id, **variant.format_result(probability)}
+        for request_id, probability in zip(request_ids, probabilities)
+    ]
+
+def _audit(endpoint: str, records: list, variant, probabilities, started: float) -> list:
+    """Write one audit record per scored row; returns their request_ids"""
+    latency_ms = (time.perf_counter() - started) * 1000
+    version = variant.version
+    now = time.time()
+    request_ids = []
+    for record, probability in zip(records, probabilities):
+        request_id = uuid.uuid4().hex
+        audit_log.record(
+            timestamp=now, request_id=request_id, endpoint=endpoint, model_version=version,
+            latency_ms=latency_ms, churn_probability=float(probability), **record
+        )
+        request_ids.append(request_id)
+    return request_ids
+
+# ─── JSON Endpoints ───────────────────────────────────────────────────────────
+@app.post("/predict/json")
+async def predict_churn_json(customer: CustomerRecord) -> Dict:
+    """Predict churn for one customer sent as a validated JSON object
+    (canonical category values, e.g. "Fiber optic", "Month-to-month")"""
+    started = time.perf_counter()
+    record = customer.model_dump()
+    drift_monitor.observe(record)
+    with metrics.track_stage("preprocess"):
+        processed = rows_to_frame(encode_record(record))
+    return _audited_results("/predict/json", [record], *await _score(processed), started)[0]
+
+@app.post("/predict/json/batch")
+async def predict_churn_json_batch(batch: CustomerBatch) -> Dict:
+    """Predict churn for up to 10k customers in one request"""
+    started = time.perf_counter()
+    records = [c.model_dump() for c in batch.customers]
+    for record in records:
+        drift_monitor.observe(record)
+    with metrics.track_stage("preprocess"):
+        processed = rows_to_frame([encode_record(r) for r in records])
+    return {"results": _audited_results("/predict/json/batch", records, *await _score(processed), started)}
+
+# ─── Binary Endpoint ──────────────────────────────────────────────────────────
+BINARY_MEDIA_TYPE = "application/octet-stream"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+@app.post("/predict/binary")
+async def predict_churn_binary(request: Request):
+    """
+    Score pre-encoded feature rows, skipping all string handling.
+
+    Body (by Content-Type):
+        - application/octet-stream: little-endian float32, 23 values per row in
+          the training column order (see services.churn_predictor.EXPECTED_COLS)
+        - application/vnd.apache.arrow.stream: Arrow IPC stream with those column names
+
+    Returns raw little-endian float32 churn probabilities (0-1) when the
+    Accept header is application/octet-stream, otherwise JSON (with the
+    audit request_id of each row). Rows are audited as the records their
+    features decode to.
+    """
+    started = time.perf_counter()
+    body = await request.body()
+    content_type = request.headers.get("content-type", BINARY_MEDIA_TYPE).split(";")[0].strip()
+    try:
+        with metrics.track_stage("decode"):
+            if content_type == ARROW_MEDIA_TYPE:
+                processed = decode_arrow_stream(body)
+            else:
+                processed = decode_float32_rows(body)
+    except ImportError:
+        raise HTTPException(status_code=415, detail="Arrow input requires pyarrow on the server")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    variant, probabilities = await _score(processed)
+    records = [decode_features(vector) for vector in processed.to_numpy()] if audit_log.ENABLED else []
+    request_ids = _audit("/predict/binary", records, variant, probabilities, started)
+    if BINARY_MEDIA_TYPE in request.headers.get("accept", ""):
+        return Response(probabilities.astype("<f4").tobytes(), media_type=BINARY_MEDIA_TYPE)
+    return {"probabilities": probabilities.tolist(), "request_ids": request_ids}
+
+# ─── Stored Customer Endpoints ────────────────────────────────────────────────
+# Declared after /predict/json and /predict/binary so those paths are not
+# captured as customer IDs
+@app.get("/predict/{customer_id}")
+async def predict_stored_customer(customer_id: str) -> Dict:
+    """Predict churn for a known customer from the precomputed feature table"""
+    return await _predict_stored("/predict/{customer_id}", customer_id, None)
+
+@app.post("/predict/{customer_id}")
+async def predict_stored_customer_override(customer_id: str, changes: Optional[CustomerOverride] = None) -> Dict:
+    """Same, with the fields that changed since the table was built
+    (e.g. {"Contract": "One year"}) applied on top of the stored features"""
+    return await _predict_stored("/predict/{customer_id}", customer_id, changes)
+
+async def _predict_stored(endpoint: str, customer_id: str, changes: Optional[CustomerOverride]) -> Dict:
+    started = time.perf_counter()
+    table = feature_store.get_table()
+    if table is None:
+        raise HTTPException(status_code=503, detail="Customer feature table is not available")
+    with metrics.track_stage("lookup"):
+        vector = table.lookup(customer_id)
+    if vector is None:
+        raise HTTPException(status_code=404, detail=f"Unknown customer: {customer_id}")
+
+    record = decode_features(vector)
+    if changes is not None:
+        record.update(changes.model_dump(exclude_none=True))
+        vector = encode_record(record)
+    drift_monitor.observe(record)
+    result = _audited_results(endpoint, [record], *await _score(rows_to_array(vector), customer_id), started)[0]
+    return {"customer_id": customer_id, **result}
+
+# ─── Explanation Endpoints ────────────────────────────────────────────────────
+@app.post("/explain")
+async def explain_churn(customer: CustomerRecord, mode: Literal["exact", "fast"] = "exact") -> Dict:
+    """
+    Explain one prediction with per-feature contributions (log-odds).
+
+    mode=exact uses TreeSHAP; mode=fast uses the approximate Saabas method,
+    which is several times cheaper for latency-sensitive callers.
+    """
+    _require_native_model()
+    with metrics.track_stage("preprocess"):
+        processed = rows_to_frame(encode_record(customer.model_dump()))
+    return (await admission.run(_timed_explain, processed, mode))[0]
+
+@app.post("/explain/batch")
+async def explain_churn_batch(batch: CustomerBatch, mode: Literal["exact", "fast"] = "exact") -> Dict:
+    """Explain up to 10k predictions in one booster call (cached rows are skipped)"""
+    _require_native_model()
+    with metrics.track_stage("preprocess"):
+        processed = rows_to_frame([encode_record(c.model_dump()) for c in batch.customers])
+    metrics.BATCH_SIZE.observe(len(processed))
+    return {"results": await admission.run(_timed_explain, processed, mode)}
+
+def _timed_explain(processed, mode: str) -> list:
+    with metrics.track_stage(f"explain_{mode}"):
+        return explain_rows(processed, mode)
+
+def _require_native_model():
+    """Contributions come from the XGBoost booster, which the ONNX backend
+    does not load"""
+    if MODEL_BACKEND != "native":
+        raise HTTPException(status_code=501, detail="Explanations need MODEL_BACKEND=native")
+
+# ─── Segment Aggregation ──────────────────────────────────────────────────────
+@app.post("/aggregate/segments")
+def aggregate_segments(
+    file: UploadFile = File(..., description="Raw customer CSV (Telco columns)"),
+    group_by: List[str] = Query(["risk_level"], description=f"One or more of {GROUP_FIELDS}"),
+) -> Dict:
+    """
+    Score a whole customer file and return, per group_by group, the customer
+    count, average churn probability and predicted churners, without
+    returning (or keeping) a result per customer.
+
+    A long bulk job: it runs in the threadpool outside the prediction
+    admission slots, and its chunks are scored in parallel.
+    """
+    try:
+        return aggregate_customers(file.file, group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
@@ -0,0 +1,162 @@
+"""
+Admission control for the scoring endpoints, so a burst cannot push latency
+up without bound.
+
+Requests to the scoring routes (GUARDED_PREFIXES) are admitted at the edge,
+before their body is read or validated, behind a concurrency limit; the rest
+wait in a bounded FIFO queue. Each request carries a deadline that starts
+when it arrives: DEADLINE_MS, or less if the client sends
+X-Request-Deadline-Ms. A request that is still queued when its deadline
+passes is dropped before any work is done for it. Both kinds of rejection
+are answered at once with Retry-After:
+
+    429  the wait queue is full (shed on arrival)
+    503  the deadline expired while waiting for a slot
+
+Admitted requests run inference in a small thread pool (run()), so the event
+loop stays free to shed, queue and answer /health while a slot is busy.
+Work that has already started always finishes; the deadline only bounds how
+long a request may wait. With MAX_CONCURRENT_PREDICTIONS=0 the guard is off
+and inference runs inline, as it did before.
+"""
+import asyncio
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from services import metrics
+
+# ─── Configuration ────────────────────────────────────────────────────────────
+MAX_CONCURRENT = int(os.getenv("MAX_CONCURRENT_PREDICTIONS", "2"))
+MAX_QUEUED = int(os.getenv("MAX_QUEUED_PREDICTIONS", "64"))
+DEADLINE_MS = float(os.getenv("REQUEST_DEADLINE_MS", "1000"))
+RETRY_AFTER_SECONDS = float(os.getenv("RETRY_AFTER_SECONDS", "1"))
+
+DEADLINE_HEADER = "x-request-deadline-ms"
+GUARDED_PREFIXES = ("/predict", "/explain")
+
+REJECTED = metrics.REGISTRY.register(metrics.Counter(
+    "churn_admission_rejected_total", "Requests rejected by admission control, by reason", ("reason",)
+))
+IN_FLIGHT = metrics.REGISTRY.register(metrics.Gauge(
+    "churn_admission_in_flight", "Admitted scoring requests currently running"
+))
+QUEUED = metrics.REGISTRY.register(metrics.Gauge(
+    "churn_admission_queued", "Requests waiting for an inference slot"
+))
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class Overloaded(Exception):
+    """Rejected by admission control; answered with status and Retry-After"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = max(1, math.ceil(RETRY_AFTER_SECONDS))
+
+
+# ─── Deadlines ────────────────────────────────────────────────────────────────
+def start_request(deadline_header: Optional[str] = None):
+    """Set the deadline of the current request. Call this when the request
+    arrives. The client's X-Request-Deadline-Ms can only shorten
+    DEADLINE_MS."""
+    budget_ms = DEADLINE_MS
+    if deadline_header:
+        try:
+            budget_ms = min(budget_ms, max(0.0, float(deadline_header)))
+        except ValueError:
+            pass
+    _deadline.set(time.monotonic() + budget_ms / 1000)
+
+
+def _current_deadline() -> float:
+    deadline = _deadline.get()
+    return deadline if deadline is not None else time.monotonic() + DEADLINE_MS / 1000
+
+
+# ─── Guard ────────────────────────────────────────────────────────────────────
+class AdmissionController:
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT, max_queued: int = MAX_QUEUED):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._slots = asyncio.Semaphore(max(1, max_concurrent))
+        self._executor = None
+        self._queued = 0
+        self._in_flight = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrent > 0
+
+    def guards(self, path: str) -> bool:
+        return self.enabled and path.startswith(GUARDED_PREFIXES)
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold a slot for the body of the block, or raise Overloaded"""
+        deadline = _current_deadline()
+        if self._slots.locked():
+            if self._queued >= self.max_queued:
+                REJECTED.inc(reason="queue_full")
+                raise Overloaded(429, "Too many queued predictions, retry later")
+            self._queued += 1
+            QUEUED.set(self._queued)
+            try:
+                with metrics.track_stage("queue"):
+                    await asyncio.wait_for(self._slots.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                REJECTED.inc(reason="deadline")
+                raise Overloaded(503, "Prediction deadline expired while queued")
+            finally:
+                self._queued -= 1
+                QUEUED.set(self._queued)
+        else:
+            await self._slots.acquire()
+
+        self._in_flight += 1
+        IN_FLIGHT.set(self._in_flight)
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            IN_FLIGHT.set(self._in_flight)
+            self._slots.release()
+
+    async def run(self, fn, *args):
+        """fn(*args) in the inference pool (inline when the guard is off)"""
+        if not self.enabled:
+            return fn(*args)
+        if self._executor is None:
+            # Created on first use so each forked gunicorn worker gets its own
+            self._executor = ThreadPoolExecutor(self.max_concurrent, thread_name_prefix="inference")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+
+_controller = AdmissionController()
+
+
+def enabled() -> bool:
+    """Whether admission control is on (MAX_CONCURRENT_PREDICTIONS > 0)"""
+    return _controller.enabled
+
+
+def guards(path: str) -> bool:
+    """Whether requests to path go through admission control"""
+    return _controller.guards(path)
+
+
+def admit():
+    """Async context manager holding one slot of the process-wide controller"""
+    return _controller.admit()
+
+
+async def run(fn, *args):
+    """Run one inference call in the process-wide inference pool"""
+    return await _controller.run(fn, *args)
@@ -0,0 +1,242 @@
+"""
+Asynchronous prediction audit log.
+
+Every prediction (raw inputs, probability, model version, latency) is
+appended to a bounded in-memory buffer on the request path and written out
+by a background thread in batches, as compressed columnar segment files:
+
+    <AUDIT_LOG_DIR>/audit-<unix ms>-<pid>-<seq>.npz
+
+Each segment is a zlib-compressed .npz holding one array per column, written
+to a temp file and atomically renamed, so readers never see partial files.
+Old segments are deleted once AUDIT_MAX_SEGMENTS is exceeded.
+
+When the buffer is full AUDIT_FULL_POLICY decides what happens:
+
+    drop_newest   reject the incoming record (default, never slows requests)
+    drop_oldest   evict the oldest buffered record
+    block         wait up to AUDIT_BLOCK_MS for space, then drop the record
+
+Segments can be turned back into the raw Telco CSV layout DataTransformation
+reads, for retraining once churn outcomes are known:
+
+    python -m services.audit_log export --out new_data.csv [--labels labels.csv]
+"""
+import argparse
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from services import metrics
+
+AUDIT_LOG_DIR = Path(os.getenv("AUDIT_LOG_DIR", "/tmp/churn_audit"))
+BUFFER_SIZE = int(os.getenv("AUDIT_BUFFER_SIZE", "50000"))
+BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "5000"))
+FLUSH_SECONDS = float(os.getenv("AUDIT_FLUSH_SECONDS", "5"))
+MAX_SEGMENTS = int(os.getenv("AUDIT_MAX_SEGMENTS", "10000"))
+FULL_POLICY = os.getenv("AUDIT_FULL_POLICY", "drop_newest")
+BLOCK_MS = float(os.getenv("AUDIT_BLOCK_MS", "5"))
+ENABLED = os.getenv("AUDIT_LOG_ENABLED", "1") != "0"
+
+# Raw input columns, in the order of the Telco CSV DataTransformation reads
+RAW_COLUMNS = [
+    "gender", "SeniorCitizen", "Partner", "Dependents", "tenure", "PhoneService",
+    "MultipleLines", "InternetService", "OnlineSecurity", "OnlineBackup",
+    "DeviceProtection", "TechSupport", "StreamingTV", "StreamingMovies",
+    "Contract", "PaperlessBilling", "PaymentMethod", "MonthlyCharges", "TotalCharges",
+]
+NUMERIC_COLUMNS = {"SeniorCitizen", "tenure", "MonthlyCharges", "TotalCharges"}
+# client_id: the caller's own label for a row (gRPC "id"), when it sent one
+META_COLUMNS = ["timestamp", "request_id", "client_id", "endpoint", "model_version", "latency_ms", "churn_probability"]
+
+WRITTEN = metrics.REGISTRY.register(metrics.Counter(
+    "churn_audit_records_written_total", "Prediction records written to audit segments"
+))
+DROPPED = metrics.REGISTRY.register(metrics.Counter(
+    "churn_audit_records_dropped_total", "Prediction records dropped because the audit buffer was full", ("policy",)
+))
+SEGMENTS = metrics.REGISTRY.register(metrics.Counter(
+    "churn_audit_segments_written_total", "Audit segment files written"
+))
+
+
+# ─── Writer ───────────────────────────────────────────────────────────────────
+class AuditLog:
+    def __init__(self, directory: Path = AUDIT_LOG_DIR, buffer_size: int = BUFFER_SIZE,
+                 policy: str = FULL_POLICY):
+        if policy not in ("drop_newest", "drop_oldest", "block"):
+            raise ValueError(f"Unknown audit buffer policy: {policy}")
+        self.directory = Path(directory)
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self._buffer = deque(maxlen=buffer_size if policy == "drop_oldest" else None)
+        self._space = threading.Condition()
+        self._writer = None
+        self._stopped = False
+        # One flush at a time (writer thread, close, callers); also guards _seq
+        self._flush_lock = threading.Lock()
+        self._seq = 0
+
+    def record(self, **entry):
+        """Buffer one prediction record; never does I/O on the caller's thread"""
+        if len(self._buffer) >= self.buffer_size:
+            if self.policy == "drop_oldest":
+                DROPPED.inc(policy=self.policy)  # deque(maxlen) evicts the oldest
+            elif self.policy == "drop_newest" or not self._wait_for_space():
+                DROPPED.inc(policy=self.policy)
+                return
+        self._buffer.append(entry)
+        if self._writer is None:
+            self._start_writer()
+
+    def _wait_for_space(self) -> bool:
+        with self._space:
+            return self._space.wait_for(lambda: len(self._buffer) < self.buffer_size, BLOCK_MS / 1000)
+
+    def _start_writer(self):
+        with self._space:
+            if self._writer is None:
+                # Started lazily so each forked gunicorn worker gets its own
+                self._writer = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while not self._stopped:
+            time.sleep(0.2)
+            if len(self._buffer) >= BATCH_SIZE or time.monotonic() - last_flush >= FLUSH_SECONDS:
+                self.flush()
+                last_flush = time.monotonic()
+
+    def flush(self):
+        """Write everything buffered so far as one or more segments"""
+        with self._flush_lock:
+            while self._buffer:
+                batch = []
+                while self._buffer and len(batch) < BATCH_SIZE:
+                    batch.append(self._buffer.popleft())
+                with self._space:
+                    self._space.notify_all()
+                try:
+                    self._write_segment(batch)
+                except Exception as e:
+                    metrics.ERRORS.inc(stage="audit_write", type=type(e).__name__)
+                    print(f"❌ Failed to write audit segment: {e}")
+
+    def _write_segment(self, batch: list):
+        import numpy as np
+
+        columns = {}
+        for name in META_COLUMNS + RAW_COLUMNS:
+            values = [entry.get(name) for entry in batch]
+            if name in NUMERIC_COLUMNS or name in ("timestamp", "latency_ms", "churn_probability"):
+                columns[name] = np.array([_to_float(v) for v in values], dtype=np.float64)
+            else:
+                columns[name] = np.array(["" if v is None else str(v) for v in values])
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._seq += 1
+        name = f"audit-{int(time.time() * 1000)}-{os.getpid()}-{self._seq:06d}.npz"
+        tmp = self.directory / f".{name}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **columns)
+        os.replace(tmp, self.directory / name)
+        WRITTEN.inc(len(batch))
+        SEGMENTS.inc()
+        self._rotate()
+
+    def _rotate(self):
+        segments = sorted(self.directory.glob("audit-*.npz"))
+        for old in segments[:max(0, len(segments) - MAX_SEGMENTS)]:
+            old.unlink(missing_ok=True)
+
+    def close(self):
+        """Stop the writer thread, then write what is still buffered"""
+        self._stopped = True
+        writer = self._writer
+        if writer is not None and writer is not threading.current_thread():
+            writer.join()
+        self.flush()
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def get_audit_log():
+    if not hasattr(get_audit_log, "log"):
+        get_audit_log.log = AuditLog()
+    return get_audit_log.log
+
+
+def record(**entry):
+    """Audit one prediction (no-op when AUDIT_LOG_ENABLED=0)"""
+    if ENABLED:
+        get_audit_log().record(**entry)
+
+
+# ─── Reader ───────────────────────────────────────────────────────────────────
+def read_segments(directory: Path = AUDIT_LOG_DIR, since: float = None):
+    """Load audit segments into one DataFrame (optionally only records after
+    the unix timestamp `since`)"""
+    import numpy as np
+    import pandas as pd
+
+    frames = []
+    for path in sorted(Path(directory).glob("audit-*.npz")):
+        with np.load(path) as segment:
+            frames.append(pd.DataFrame({name: segment[name] for name in segment.files}))
+    if not frames:
+        return pd.DataFrame(columns=META_COLUMNS + RAW_COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
+    if since is not None:
+        df = df[df["timestamp"] > since]
+    return df
+
+
+def to_training_frame(audit, labels=None):
+    """
+    Reshape audit records into the raw Telco CSV layout (customerID, the 19
+    input columns, Churn) that DataTransformation.initiate_data_transformation reads.
+
+    labels: optional DataFrame with request_id (or customerID) and Churn
+    ("Yes"/"No"); records without a label are dropped when labels are given.
+    """
+    df = audit[["request_id"] + RAW_COLUMNS].rename(columns={"request_id": "customerID"})
+    df["SeniorCitizen"] = df["SeniorCitizen"].astype("Int64")
+    df["tenure"] = df["tenure"].astype("Int64")
+    if labels is None:
+        df["Churn"] = ""
+        return df
+    labels = labels.rename(columns={"request_id": "customerID"})[["customerID", "Churn"]]
+    return df.merge(labels, on="customerID", how="inner")
+
+
+def _main():
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Audit log utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Write segments as a DataTransformation input CSV")
+    export.add_argument("--dir", type=Path, default=AUDIT_LOG_DIR)
+    export.add_argument("--out", type=Path, required=True)
+    export.add_argument("--labels", type=Path, help="CSV with request_id/customerID and Churn columns")
+    export.add_argument("--since", type=float, help="Only records after this unix timestamp")
+    args = parser.parse_args()
+
+    audit = read_segments(args.dir, args.since)
+    labels = pd.read_csv(args.labels) if args.labels else None
+    frame = to_training_frame(audit, labels)
+    frame.to_csv(args.out, index=False)
+    print(f"✅ Exported {len(frame)} records to {args.out}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -1,8 +1,25 @@
-import pandas as pd
 from pathlib import Path
-import joblib
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit, urlunsplit
 import os
-import requests
+import sys
+from services.metrics import track_stage, set_model_info
+
+# The inference core (encoding, model handle, result formatting) is shared
+# with app.py and PredictionPipeline and lives at the repository root
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from churn_inference import (  # noqa: E402
+    EXPECTED_COLS, N_FEATURES, DECISION_THRESHOLD, HIGH_RISK_ABOVE, MEDIUM_RISK_ABOVE,
+    NATIVE_SUFFIXES, ModelHandle, sidecar_path, preprocess_input, encode_record, decode_features,
+    rows_to_array, rows_to_frame, format_result as _format_result
+)
+from churn_inference.segments import GROUP_FIELDS, aggregate_segments  # noqa: E402
+
+# pandas, joblib and requests are imported inside the functions that use them
+# so that importing this module (and the app) stays fast on cold start.
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 # ─── Configuration ────────────────────────────────────────────────────────────
 # Set this environment variable in Koyeb dashboard
@@ -11,105 +28,139 @@ MODEL_URL = os.getenv(
     "https://your-bucket.s3.amazonaws.com/model.joblib"  # Replace with your actual URL
 )
 
-LOCAL_MODEL_PATH = Path("/tmp/model.joblib")  # Use /tmp for serverless/container environments
+# native: XGBClassifier from model.ubj (fetched with its model.meta.json
+# sidecar) or a model.joblib pickle; onnx: the training pipeline's ONNX
+# export scored with ONNX Runtime (MODEL_URL must then point at model.onnx)
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "native")
+
+# The cached file keeps the URL's extension, which selects the format.
+# Use /tmp for serverless/container environments
+LOCAL_MODEL_PATH = Path("/tmp") / ("model" + (Path(urlsplit(MODEL_URL).path).suffix or ".joblib"))
+
+# Optional explicit version label; falls back to a hash of the model file
+MODEL_VERSION = os.getenv("MODEL_VERSION")
+
+# Inference threads per process (0 = library default). The gunicorn launcher
+# sets this to cores // workers so workers don't oversubscribe the CPU.
+MODEL_THREADS = int(os.getenv("MODEL_THREADS", "0"))
 
 # ─── Model Loading ────────────────────────────────────────────────────────────
-def download_model():
-    """Download model from cloud storage if not already cached"""
-    if LOCAL_MODEL_PATH.exists():
-        print(f"✅ Model already cached at {LOCAL_MODEL_PATH}")
+def download_model(url: str = MODEL_URL, local_path: Path = LOCAL_MODEL_PATH):
+    """Download a model (MODEL_URL by default) from cloud storage if not
+    already cached"""
+    if local_path.exists():
+        print(f"✅ Model already cached at {local_path}")
         return
     
-    print(f"📥 Downloading model from {MODEL_URL}...")
+    print(f"📥 Downloading model from {url}...")
+    import requests
+
     try:
-        response = requests.get(MODEL_URL, timeout=60)
-        response.raise_for_status()
-        
-        # Ensure directory exists
-        LOCAL_MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Save model
-        LOCAL_MODEL_PATH.write_bytes(response.content)
-        print(f"✅ Model downloaded successfully ({len(response.content) / 1024 / 1024:.2f} MB)")
+        with track_stage("download_model"):
+            # Ensure directory exists
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+
+            downloads = [(url, local_path)]
+            if local_path.suffix in NATIVE_SUFFIXES:
+                # Native model files come with their JSON sidecar
+                downloads.insert(0, (_sidecar_url(url), sidecar_path(local_path)))
+            size = 0
+            for file_url, path in downloads:
+                response = requests.get(file_url, timeout=60)
+                response.raise_for_status()
+                
+                # Save model (the model file last: its presence means "cached")
+                path.write_bytes(response.content)
+                size += len(response.content)
+        print(f"✅ Model downloaded successfully ({size / 1024 / 1024:.2f} MB)")
     except Exception as e:
         print(f"❌ Failed to download model: {e}")
-        raise RuntimeError(f"Could not download model from {MODEL_URL}") from e
+        raise RuntimeError(f"Could not download model from {url}") from e
+
+def _sidecar_url(url: str) -> str:
+    """.../model.ubj?sig=... -> .../model.meta.json?sig=..."""
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(path=str(sidecar_path(Path(parts.path)))))
+
+MODEL = ModelHandle(LOCAL_MODEL_PATH, threads=MODEL_THREADS, version=MODEL_VERSION, backend=MODEL_BACKEND)
 
 def get_model():
     """Load model lazily on first call"""
-    if not hasattr(get_model, "model"):
+    if not MODEL.loaded:
         # Download if needed
         if not LOCAL_MODEL_PATH.exists():
             download_model()
         
-        # Load model
         print(f"📦 Loading model from {LOCAL_MODEL_PATH}...")
-        get_model.model = joblib.load(LOCAL_MODEL_PATH)
-        print(f"✅ Model loaded: {type(get_model.model).__name__}")
+        with track_stage("load_model"):
+            model = MODEL.load()
+        set_model_info(MODEL.version, type(model).__name__, LOCAL_MODEL_PATH.stat().st_size)
+        print(f"✅ Model loaded: {type(model).__name__} (version {MODEL.version})")
     
-    return get_model.model
+    return MODEL.model
 
-# ─── Preprocessing ────────────────────────────────────────────────────────────
-def preprocess_input(form_data: dict) -> pd.DataFrame:
-    """Transform form data into model-ready format"""
-    
-    # Normalize keys and values (case insensitive, defaults)
-    def get_val(key, default=None):
-        val = form_data.get(key, form_data.get(key.lower(), default))
-        if val is None:
-            return default
-        if isinstance(val, str):
-            val = val.strip().title()
-        return val
-
-    data = {
-        'gender': 1 if get_val('gender') == 'Male' else 0,
-        'SeniorCitizen': int(get_val('SeniorCitizen', 0)),
-        'Partner': 1 if get_val('Partner') == 'Yes' else 0,
-        'Dependents': 1 if get_val('Dependents') == 'Yes' else 0,
-        'tenure': int(get_val('tenure', 0)),
-        'PhoneService': 1 if get_val('PhoneService') == 'Yes' else 0,
-        'MultipleLines': 1 if get_val('MultipleLines') == 'Yes' else 0,
-        'OnlineSecurity': 1 if get_val('OnlineSecurity') == 'Yes' else 0,
-        'OnlineBackup': 1 if get_val('OnlineBackup') == 'Yes' else 0,
-        'DeviceProtection': 1 if get_val('DeviceProtection') == 'Yes' else 0,
-        'TechSupport': 1 if get_val('TechSupport') == 'Yes' else 0,
-        'StreamingTV': 1 if get_val('StreamingTV') == 'Yes' else 0,
-        'StreamingMovies': 1 if get_val('StreamingMovies') == 'Yes' else 0,
-        'PaperlessBilling': 1 if get_val('PaperlessBilling') == 'Yes' else 0,
-        'MonthlyCharges': float(get_val('MonthlyCharges', 0.0)),
-        'TotalCharges': float(get_val('TotalCharges', 0.0)),
-    }
-    
-    df = pd.DataFrame([data])
-    
-    # One-hot encode
-    internet_service = get_val('InternetService', 'No').title()
-    df['InternetService_Fiber optic'] = 1 if 'Fiber' in internet_service else 0
-    df['InternetService_No'] = 1 if internet_service == 'No' else 0
-    
-    contract = get_val('Contract', 'Month-to-month').title()
-    df['Contract_One year'] = 1 if 'One' in contract else 0
-    df['Contract_Two year'] = 1 if 'Two' in contract else 0
-    
-    payment = get_val('PaymentMethod', '').title()
-    df['PaymentMethod_Credit card (automatic)'] = 1 if 'Credit Card' in payment else 0
-    df['PaymentMethod_Electronic check'] = 1 if 'Electronic' in payment else 0
-    df['PaymentMethod_Mailed check'] = 1 if 'Mailed' in payment else 0
-    
-    # Expected columns (must match training)
-    expected_cols = [
-        'gender', 'SeniorCitizen', 'Partner', 'Dependents', 'tenure', 
-        'PhoneService', 'MultipleLines', 'OnlineSecurity', 'OnlineBackup', 
-        'DeviceProtection', 'TechSupport', 'StreamingTV', 'StreamingMovies', 
-        'PaperlessBilling', 'MonthlyCharges', 'TotalCharges',
-        'InternetService_Fiber optic', 'InternetService_No',
-        'Contract_One year', 'Contract_Two year',
-        'PaymentMethod_Credit card (automatic)',
-        'PaymentMethod_Electronic check',
-        'PaymentMethod_Mailed check'
-    ]
-    
-    df = df[expected_cols]
-    
-    return df
\ No newline at end of file
+def get_model_version() -> str:
+    """Version label of the loaded model (loads it if necessary)"""
+    get_model()
+    return MODEL.version
+
+def warm_up():
+    """Run one dummy prediction so the first real request doesn't pay for
+    the deferred pandas import and xgboost's first-call allocations"""
+    get_model()
+    with track_stage("warm_up"):
+        MODEL.warm_up()
+
+# ─── Binary Input ─────────────────────────────────────────────────────────────
+# Upper bound on rows accepted in one binary request
+MAX_BINARY_ROWS = int(os.getenv("MAX_BINARY_ROWS", "100000"))
+
+def decode_float32_rows(body: bytes) -> "pd.DataFrame":
+    """Decode raw little-endian float32 rows (23 values each, EXPECTED_COLS
+    order) without copying the buffer"""
+    import numpy as np
+
+    row_bytes = 4 * N_FEATURES
+    if not body or len(body) % row_bytes:
+        raise ValueError(f"Body must be a non-empty multiple of {row_bytes} bytes ({N_FEATURES} float32 values per row)")
+    if len(body) // row_bytes > MAX_BINARY_ROWS:
+        raise ValueError(f"At most {MAX_BINARY_ROWS} rows per request")
+    return rows_to_frame(np.frombuffer(body, dtype="<f4"))
+
+def decode_arrow_stream(body: bytes) -> "pd.DataFrame":
+    """Decode an Arrow IPC stream whose columns include EXPECTED_COLS
+    (requires the optional pyarrow dependency)"""
+    import numpy as np
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(body).read_all()
+    missing = [c for c in EXPECTED_COLS if c not in table.column_names]
+    if missing:
+        raise ValueError(f"Arrow stream is missing columns: {missing}")
+    if table.num_rows == 0 or table.num_rows > MAX_BINARY_ROWS:
+        raise ValueError(f"Arrow stream must contain 1 to {MAX_BINARY_ROWS} rows")
+    columns = [table.column(c).to_numpy().astype(np.float32, copy=False) for c in EXPECTED_COLS]
+    return rows_to_frame(np.column_stack(columns))
+
+# ─── Scoring ──────────────────────────────────────────────────────────────────
+def score(processed) -> "np.ndarray":
+    """Churn probabilities (0-1) for a batch of model-ready rows"""
+    get_model()
+    return MODEL.score(processed)
+
+# ─── Segment Aggregation ──────────────────────────────────────────────────────
+# Threads scoring chunks of an uploaded customer file in parallel
+SEGMENT_WORKERS = int(os.getenv("SEGMENT_WORKERS", "2"))
+SEGMENT_CHUNK_ROWS = int(os.getenv("SEGMENT_CHUNK_ROWS", "50000"))
+
+def aggregate_customers(source, group_by) -> dict:
+    """Per-group churn summary of a raw customer CSV (see
+    churn_inference.segments); no per-customer results are kept"""
+    get_model()
+    with track_stage("aggregate"):
+        return aggregate_segments(source, MODEL, group_by, chunk_rows=SEGMENT_CHUNK_ROWS, workers=SEGMENT_WORKERS)
+
+def format_result(probability: float) -> dict:
+    """Response payload for one customer, at the loaded model's threshold
+    and risk bands"""
+    return _format_result(probability, threshold=MODEL.threshold, risk_bands=MODEL.risk_bands)
@@ -0,0 +1,242 @@
+"""
+Online drift and data-quality monitor for the live prediction stream.
+
+Raw request fields are compared against the reference profile that
+DataTransformation.save_reference_profile writes at training time:
+
+    numeric features      counts per reference quantile bin, nulls, and
+                          values outside the reference [min, max]
+    categorical features  counts per reference category, nulls, and
+                          unknown values (ones preprocess_input would
+                          silently encode as all-zero)
+
+Counts live in a fixed ring of time slots covering DRIFT_WINDOW_SECONDS, so
+memory does not grow with traffic. On the request path observe() only
+appends to a bounded deque; a daemon thread folds pending records into the
+sketches and periodically refreshes PSI / KS scores, which report() and the
+Prometheus gauges read.
+"""
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from pathlib import Path
+
+from services import metrics
+
+REFERENCE_PROFILE_PATH = Path(os.getenv(
+    "REFERENCE_PROFILE_PATH",
+    Path(__file__).resolve().parents[2] / "artifacts" / "data_transformation" / "reference_profile.json",
+))
+WINDOW_SECONDS = int(os.getenv("DRIFT_WINDOW_SECONDS", "3600"))
+N_SLOTS = int(os.getenv("DRIFT_SLOTS", "12"))
+PENDING_LIMIT = int(os.getenv("DRIFT_PENDING_LIMIT", "100000"))
+REFRESH_SECONDS = float(os.getenv("DRIFT_REFRESH_SECONDS", "30"))
+
+# Conventional PSI reading: < 0.1 stable, 0.1-0.25 moderate, > 0.25 significant
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+_EPS = 1e-4
+
+FEATURE_PSI = metrics.REGISTRY.register(metrics.Gauge(
+    "churn_feature_psi", "Population stability index of a feature over the drift window", ("feature",)
+))
+FEATURE_ISSUE_RATE = metrics.REGISTRY.register(metrics.Gauge(
+    "churn_feature_issue_rate", "Share of null or unknown/out-of-range values over the drift window", ("feature", "issue")
+))
+DROPPED = metrics.REGISTRY.register(metrics.Counter(
+    "churn_drift_dropped_total", "Records not monitored because the pending queue was full"
+))
+
+
+# ─── Per-feature Sketch ───────────────────────────────────────────────────────
+class _FeatureSketch:
+    """Fixed-size counts for one feature: one row of bins per time slot"""
+
+    def __init__(self, name: str, spec: dict):
+        self.name = name
+        self.numeric = spec["type"] == "numeric"
+        if self.numeric:
+            self.edges = spec["edges"]
+            self.reference = spec["proportions"]
+            self.low, self.high = spec["min"], spec["max"]
+        else:
+            self.categories = list(spec["proportions"])
+            self.index = {c: i for i, c in enumerate(self.categories)}
+            self.reference = list(spec["proportions"].values())
+        n_bins = len(self.reference)
+        # Per slot: bin counts, then null count, then unknown/out-of-range count
+        self.slots = [[0] * (n_bins + 2) for _ in range(N_SLOTS)]
+
+    def reset_slot(self, position: int):
+        row = self.slots[position]
+        for i in range(len(row)):
+            row[i] = 0
+
+    def add(self, position: int, value):
+        row = self.slots[position]
+        if value is None or value == "":
+            row[-2] += 1
+            return
+        if self.numeric:
+            try:
+                x = float(value)
+            except (TypeError, ValueError):
+                row[-2] += 1
+                return
+            row[bisect_right(self.edges, x)] += 1
+            if x < self.low or x > self.high:
+                row[-1] += 1
+        else:
+            i = self.index.get(str(value).strip())
+            if i is None:
+                row[-1] += 1
+            else:
+                row[i] += 1
+
+    def summarize(self, positions: list) -> dict:
+        totals = [sum(col) for col in zip(*(self.slots[p] for p in positions))]
+        bins, nulls, issues = totals[:-2], totals[-2], totals[-1]
+        observed = sum(bins) + (0 if self.numeric else issues)
+        n = observed + nulls
+        summary = {
+            "type": "numeric" if self.numeric else "categorical",
+            "n": n,
+            "null_rate": nulls / n if n else 0.0,
+            ("out_of_range_rate" if self.numeric else "unknown_rate"): issues / n if n else 0.0,
+        }
+        if not sum(bins):
+            summary["psi"] = None
+            return summary
+
+        live = [b / sum(bins) for b in bins]
+        summary["psi"] = sum(
+            (a - e) * math.log(a / e)
+            for a, e in ((max(a, _EPS), max(e, _EPS)) for a, e in zip(live, self.reference))
+        )
+        if self.numeric:
+            # KS statistic on the binned CDFs (resolution = reference quantile bins)
+            ks = cum_live = cum_ref = 0.0
+            for a, e in zip(live, self.reference):
+                cum_live += a
+                cum_ref += e
+                ks = max(ks, abs(cum_live - cum_ref))
+            summary["ks"] = ks
+        summary["status"] = (
+            "significant" if summary["psi"] > PSI_SIGNIFICANT
+            else "moderate" if summary["psi"] > PSI_MODERATE else "stable"
+        )
+        return summary
+
+
+# ─── Monitor ──────────────────────────────────────────────────────────────────
+class DriftMonitor:
+    def __init__(self, profile: dict):
+        self.features = {name: _FeatureSketch(name, spec) for name, spec in profile["features"].items()}
+        self.reference_rows = profile.get("n_rows")
+        self.slot_seconds = WINDOW_SECONDS / N_SLOTS
+        self.slot_ids = [None] * N_SLOTS
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._last_report = None
+
+    # Request path: O(1), never blocks on sketch updates
+    def observe(self, record: dict):
+        if len(self._pending) >= PENDING_LIMIT:
+            DROPPED.inc()
+            return
+        self._pending.append((time.time(), record))
+        if self._worker is None:
+            self._start_worker()
+
+    def _start_worker(self):
+        with self._lock:
+            if self._worker is None:
+                # Started lazily so each forked gunicorn worker gets its own
+                self._worker = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        last_refresh = 0.0
+        while True:
+            time.sleep(1.0)
+            self.drain()
+            if time.time() - last_refresh >= REFRESH_SECONDS:
+                self.refresh()
+                last_refresh = time.time()
+
+    def _position(self, timestamp: float) -> int:
+        slot_id = int(timestamp // self.slot_seconds)
+        position = slot_id % N_SLOTS
+        if self.slot_ids[position] != slot_id:
+            for sketch in self.features.values():
+                sketch.reset_slot(position)
+            self.slot_ids[position] = slot_id
+        return position
+
+    def drain(self):
+        """Fold pending records into the sketches"""
+        with self._lock:
+            while self._pending:
+                timestamp, record = self._pending.popleft()
+                position = self._position(timestamp)
+                for name, sketch in self.features.items():
+                    sketch.add(position, record.get(name))
+
+    def _live_positions(self) -> list:
+        current = int(time.time() // self.slot_seconds)
+        return [p for p, slot_id in enumerate(self.slot_ids)
+                if slot_id is not None and current - slot_id < N_SLOTS]
+
+    def refresh(self) -> dict:
+        """Recompute drift scores over the window and publish them as gauges"""
+        self.drain()
+        with self._lock:
+            positions = self._live_positions()
+            features = {name: s.summarize(positions) for name, s in self.features.items()} if positions else {}
+        for name, summary in features.items():
+            if summary.get("psi") is not None:
+                FEATURE_PSI.set(summary["psi"], feature=name)
+            FEATURE_ISSUE_RATE.set(summary["null_rate"], feature=name, issue="null")
+            issue = "out_of_range" if summary["type"] == "numeric" else "unknown"
+            FEATURE_ISSUE_RATE.set(summary[f"{issue}_rate"], feature=name, issue=issue)
+
+        drifted = sorted(n for n, s in features.items() if s.get("status") == "significant")
+        self._last_report = {
+            "window_seconds": WINDOW_SECONDS,
+            "computed_at": time.time(),
+            "records": max((s["n"] for s in features.values()), default=0),
+            "reference_rows": self.reference_rows,
+            "drifted_features": drifted,
+            "features": features,
+        }
+        return self._last_report
+
+    def report(self, max_age: float = REFRESH_SECONDS) -> dict:
+        """Latest drift report, recomputed if older than max_age seconds"""
+        if self._last_report is None or time.time() - self._last_report["computed_at"] > max_age:
+            return self.refresh()
+        return self._last_report
+
+
+def get_monitor():
+    """Shared monitor, or None when no reference profile is available"""
+    if not hasattr(get_monitor, "monitor"):
+        get_monitor.monitor = None
+        if REFERENCE_PROFILE_PATH.exists():
+            get_monitor.monitor = DriftMonitor(json.loads(REFERENCE_PROFILE_PATH.read_text()))
+            print(f"✅ Drift monitor using reference profile {REFERENCE_PROFILE_PATH}")
+        else:
+            print(f"⚠️ No reference profile at {REFERENCE_PROFILE_PATH}; drift monitoring disabled")
+    return get_monitor.monitor
+
+
+def observe(record: dict):
+    """Record one raw request for drift monitoring (no-op without a profile)"""
+    monitor = get_monitor()
+    if monitor is not None:
+        monitor.observe(record)
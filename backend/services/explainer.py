@@ -0,0 +1,102 @@
+"""
+Per-feature churn explanations from the loaded XGBoost booster.
+
+Contributions come from XGBoost's native TreeSHAP (pred_contribs=True), or
+from the much cheaper Saabas approximation (approx_contribs=True) in "fast"
+mode. They are in log-odds space: base_value plus the sum of contributions
+is the model's margin, and sigmoid(margin) is its raw churn probability
+(model_probability). churn_probability is that mapped through the
+sidecar's calibration table, the same number /predict reports.
+
+Results are cached per (model version, mode, feature vector) in a bounded
+LRU, and a batch only sends its cache misses to the booster.
+"""
+import math
+import os
+import threading
+from collections import OrderedDict
+
+from services.churn_predictor import MODEL, EXPECTED_COLS, get_model, get_model_version, rows_to_frame
+from churn_inference import calibrate
+
+EXPLAIN_CACHE_SIZE = int(os.getenv("EXPLAIN_CACHE_SIZE", "50000"))
+MODES = ("exact", "fast")
+
+
+# ─── Cache ────────────────────────────────────────────────────────────────────
+class LRUCache:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+_cache = LRUCache(EXPLAIN_CACHE_SIZE)
+
+
+# ─── Contributions ────────────────────────────────────────────────────────────
+def compute_contributions(frame, mode: str = "exact"):
+    """(n, 24) array of per-feature contributions plus the bias column"""
+    import xgboost as xgb
+
+    booster = get_model().get_booster()
+    return booster.predict(
+        xgb.DMatrix(frame),
+        pred_contribs=True,
+        approx_contribs=(mode == "fast"),
+    )
+
+
+def explain_rows(frame, mode: str = "exact") -> list:
+    """Explanations for each row of a model-ready frame (see rows_to_frame)"""
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}")
+    version = get_model_version()
+    values = frame.to_numpy(dtype="float32")
+
+    keys = [(version, mode, row.tobytes()) for row in values]
+    results = [_cache.get(key) for key in keys]
+    misses = [i for i, r in enumerate(results) if r is None]
+    if misses:
+        contribs = compute_contributions(rows_to_frame(values[misses]), mode)
+        for i, row in zip(misses, contribs):
+            results[i] = _format_explanation(row, version, mode)
+            _cache.put(keys[i], results[i])
+    return results
+
+
+def _format_explanation(row, version: str, mode: str) -> dict:
+    contributions = {name: float(value) for name, value in zip(EXPECTED_COLS, row[:-1])}
+    base_value = float(row[-1])
+    margin = base_value + sum(contributions.values())
+    probability = 1 / (1 + math.exp(-margin))
+    knots = MODEL.calibration
+    calibrated = float(calibrate(probability, knots)) if knots is not None else probability
+    return {
+        "model_version": version,
+        "mode": mode,
+        "base_value": base_value,
+        "churn_probability": round(calibrated * 100, 1),
+        "model_probability": round(probability * 100, 1),
+        "contributions": contributions,
+        "top_factors": sorted(contributions, key=lambda k: abs(contributions[k]), reverse=True)[:5],
+    }
@@ -0,0 +1,67 @@
+"""
+Point lookups of precomputed customer feature vectors.
+
+DataTransformation.save_feature_table writes every customer's encoded
+23-feature vector keyed by customerID (see its docstring for the layout).
+The arrays are memory-mapped read-only, so the OS page cache holds one copy
+shared by every gunicorn worker, and a lookup is a hash, a probe or two in
+the slot table and one row read: no pandas, no full-table load.
+"""
+import json
+import os
+from pathlib import Path
+
+from services.churn_predictor import EXPECTED_COLS
+from churn_inference import KEY_HASH, customer_key_hash
+
+FEATURE_TABLE_DIR = Path(os.getenv(
+    "FEATURE_TABLE_DIR",
+    Path(__file__).resolve().parents[2] / "artifacts" / "data_transformation" / "feature_table",
+))
+
+
+class FeatureTable:
+    def __init__(self, directory: Path = FEATURE_TABLE_DIR):
+        import numpy as np
+
+        directory = Path(directory)
+        self.meta = json.loads((directory / "meta.json").read_text())
+        if self.meta["columns"] != EXPECTED_COLS:
+            raise ValueError(f"Feature table columns in {directory} do not match the model's EXPECTED_COLS")
+        if self.meta.get("hash") != KEY_HASH:
+            raise ValueError(f"Feature table in {directory} is keyed by {self.meta.get('hash')}, not {KEY_HASH}; rebuild it")
+        self.features = np.load(directory / "features.npy", mmap_mode="r")
+        self.ids = np.load(directory / "ids.npy", mmap_mode="r")
+        self.slots = np.load(directory / "slots.npy", mmap_mode="r")
+        self.mask = len(self.slots) - 1
+
+    def __len__(self):
+        return self.meta["n_rows"]
+
+    def lookup(self, customer_id: str):
+        """Encoded feature vector (float32 copy) of a customer, or None"""
+        key = customer_id.encode("utf-8")
+        slot = customer_key_hash(customer_id) & self.mask
+        while True:
+            row = int(self.slots[slot])
+            if row < 0:
+                return None
+            if self.ids[row] == key:
+                return self.features[row].copy()
+            slot = (slot + 1) & self.mask
+
+
+def get_table():
+    """The shared FeatureTable, or None when no table has been built"""
+    if not hasattr(get_table, "table"):
+        if not (FEATURE_TABLE_DIR / "meta.json").exists():
+            print(f"⚠️ No feature table at {FEATURE_TABLE_DIR}; /predict/{{customer_id}} disabled")
+            get_table.table = None
+        else:
+            try:
+                get_table.table = FeatureTable()
+                print(f"✅ Feature table loaded: {len(get_table.table)} customers")
+            except ValueError as e:
+                print(f"⚠️ {e}; /predict/{{customer_id}} disabled")
+                get_table.table = None
+    return get_table.table
@@ -0,0 +1,202 @@
+"""
+Bidirectional streaming scoring over gRPC for high-volume internal callers.
+
+Clients keep one HTTP/2 stream open to /churn.ChurnScoring/ScoreStream and
+write customer messages to it; scores come back on the same stream in the
+order the messages were sent. Messages are UTF-8 JSON, so no protobuf code
+generation is needed on either side:
+
+    request:  {"id": "c-1", "customer": {...CustomerRecord fields...}}
+    response: {"id": "c-1", "request_id": "9f2c...", "prediction": 1, "churn_probability": 81.3, ...}
+              {"id": "c-2", "error": "..."}        (message failed validation)
+              {"id": "c-3", "error": "...", "retry_after": 1}   (shed by admission control)
+
+"id" is the client's own label, echoed back and kept in the audit log as
+client_id; the audit request_id is always minted by the server.
+
+Messages that are already waiting when the server is ready are scored as one
+micro-batch (up to GRPC_MAX_BATCH rows, optionally lingering GRPC_MAX_WAIT_MS
+for more). A micro-batch is handled like one HTTP batch request: decoded in
+a worker thread, routed to a model variant by the model registry (stream
+metadata x-routing-key / x-model-variant), admitted against the same
+inference slots and deadline as the HTTP scoring routes (metadata
+x-request-deadline-ms) and scored in the inference pool, so the event loop
+keeps reading the stream and a stream cannot take more than its share.
+
+Runs inside the FastAPI process when GRPC_PORT is set (see main.py), or on
+its own with:
+
+    python -m services.grpc_server        (from backend/)
+"""
+import asyncio
+import contextlib
+import json
+import os
+import time
+import uuid
+
+import grpc
+from pydantic import ValidationError
+
+from services import admission, audit_log, drift_monitor, metrics, model_registry
+from services.churn_predictor import encode_record, rows_to_frame
+from services.schemas import StreamRequest
+
+SERVICE_NAME = "churn.ChurnScoring"
+METHOD_PATH = f"/{SERVICE_NAME}/ScoreStream"
+
+GRPC_PORT = int(os.getenv("GRPC_PORT", "0"))
+MAX_BATCH = int(os.getenv("GRPC_MAX_BATCH", "256"))
+MAX_WAIT_MS = float(os.getenv("GRPC_MAX_WAIT_MS", "0"))
+
+_END_OF_STREAM = object()
+
+
+# ─── Scoring ──────────────────────────────────────────────────────────────────
+def _message_id(raw: bytes):
+    try:
+        return json.loads(raw).get("id")
+    except (ValueError, AttributeError):
+        return None
+
+
+def _decode_batch(messages: list):
+    """Validate and encode a micro-batch; runs in a worker thread. Returns
+    (results, records, positions, processed), results holding the client id
+    (or the validation error) of every message."""
+    results = [None] * len(messages)
+    rows, records, positions = [], [], []
+    for i, raw in enumerate(messages):
+        try:
+            request = StreamRequest.model_validate_json(raw)
+        except ValidationError as e:
+            metrics.ERRORS.inc(stage="stream_decode", type=type(e).__name__)
+            results[i] = {"id": _message_id(raw), "error": str(e)}
+            continue
+        results[i] = {"id": request.id}
+        record = request.customer.model_dump()
+        drift_monitor.observe(record)
+        rows.append(encode_record(record))
+        records.append(record)
+        positions.append(i)
+    return results, records, positions, rows_to_frame(rows) if rows else None
+
+
+def _timed_score(variant, processed):
+    with metrics.track_stage("inference"):
+        return variant.score(processed, role="served")
+
+
+async def _score_batch(messages: list, metadata: dict) -> list:
+    """Score a micro-batch like one HTTP batch request: routed by the
+    registry (x-routing-key / x-model-variant stream metadata), admitted
+    against the same inference slots and deadline (x-request-deadline-ms)
+    and shadowed. Every scored row gets a server-minted audit request_id."""
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    results, records, positions, processed = await loop.run_in_executor(None, _decode_batch, messages)
+
+    status = "ok"
+    if records:
+        admission.start_request(metadata.get(admission.DEADLINE_HEADER))
+        model_registry.start_request(
+            metadata.get(model_registry.ROUTING_HEADER), metadata.get(model_registry.VARIANT_HEADER)
+        )
+        registry = model_registry.get_registry()
+        try:
+            variant = registry.route(processed)
+            metrics.BATCH_SIZE.observe(len(records))
+            async with admission.admit() if admission.enabled() else contextlib.nullcontext():
+                probabilities = await admission.run(_timed_score, variant, processed)
+        except model_registry.UnknownVariant as e:
+            status = "error"
+            for i in positions:
+                results[i]["error"] = str(e)
+        except admission.Overloaded as e:
+            status = "overloaded"
+            for i in positions:
+                results[i].update(error=e.detail, retry_after=e.retry_after)
+        else:
+            registry.shadow(processed, variant, probabilities)
+            latency_ms = (time.perf_counter() - started) * 1000
+            version, now = variant.version, time.time()
+            for i, record, probability in zip(positions, records, probabilities):
+                request_id = uuid.uuid4().hex
+                audit_log.record(
+                    timestamp=now, request_id=request_id, client_id=results[i]["id"], endpoint=METHOD_PATH,
+                    model_version=version, latency_ms=latency_ms, churn_probability=float(probability), **record
+                )
+                results[i].update({"request_id": request_id, **variant.format_result(probability)})
+
+    metrics.REQUESTS.inc(len(records), endpoint=METHOD_PATH, method="STREAM", status=status)
+    if len(records) < len(messages):
+        metrics.REQUESTS.inc(len(messages) - len(records), endpoint=METHOD_PATH, method="STREAM", status="error")
+    return [json.dumps(r).encode() for r in results]
+
+
+# ─── Stream Handler ───────────────────────────────────────────────────────────
+async def _read_stream(request_iterator, queue: asyncio.Queue):
+    try:
+        async for message in request_iterator:
+            await queue.put(message)
+    finally:
+        await queue.put(_END_OF_STREAM)
+
+
+async def score_stream(request_iterator, context):
+    """Score every message on the stream, batching whatever has queued up"""
+    # Bounded so a client writing faster than we score is slowed down by
+    # HTTP/2 flow control instead of growing server memory
+    queue = asyncio.Queue(maxsize=MAX_BATCH * 4)
+    reader = asyncio.create_task(_read_stream(request_iterator, queue))
+    metadata = {key.lower(): value for key, value in (context.invocation_metadata() or ())}
+    try:
+        finished = False
+        while not finished:
+            first = await queue.get()
+            if first is _END_OF_STREAM:
+                break
+            if MAX_WAIT_MS and queue.qsize() < MAX_BATCH - 1:
+                await asyncio.sleep(MAX_WAIT_MS / 1000)
+
+            batch = [first]
+            while len(batch) < MAX_BATCH and not queue.empty():
+                item = queue.get_nowait()
+                if item is _END_OF_STREAM:
+                    finished = True
+                    break
+                batch.append(item)
+
+            for response in await _score_batch(batch, metadata):
+                yield response
+    finally:
+        reader.cancel()
+
+
+# ─── Server ───────────────────────────────────────────────────────────────────
+def _generic_handler():
+    # No (de)serializers: messages are passed through as raw JSON bytes
+    return grpc.method_handlers_generic_handler(SERVICE_NAME, {
+        "ScoreStream": grpc.stream_stream_rpc_method_handler(score_stream),
+    })
+
+
+async def start_server(port: int = GRPC_PORT) -> "grpc.aio.Server":
+    """Start the scoring server on the running event loop"""
+    # SO_REUSEPORT lets every gunicorn worker bind the same port
+    server = grpc.aio.server(options=[("grpc.so_reuseport", 1)])
+    server.add_generic_rpc_handlers((_generic_handler(),))
+    server.add_insecure_port(f"[::]:{port}")
+    await server.start()
+    print(f"✅ gRPC scoring server listening on port {port}")
+    return server
+
+
+async def _serve():
+    model_registry.get_registry().load()  # Loads and warms up every variant
+    server = await start_server(GRPC_PORT or 50051)
+    await server.wait_for_termination()
+
+
+if __name__ == "__main__":
+    asyncio.run(_serve())
@@ -0,0 +1,228 @@
+"""
+Lightweight in-process metrics for the churn API.
+
+Counters, gauges and fixed-bucket histograms rendered in the Prometheus
+text exposition format. Recording a sample is a dict lookup, a bisect and
+an add under a per-metric lock, so it is cheap enough to leave on in
+production.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+PROCESS_START = time.perf_counter()
+
+# ─── Default Buckets ──────────────────────────────────────────────────────────
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384)
+PROBABILITY_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+def _label_key(labelnames, labels):
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _format_labels(labelnames, key, extra=None):
+    pairs = list(zip(labelnames, key))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in pairs
+    )
+    return "{" + body + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ─── Metric Types ─────────────────────────────────────────────────────────────
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _header(self):
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last slot is +Inf), running sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def observe_many(self, values, **labels):
+        """Record a whole array of samples with one bucket search and one
+        lock acquisition (for per-row scores of a batch)"""
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return
+        key = _label_key(self.labelnames, labels)
+        counts = np.bincount(np.searchsorted(self.buckets, values, side="left"), minlength=len(self.buckets) + 1)
+        total = float(values.sum())
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0] = [a + int(b) for a, b in zip(state[0], counts)]
+            state[1] += total
+            state[2] += len(values)
+
+    def count(self, **labels):
+        state = self._values.get(_label_key(self.labelnames, labels))
+        return state[2] if state else 0
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = [(key, (list(s[0]), s[1], s[2])) for key, s in self._values.items()]
+        bounds = self.buckets + (float("inf"),)
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(float(bound))))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+# ─── Registry ─────────────────────────────────────────────────────────────────
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(Counter(
+    "churn_requests_total", "HTTP requests handled, by route and outcome", ("endpoint", "method", "status")
+))
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "churn_request_latency_seconds", "End-to-end HTTP request latency", ("endpoint",)
+))
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    "churn_stage_latency_seconds", "Latency of individual serving stages", ("stage",)
+))
+BATCH_SIZE = REGISTRY.register(Histogram(
+    "churn_batch_size_rows", "Rows scored per inference call", (), buckets=BATCH_BUCKETS
+))
+ERRORS = REGISTRY.register(Counter(
+    "churn_errors_total", "Errors raised in the serving path, by stage and exception type", ("stage", "type")
+))
+MODEL_INFO = REGISTRY.register(Gauge(
+    "churn_model_info", "Currently loaded model (value is always 1)", ("version", "model_type")
+))
+MODEL_SIZE = REGISTRY.register(Gauge(
+    "churn_model_size_bytes", "Size of the loaded model file on disk"
+))
+COLD_START = REGISTRY.register(Gauge(
+    "churn_cold_start_seconds", "Seconds from process start until the model was ready to serve"
+))
+
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+@contextmanager
+def track_stage(stage: str):
+    """Time a serving stage and count any exception it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        ERRORS.inc(stage=stage, type=type(e).__name__)
+        raise
+    finally:
+        STAGE_LATENCY.observe(time.perf_counter() - start, stage=stage)
+
+
+def record_cold_start():
+    """Record process start to model-ready time; only the first call counts"""
+    if not COLD_START._values:
+        COLD_START.set(time.perf_counter() - PROCESS_START)
+
+
+def set_model_info(version: str, model_type: str, size_bytes: int):
+    MODEL_INFO.clear()
+    MODEL_INFO.set(1, version=version, model_type=model_type)
+    MODEL_SIZE.set(size_bytes)
@@ -0,0 +1,359 @@
+"""
+Several named model versions served side by side: a champion, challengers
+on a share of live traffic, averaged ensembles and shadow models.
+
+MODEL_REGISTRY is a JSON file (or the JSON itself) listing the variants:
+
+    {"variants": [
+        {"name": "champion",   "traffic": 0.9},
+        {"name": "challenger", "models": ["https://.../v13/model.ubj"], "traffic": 0.1},
+        {"name": "seeds",      "models": ["/models/s1.ubj", "/models/s2.ubj", "/models/s3.ubj"], "traffic": 0},
+        {"name": "candidate",  "models": ["/models/v14/model.onnx"], "backend": "onnx", "shadow": true}
+    ]}
+
+    models    local paths or URLs (downloaded with their sidecar); several
+              models are averaged into one ensemble probability, at the
+              first model's threshold and risk bands. Without models a
+              variant serves the MODEL_URL model, which /explain, gRPC and
+              the single-model helpers in churn_predictor keep using.
+    traffic   share of requests routed to a served variant (normalized over
+              all of them); for a shadow, the share of requests mirrored
+    shadow    scored after the response, off the request's critical path;
+              its scores are only recorded as metrics
+    backend   native or onnx (default MODEL_BACKEND); version: explicit label
+
+Routing is sticky: a request goes to the variant owning the hash of its
+routing key (X-Routing-Key, else the stored customer ID, else the encoded
+features of its first row), salted with ROUTING_SALT so a new experiment can
+reshuffle customers. X-Model-Variant pins a request to a named variant.
+Without MODEL_REGISTRY there is one variant ("default", the MODEL_URL model)
+and serving behaves exactly as before.
+
+Per variant and role (served / shadow) scoring latency and the distribution
+of churn probabilities are Prometheus histograms; shadows also record how
+far they are from the served probability and how often the decision flips.
+The resident memory each variant added when it was loaded is a gauge and is
+listed, with the process total, by GET /models. The first variant of each
+backend also pays for importing its runtime; benchmarks/model_registry.py
+measures what each further version costs.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+from services import metrics
+from services.churn_predictor import (
+    MODEL, MODEL_BACKEND, MODEL_THREADS, ModelHandle, download_model, get_model, warm_up
+)
+from churn_inference import format_result
+
+# ─── Configuration ────────────────────────────────────────────────────────────
+MODEL_REGISTRY = os.getenv("MODEL_REGISTRY", "")
+ROUTING_SALT = os.getenv("ROUTING_SALT", "")
+# Threads scoring shadow variants, and shadow jobs allowed to wait for them
+# before new ones are dropped (shadows never slow the served path)
+SHADOW_WORKERS = int(os.getenv("SHADOW_WORKERS", "1"))
+MAX_PENDING_SHADOWS = int(os.getenv("MAX_PENDING_SHADOWS", "256"))
+MODEL_CACHE_DIR = Path(os.getenv("MODEL_CACHE_DIR", "/tmp/models"))
+
+ROUTING_HEADER = "x-routing-key"
+VARIANT_HEADER = "x-model-variant"
+
+ABS_DIFF_BUCKETS = (0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+VARIANT_INFO = metrics.REGISTRY.register(metrics.Gauge(
+    "churn_variant_info", "Loaded model variants (value: traffic setting; for a shadow, the share mirrored)", ("variant", "version", "role")
+))
+VARIANT_REQUESTS = metrics.REGISTRY.register(metrics.Counter(
+    "churn_variant_requests_total", "Scoring calls per model variant", ("variant", "role")
+))
+VARIANT_LATENCY = metrics.REGISTRY.register(metrics.Histogram(
+    "churn_variant_latency_seconds", "Scoring latency per model variant", ("variant", "role")
+))
+VARIANT_SCORES = metrics.REGISTRY.register(metrics.Histogram(
+    "churn_variant_churn_probability", "Churn probabilities per model variant", ("variant", "role"),
+    buckets=metrics.PROBABILITY_BUCKETS
+))
+VARIANT_MEMORY = metrics.REGISTRY.register(metrics.Gauge(
+    "churn_variant_memory_bytes", "Resident memory added by loading a model variant", ("variant",)
+))
+SHADOW_ABS_DIFF = metrics.REGISTRY.register(metrics.Histogram(
+    "churn_shadow_abs_diff", "Per-row |shadow - served| churn probability", ("variant",), buckets=ABS_DIFF_BUCKETS
+))
+SHADOW_FLIPS = metrics.REGISTRY.register(metrics.Counter(
+    "churn_shadow_decision_flips_total", "Rows where a shadow's prediction differs from the served one", ("variant",)
+))
+SHADOW_DROPPED = metrics.REGISTRY.register(metrics.Counter(
+    "churn_shadow_dropped_total", "Shadow scoring jobs dropped because the shadow queue was full", ("variant",)
+))
+
+_routing: ContextVar[tuple] = ContextVar("routing", default=(None, None))
+
+
+class UnknownVariant(LookupError):
+    """X-Model-Variant names a variant that is not loaded"""
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process (0 where /proc is unavailable)"""
+    try:
+        return int(Path("/proc/self/statm").read_text().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def bucket(key: str) -> float:
+    """Stable position of a routing key in [0, 1)"""
+    digest = hashlib.blake2b(f"{ROUTING_SALT}:{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2 ** 64
+
+
+# ─── Variant ──────────────────────────────────────────────────────────────────
+class Variant:
+    """One named model version: a single model or an averaged ensemble"""
+
+    def __init__(self, name: str, handles: list, traffic: float = 1.0, shadow: bool = False,
+                 version: Optional[str] = None, urls: Optional[list] = None):
+        if not handles:
+            raise ValueError(f"Variant {name!r} has no models")
+        self.name = name
+        self.handles = handles
+        self.traffic = float(traffic)
+        self.shadow = shadow
+        self.role = "shadow" if shadow else "served"
+        self.urls = urls or [None] * len(handles)
+        self.memory_bytes = 0
+        self._version = version
+
+    @property
+    def is_default(self) -> bool:
+        return self.handles == [MODEL]
+
+    @property
+    def loaded(self) -> bool:
+        return all(h.loaded for h in self.handles)
+
+    def load(self):
+        """Download (URLs) and load every model, warm it up, and record the
+        resident memory that added"""
+        if self.loaded:
+            return
+        before = _rss_bytes()
+        if self.is_default:
+            get_model()
+            warm_up()
+        else:
+            for handle, url in zip(self.handles, self.urls):
+                if url and not handle.path.exists():
+                    download_model(url, handle.path)
+                handle.load()
+                handle.warm_up()
+        self.memory_bytes = max(0, _rss_bytes() - before)
+        VARIANT_MEMORY.set(self.memory_bytes, variant=self.name)
+        VARIANT_INFO.set(self.traffic, variant=self.name, version=self.version, role=self.role)
+        print(f"✅ Variant {self.name} ({self.role}, version {self.version}) loaded: "
+              f"{len(self.handles)} model(s), +{self.memory_bytes / 1024 / 1024:.1f} MB resident")
+
+    @property
+    def version(self) -> str:
+        """Explicit label, the model's version, or a hash of the ensemble
+        members' versions"""
+        if self._version is None:
+            versions = [h.version for h in self.handles]
+            self._version = versions[0] if len(versions) == 1 else (
+                "ensemble-" + hashlib.sha256("+".join(versions).encode()).hexdigest()[:12]
+            )
+        return self._version
+
+    @property
+    def threshold(self) -> float:
+        return self.handles[0].threshold
+
+    @property
+    def risk_bands(self) -> tuple:
+        return self.handles[0].risk_bands
+
+    def score(self, processed, role: Optional[str] = None):
+        """Churn probabilities (the ensemble mean), recording latency and the
+        score distribution under this variant's name"""
+        role = role or self.role
+        if not self.loaded:
+            self.load()
+        start = time.perf_counter()
+        if len(self.handles) == 1:
+            probabilities = self.handles[0].score(processed)
+        else:
+            import numpy as np
+
+            probabilities = np.mean([h.score(processed) for h in self.handles], axis=0)
+        VARIANT_LATENCY.observe(time.perf_counter() - start, variant=self.name, role=role)
+        VARIANT_REQUESTS.inc(variant=self.name, role=role)
+        VARIANT_SCORES.observe_many(probabilities, variant=self.name, role=role)
+        return probabilities
+
+    def format_result(self, probability: float) -> dict:
+        """Response payload at this variant's threshold and risk bands"""
+        return format_result(probability, threshold=self.threshold, risk_bands=self.risk_bands)
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "role": self.role,
+            "traffic": self.traffic,
+            "version": self.version if self.loaded else None,
+            "loaded": self.loaded,
+            "models": [
+                {"path": str(h.path), "backend": h.backend, "version": h.version if h.loaded else None}
+                for h in self.handles
+            ],
+            "file_bytes": sum(h.path.stat().st_size for h in self.handles if h.path.exists()),
+            "memory_bytes": self.memory_bytes,
+        }
+
+
+# ─── Registry ─────────────────────────────────────────────────────────────────
+class ModelRegistry:
+    """Served variants with their traffic shares, plus shadow variants"""
+
+    def __init__(self, variants: list):
+        names = [v.name for v in variants]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate variant names in {names}")
+        self.variants = {v.name: v for v in variants}
+        self.served = [v for v in variants if not v.shadow]
+        self.shadows = [v for v in variants if v.shadow]
+        total = sum(v.traffic for v in self.served)
+        if not self.served or total <= 0:
+            raise ValueError("The registry needs at least one served variant with traffic > 0")
+        # Upper edge of each served variant's slice of [0, 1)
+        edges, cumulative = [], 0.0
+        for v in self.served:
+            cumulative += v.traffic / total
+            edges.append(cumulative)
+        edges[-1] = 1.0
+        self._edges = edges
+        self.champion = self.served[0]
+        self._shadow_pool = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        for variant in self.variants.values():
+            variant.load()
+
+    def route(self, processed, customer_id: Optional[str] = None) -> Variant:
+        """Served variant for the current request (see start_request)"""
+        key, pinned = _routing.get()
+        if pinned is not None:
+            if pinned not in self.variants:
+                raise UnknownVariant(f"Unknown model variant {pinned!r}; loaded: {list(self.variants)}")
+            return self.variants[pinned]
+        if len(self.served) == 1:
+            return self.champion
+        position = bucket(_routing_key(key, customer_id, processed))
+        for variant, edge in zip(self.served, self._edges):
+            if position < edge:
+                return variant
+        return self.served[-1]
+
+    def shadow(self, processed, served: Variant, probabilities, customer_id: Optional[str] = None):
+        """Queue shadow scoring of rows the served variant has scored;
+        returns at once"""
+        if not self.shadows:
+            return
+        key, _ = _routing.get()
+        position = bucket(_routing_key(key, customer_id, processed))
+        for variant in self.shadows:
+            if variant is served or position >= variant.traffic:
+                continue
+            with self._lock:
+                if self._pending >= MAX_PENDING_SHADOWS:
+                    SHADOW_DROPPED.inc(variant=variant.name)
+                    continue
+                self._pending += 1
+                if self._shadow_pool is None:
+                    # Created lazily so each forked gunicorn worker gets its own
+                    self._shadow_pool = ThreadPoolExecutor(max_workers=SHADOW_WORKERS, thread_name_prefix="shadow")
+            self._shadow_pool.submit(self._score_shadow, variant, processed, served, probabilities)
+
+    def _score_shadow(self, variant: Variant, processed, served: Variant, served_probabilities):
+        import numpy as np
+
+        try:
+            with metrics.track_stage("shadow"):
+                probabilities = variant.score(processed)
+            SHADOW_ABS_DIFF.observe_many(np.abs(probabilities - served_probabilities), variant=variant.name)
+            flips = int(((probabilities > variant.threshold) != (served_probabilities > served.threshold)).sum())
+            if flips:
+                SHADOW_FLIPS.inc(flips, variant=variant.name)
+        except Exception:
+            pass  # counted by track_stage; a shadow never fails a request
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def describe(self) -> dict:
+        return {
+            "champion": self.champion.name,
+            "rss_bytes": _rss_bytes(),
+            "variants": [v.describe() for v in self.variants.values()],
+        }
+
+
+def _routing_key(key: Optional[str], customer_id: Optional[str], processed) -> str:
+    if key:
+        return key
+    if customer_id:
+        return customer_id
+    import numpy as np
+
+    first = processed.iloc[:1] if hasattr(processed, "iloc") else processed[:1]
+    return np.ascontiguousarray(first, dtype=np.float32).tobytes().hex()
+
+
+def start_request(routing_header: Optional[str] = None, variant_header: Optional[str] = None):
+    """Record the current request's routing key and pinned variant (call it
+    when the request arrives, as admission.start_request)"""
+    _routing.set((routing_header or None, variant_header or None))
+
+
+# ─── Loading ──────────────────────────────────────────────────────────────────
+def _variant_from_spec(spec: dict) -> Variant:
+    name = spec["name"]
+    sources = spec.get("models") or []
+    if not sources:
+        return Variant(name, [MODEL], spec.get("traffic", 1.0), spec.get("shadow", False), spec.get("version"))
+    handles, urls = [], []
+    for i, source in enumerate(sources):
+        if urlsplit(source).scheme in ("http", "https"):
+            suffix = Path(urlsplit(source).path).suffix or ".joblib"
+            path, url = MODEL_CACHE_DIR / name / f"model-{i}{suffix}", source
+        else:
+            path, url = Path(source), None
+        handles.append(ModelHandle(path, threads=MODEL_THREADS, backend=spec.get("backend", MODEL_BACKEND)))
+        urls.append(url)
+    return Variant(name, handles, spec.get("traffic", 1.0), spec.get("shadow", False), spec.get("version"), urls)
+
+
+def load_registry_spec(value: str) -> dict:
+    """MODEL_REGISTRY: inline JSON or the path of a JSON file"""
+    value = value.strip()
+    return json.loads(value if value.startswith("{") else Path(value).read_text())
+
+
+def get_registry() -> ModelRegistry:
+    """The shared registry (models are loaded by load(), at startup)"""
+    if not hasattr(get_registry, "registry"):
+        if MODEL_REGISTRY:
+            spec = load_registry_spec(MODEL_REGISTRY)
+            get_registry.registry = ModelRegistry([_variant_from_spec(v) for v in spec["variants"]])
+        else:
+            get_registry.registry = ModelRegistry([Variant("default", [MODEL])])
+    return get_registry.registry
@@ -0,0 +1,81 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+# ─── Request Schemas ──────────────────────────────────────────────────────────
+# Validated by pydantic-core (compiled), so JSON clients skip the per-field
+# form coercion and string normalization the form endpoint has to do.
+# Category values are the canonical spellings from the Telco dataset.
+YesNo = Literal["Yes", "No"]
+YesNoInternet = Literal["Yes", "No", "No internet service"]
+
+
+class CustomerRecord(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    gender: Literal["Male", "Female"]
+    SeniorCitizen: int = Field(ge=0, le=1)
+    Partner: YesNo
+    Dependents: YesNo
+    tenure: int = Field(ge=0)
+    PhoneService: YesNo
+    MultipleLines: Literal["Yes", "No", "No phone service"]
+    InternetService: Literal["DSL", "Fiber optic", "No"]
+    OnlineSecurity: YesNoInternet
+    OnlineBackup: YesNoInternet
+    DeviceProtection: YesNoInternet
+    TechSupport: YesNoInternet
+    StreamingTV: YesNoInternet
+    StreamingMovies: YesNoInternet
+    Contract: Literal["Month-to-month", "One year", "Two year"]
+    PaperlessBilling: YesNo
+    PaymentMethod: Literal[
+        "Electronic check",
+        "Mailed check",
+        "Bank transfer (automatic)",
+        "Credit card (automatic)",
+    ]
+    MonthlyCharges: float = Field(ge=0)
+    TotalCharges: float = Field(ge=0)
+
+
+class CustomerOverride(BaseModel):
+    """Changed fields to apply on top of a customer's stored features"""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    gender: Optional[Literal["Male", "Female"]] = None
+    SeniorCitizen: Optional[int] = Field(default=None, ge=0, le=1)
+    Partner: Optional[YesNo] = None
+    Dependents: Optional[YesNo] = None
+    tenure: Optional[int] = Field(default=None, ge=0)
+    PhoneService: Optional[YesNo] = None
+    MultipleLines: Optional[Literal["Yes", "No", "No phone service"]] = None
+    InternetService: Optional[Literal["DSL", "Fiber optic", "No"]] = None
+    OnlineSecurity: Optional[YesNoInternet] = None
+    OnlineBackup: Optional[YesNoInternet] = None
+    DeviceProtection: Optional[YesNoInternet] = None
+    TechSupport: Optional[YesNoInternet] = None
+    StreamingTV: Optional[YesNoInternet] = None
+    StreamingMovies: Optional[YesNoInternet] = None
+    Contract: Optional[Literal["Month-to-month", "One year", "Two year"]] = None
+    PaperlessBilling: Optional[YesNo] = None
+    PaymentMethod: Optional[Literal[
+        "Electronic check",
+        "Mailed check",
+        "Bank transfer (automatic)",
+        "Credit card (automatic)",
+    ]] = None
+    MonthlyCharges: Optional[float] = Field(default=None, ge=0)
+    TotalCharges: Optional[float] = Field(default=None, ge=0)
+
+
+class CustomerBatch(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    customers: List[CustomerRecord] = Field(min_length=1, max_length=10_000)
+
+
+class StreamRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    id: Optional[str] = None
+    customer: CustomerRecord
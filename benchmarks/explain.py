@@ -0,0 +1,60 @@
+"""
+Cost of per-feature explanations per row at batch sizes from 1 to 10k.
+
+Times the booster call behind /explain (cache bypassed) for exact TreeSHAP
+and the fast approximate mode, alongside plain predict_proba for scale, on
+rows drawn from artifacts/data_transformation/test.csv.
+
+    python -m benchmarks.explain [--sizes 1 10 100 1000 10000] [--repeat 5]
+"""
+import argparse
+import shutil
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from benchmarks.serving_workers import CACHED_MODEL, LOCAL_MODEL  # noqa: E402
+
+TEST_DATA = ROOT / "artifacts" / "data_transformation" / "test.csv"
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Explanation cost per row")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not CACHED_MODEL.exists():
+        shutil.copy(LOCAL_MODEL, CACHED_MODEL)
+
+    import numpy as np
+    import pandas as pd
+    from services.churn_predictor import EXPECTED_COLS, get_model, rows_to_frame
+    from services.explainer import compute_contributions
+
+    model = get_model()
+    pool = pd.read_csv(TEST_DATA)[EXPECTED_COLS].to_numpy(dtype=np.float32)
+
+    print(f"{'rows':>7} {'predict us/row':>15} {'fast us/row':>12} {'exact us/row':>13}")
+    for size in args.sizes:
+        frame = rows_to_frame(np.resize(pool, (size, len(EXPECTED_COLS))))
+        predict = _best_of(lambda: model.predict_proba(frame), args.repeat)
+        fast = _best_of(lambda: compute_contributions(frame, "fast"), args.repeat)
+        exact = _best_of(lambda: compute_contributions(frame, "exact"), args.repeat)
+        print(f"{size:>7} {predict / size * 1e6:>15.1f} {fast / size * 1e6:>12.1f} {exact / size * 1e6:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Peak memory of the training frames with and without the schema.yaml dtype policy.
+
+A synthetic raw dataset (see components/data_generator.py) is written once,
+then each step runs in a fresh process so ru_maxrss is that step's peak:
+
+    transform   raw CSV -> cleaned, deduplicated, encoded frame (DataTransformation)
+    load        processed train CSV -> X, y (what tuner / trainer / evaluation read)
+
+"default" is the previous behaviour (pandas' inferred int64/float64/object
+dtypes and LabelEncoder); "typed" is RAW_DTYPES / FEATURE_DTYPES.
+
+    python -m benchmarks.frame_memory [--rows 1000000]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+
+PROFILE = Path("artifacts/data_ingestion/synthetic_profile.json")
+
+
+def _transformation(workdir: Path):
+    from src.Churn_Predictor.config.configuration import ConfigurationManager
+    from src.Churn_Predictor.components.data_transformation import DataTransformation
+
+    config = ConfigurationManager().get_data_transformation_config()
+    return DataTransformation(replace(
+        config, root_dir=workdir, data_path=workdir / "raw.csv",
+        row_hash_index_path=workdir / "row_hash_index.npz"
+    ))
+
+
+def transform_default(workdir: Path):
+    import pandas as pd
+    from sklearn.preprocessing import LabelEncoder
+
+    df = pd.read_csv(workdir / "raw.csv").drop(columns="customerID")
+    df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce")
+    df["TotalCharges"] = df["TotalCharges"].fillna(df["TotalCharges"].mean())
+    df = df.drop_duplicates(keep="first")
+    df = df.replace({"No internet service": "No", "No phone service": "No"})
+    for col in ["Churn", "gender", "Partner", "Dependents", "PhoneService", "PaperlessBilling", "MultipleLines",
+                "OnlineSecurity", "OnlineBackup", "DeviceProtection", "TechSupport", "StreamingTV", "StreamingMovies"]:
+        df[col] = LabelEncoder().fit_transform(df[col])
+    return pd.get_dummies(data=df, columns=["InternetService", "Contract", "PaymentMethod"], drop_first=True)
+
+
+def transform_typed(workdir: Path):
+    transformation = _transformation(workdir)
+    return transformation.initiate_data_preprocessing(transformation.initiate_data_transformation())
+
+
+def load_default(workdir: Path):
+    import pandas as pd
+
+    data = pd.read_csv(workdir / "train.csv")
+    return data.drop(columns=["Churn"]), data["Churn"]
+
+
+def load_typed(workdir: Path):
+    from src.Churn_Predictor.config.configuration import ConfigurationManager
+    from src.Churn_Predictor.components.model_trainer import ModelTrainer
+
+    return ModelTrainer(config=ConfigurationManager().get_model_trainer_config()).load_xy(workdir / "train.csv")
+
+
+STEPS = {
+    "transform": {"default": transform_default, "typed": transform_typed},
+    "load": {"default": load_default, "typed": load_typed},
+}
+
+
+def run_step(step: str, variant: str, workdir: Path) -> dict:
+    result = STEPS[step][variant](workdir)
+    frame = result[0] if isinstance(result, tuple) else result
+    return {
+        "frame_mb": frame.memory_usage(deep=True).sum() / 1e6,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Training frame memory, default vs typed dtypes")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--child", nargs=3, metavar=("STEP", "VARIANT", "WORKDIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        step, variant, workdir = args.child
+        print(json.dumps(run_step(step, variant, Path(workdir))))
+        return
+
+    from src.Churn_Predictor.components.data_generator import generate
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        generate(PROFILE, workdir / "raw.csv", rows=args.rows)
+        transform_typed(workdir).to_csv(workdir / "train.csv", index=False)
+
+        print(f"{'step':<10} {'dtypes':<8} {'frame MB':>9} {'peak RSS MB':>12}")
+        for step in STEPS:
+            for variant in ("default", "typed"):
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.frame_memory", "--child", step, variant, str(workdir)],
+                    capture_output=True, text=True, check=True,
+                )
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                print(f"{step:<10} {variant:<8} {r['frame_mb']:>9.1f} {r['peak_rss_mb']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
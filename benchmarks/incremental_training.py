@@ -0,0 +1,64 @@
+"""
+Incremental retraining versus a full retrain.
+
+Simulates a monthly refresh by splitting train.csv into "history" and a
+"new month" slice, training a base model on history, and then comparing:
+
+    full       retrain from scratch on history + new month
+    continue   ModelTrainer.fit_incremental(strategy="continue") on the new month
+    refresh    ModelTrainer.fit_incremental(strategy="refresh") on the new month
+
+Reports fit time and the ModelEvaluation metrics (plus ROC AUC) on test.csv.
+
+    python -m benchmarks.incremental_training [--new-fraction 0.2]
+"""
+import argparse
+import time
+
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from src.Churn_Predictor.config.configuration import ConfigurationManager
+from src.Churn_Predictor.components.model_trainer import ModelTrainer
+from src.Churn_Predictor.components.model_evaluation import ModelEvaluation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental vs full retraining")
+    parser.add_argument("--new-fraction", type=float, default=0.2, help="share of train.csv treated as new data")
+    args = parser.parse_args()
+
+    config = ConfigurationManager()
+    trainer = ModelTrainer(config=config.get_model_trainer_config())
+    evaluation = ModelEvaluation(config=config.get_model_evaluation_config())
+
+    X, y = trainer.load_xy(trainer.config.train_data_path)
+    X_test, y_test = trainer.load_xy(trainer.config.test_data_path)
+    X_old, X_new, y_old, y_new = train_test_split(
+        X, y, test_size=args.new_fraction, random_state=42, stratify=y
+    )
+    base = trainer.fit_full(X_old, y_old)
+
+    runs = {
+        "full": lambda: trainer.fit_full(pd.concat([X_old, X_new]), pd.concat([y_old, y_new])),
+        "continue": lambda: trainer.fit_incremental(base, X_new, y_new, strategy="continue"),
+        "refresh": lambda: trainer.fit_incremental(base, X_new, y_new, strategy="refresh"),
+    }
+
+    print(f"history rows={len(X_old)}  new rows={len(X_new)}  test rows={len(X_test)}")
+    print(f"{'mode':<10} {'fit s':>8} {'trees':>6} {'accuracy':>9} {'precision':>10} {'recall':>8} {'f1':>7} {'auc':>7}")
+    for mode in ["base"] + list(runs):
+        start = time.perf_counter()
+        model = base if mode == "base" else runs[mode]()
+        fit_seconds = time.perf_counter() - start
+        m = evaluation.evaluate_model(y_test, model.predict(X_test))
+        auc = roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])
+        print(
+            f"{mode:<10} {fit_seconds:>8.3f} {model.get_booster().num_boosted_rounds():>6} "
+            f"{m['accuracy']:>9.4f} {m['precision']:>10.4f} {m['recall']:>8.4f} {m['f1_score']:>7.4f} {auc:>7.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+File size and load time of the model in each serialization format.
+
+    pickle       joblib.dump of the XGBClassifier (model.joblib)
+    pickle-z3    the same, zlib-compressed (joblib compress=3)
+    ubj          XGBoost's own binary UBJSON format (model.ubj, what the
+                 serving loaders prefer) plus its model.meta.json sidecar
+    json         XGBoost's own text JSON format
+
+For each format the model is written once to a temp directory, then:
+
+    warm ms     median load time in a process that already imported xgboost
+    cold s      median time from a fresh interpreter to a loaded model
+                (imports included; what a cold start pays)
+
+and predictions of every reloaded model are checked against the original.
+
+    python -m benchmarks.model_format [--runs 20] [--cold-runs 5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+LOCAL_MODEL = ROOT / "artifacts" / "model_trainer" / "model.joblib"
+TEST_DATA = ROOT / "artifacts" / "data_transformation" / "test.csv"
+
+FORMATS = {
+    # name: file name
+    "pickle": "model.joblib",
+    "pickle-z3": "model.z3.joblib",
+    "ubj": "model.ubj",
+    "json": "model.json",
+}
+
+COLD = """
+import sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+from churn_inference import ModelHandle
+ModelHandle({path!r}).load()
+print(time.perf_counter() - t0)
+"""
+
+
+def write_formats(model, directory: Path) -> dict:
+    import joblib
+    import xgboost
+    from churn_inference import DECISION_THRESHOLD, file_digest, sidecar_path
+
+    paths = {name: directory / file_name for name, file_name in FORMATS.items()}
+    joblib.dump(model, paths["pickle"])
+    joblib.dump(model, paths["pickle-z3"], compress=3)
+    booster = model.get_booster()
+    for name in ("ubj", "json"):
+        model.save_model(paths[name])
+        sidecar_path(paths[name]).write_text(json.dumps({
+            "feature_names": booster.feature_names, "threshold": DECISION_THRESHOLD,
+            "version": file_digest(paths[name]), "xgboost_version": xgboost.__version__,
+        }))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model serialization size and load time")
+    parser.add_argument("--runs", type=int, default=20, help="warm loads per format")
+    parser.add_argument("--cold-runs", type=int, default=5, help="fresh-process loads per format")
+    args = parser.parse_args()
+
+    import joblib
+    import numpy as np
+    import pandas as pd
+    from churn_inference import EXPECTED_COLS, ModelHandle
+
+    model = joblib.load(LOCAL_MODEL)
+    X = pd.read_csv(TEST_DATA)[EXPECTED_COLS].to_numpy(dtype=np.float32)
+    expected = model.predict_proba(X)[:, 1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_formats(model, Path(tmp))
+        print(f"{'format':<10} {'size KB':>9} {'warm ms':>9} {'cold s':>8} {'max diff':>9}")
+        for name, path in paths.items():
+            warm = []
+            for _ in range(args.runs):
+                handle = ModelHandle(path)
+                t0 = time.perf_counter()
+                handle.load()
+                warm.append(time.perf_counter() - t0)
+            diff = float(np.abs(handle.score(X) - expected).max())
+
+            cold = []
+            for _ in range(args.cold_runs):
+                out = subprocess.run(
+                    [sys.executable, "-c", COLD.format(root=str(ROOT), path=str(path))],
+                    capture_output=True, text=True, check=True,
+                )
+                cold.append(float(out.stdout.strip().splitlines()[-1]))
+
+            size_kb = path.stat().st_size / 1024
+            print(f"{name:<10} {size_kb:>9.0f} {statistics.median(warm) * 1000:>9.2f} "
+                  f"{statistics.median(cold):>8.2f} {diff:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
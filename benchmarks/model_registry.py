@@ -0,0 +1,113 @@
+"""
+Memory and latency cost of hosting several model versions in one backend
+process (backend/services/model_registry.py).
+
+For each backend and each number of versions N, a fresh process imports the
+runtime, then loads and warms up N copies of the trained model as separate
+registry variants (every copy is its own booster / ONNX session, as distinct
+versions would be) and reports:
+
+    runtime MB      resident memory once the runtime is imported and the
+                    first model is loaded
+    MB/version      resident memory added per further version
+    1-row ms        p50 latency of one served variant scoring one row
+    ensemble ms     p50 latency of one N-member averaged ensemble, one row
+    route us        cost of routing a request by its key (hash + lookup)
+
+    python -m benchmarks.model_registry [--versions 1 4 16] [--backends native onnx] [--repeat 300]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+MODELS = {
+    "native": ROOT / "artifacts" / "model_trainer" / "model.ubj",
+    "onnx": ROOT / "artifacts" / "model_trainer" / "model.onnx",
+}
+
+
+def rss_mb() -> float:
+    return int(Path("/proc/self/statm").read_text().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def p50_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def run_child(backend: str, versions: int, repeat: int) -> dict:
+    sys.path.insert(0, str(BACKEND_DIR))
+    from churn_inference import ModelHandle, preprocess_input
+    from services.model_registry import ModelRegistry, Variant, start_request
+
+    def variant(i, handles, traffic=1.0):
+        return Variant(f"v{i}", handles, traffic=traffic)
+
+    first = variant(0, [ModelHandle(MODELS[backend], backend=backend)])
+    first.load()
+    runtime = rss_mb()
+    served = [first] + [variant(i, [ModelHandle(MODELS[backend], backend=backend)]) for i in range(1, versions)]
+    for v in served[1:]:
+        v.load()
+    loaded = rss_mb()
+
+    row = preprocess_input({})
+    ensemble = Variant("ensemble", [h for v in served for h in v.handles], traffic=0.0)
+    registry = ModelRegistry(served + [ensemble])
+    keys = [f"customer-{i}" for i in range(repeat)]
+    t0 = time.perf_counter()
+    for key in keys:
+        start_request(key)
+        registry.route(row)
+    route_us = (time.perf_counter() - t0) / repeat * 1e6
+    return {
+        "runtime_mb": runtime,
+        "mb_per_version": (loaded - runtime) / max(1, versions - 1),
+        "one_row_ms": p50_ms(lambda: served[-1].score(row), repeat),
+        "ensemble_ms": p50_ms(lambda: ensemble.score(row), repeat),
+        "route_us": route_us,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and latency of many loaded model versions")
+    parser.add_argument("--versions", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--backends", choices=list(MODELS), nargs="+", default=list(MODELS))
+    parser.add_argument("--repeat", type=int, default=300)
+    parser.add_argument("--child", nargs=2, metavar=("BACKEND", "VERSIONS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child[0], int(args.child[1]), args.repeat)))
+        return
+
+    print(f"{'backend':<8} {'versions':>8} {'runtime MB':>11} {'MB/version':>11} {'1-row ms':>9} {'ensemble ms':>12} {'route us':>9}")
+    for backend in args.backends:
+        if not MODELS[backend].exists():
+            print(f"{backend:<8} (no model at {MODELS[backend]})")
+            continue
+        for versions in args.versions:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.model_registry", "--child", backend, str(versions),
+                 "--repeat", str(args.repeat)],
+                cwd=ROOT, capture_output=True, text=True, check=True,
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            per_version = f"{r['mb_per_version']:.2f}" if versions > 1 else "-"
+            print(f"{backend:<8} {versions:>8} {r['runtime_mb']:>11.0f} {per_version:>11} {r['one_row_ms']:>9.3f} "
+                  f"{r['ensemble_ms']:>12.3f} {r['route_us']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
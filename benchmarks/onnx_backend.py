@@ -0,0 +1,101 @@
+"""
+Native XGBoost versus ONNX Runtime scoring through churn_inference.ModelHandle.
+
+First checks parity on the held-out test set (artifacts/data_transformation/
+test.csv): the largest churn probability difference and the share of equal
+0/1 predictions. Then times ModelHandle.score for both backends at several
+batch sizes on CPU and reports per-call latency (p50/p99) and rows/s.
+
+Exits with code 1 when the backends disagree by more than --tolerance, so
+it can gate CI next to benchmarks/startup.py:
+
+    python -m benchmarks.onnx_backend [--batch-sizes 1 16 256 4096] [--threads 1] [--tolerance 1e-5]
+
+Uses artifacts/model_trainer/model.onnx, exporting it from model.joblib
+first when it is missing (needs onnxmltools and onnxruntime).
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+MODEL_DIR = ROOT / "artifacts" / "model_trainer"
+TEST_DATA = ROOT / "artifacts" / "data_transformation" / "test.csv"
+
+
+def onnx_model_path() -> Path:
+    path = MODEL_DIR / "model.onnx"
+    if not path.exists():
+        import joblib
+        from src.Churn_Predictor.config.configuration import ConfigurationManager
+        from src.Churn_Predictor.components.model_trainer import ModelTrainer
+
+        trainer = ModelTrainer(config=ConfigurationManager().get_model_trainer_config())
+        trainer.export_onnx(joblib.load(MODEL_DIR / "model.joblib"), path)
+    return path
+
+
+def load_test_rows():
+    import numpy as np
+    import pandas as pd
+    from churn_inference import EXPECTED_COLS
+
+    return pd.read_csv(TEST_DATA)[EXPECTED_COLS].to_numpy(dtype=np.float32)
+
+
+def time_batches(handle, rows, batch_size: int, min_seconds: float) -> dict:
+    import numpy as np
+
+    batch = np.resize(rows, (batch_size, rows.shape[1]))
+    handle.score(batch)  # First-call allocations
+    latencies = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds or len(latencies) < 20:
+        t0 = time.perf_counter()
+        handle.score(batch)
+        latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000,
+        "rows_per_s": batch_size * len(latencies) / sum(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Native vs ONNX Runtime scoring: parity and speed")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 256, 4096])
+    parser.add_argument("--threads", type=int, default=1, help="inference threads (0 = library default)")
+    parser.add_argument("--seconds", type=float, default=2.0, help="minimum timing per batch size")
+    parser.add_argument("--tolerance", type=float, default=1e-5, help="max |p_onnx - p_native|")
+    args = parser.parse_args()
+
+    import numpy as np
+    from churn_inference import DECISION_THRESHOLD, ModelHandle
+
+    handles = {
+        "native": ModelHandle(MODEL_DIR / "model.ubj", threads=args.threads),
+        "onnx": ModelHandle(onnx_model_path(), threads=args.threads, backend="onnx"),
+    }
+    rows = load_test_rows()
+
+    native, onnx = (handles[name].score(rows) for name in ("native", "onnx"))
+    max_diff = float(np.abs(onnx - native).max())
+    agree = float(np.mean((onnx > DECISION_THRESHOLD) == (native > DECISION_THRESHOLD)))
+    print(f"parity on {len(rows)} test rows: max |p_onnx - p_native| = {max_diff:.2e}, predictions agree {agree:.2%}")
+
+    print(f"{'batch':>6} {'backend':<8} {'p50 ms':>9} {'p99 ms':>9} {'rows/s':>11}")
+    for batch_size in args.batch_sizes:
+        for name, handle in handles.items():
+            r = time_batches(handle, rows, batch_size, args.seconds)
+            print(f"{batch_size:>6} {name:<8} {r['p50_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['rows_per_s']:>11.0f}")
+
+    if max_diff > args.tolerance:
+        print(f"FAIL ONNX disagrees with the native model by {max_diff:.2e} (tolerance {args.tolerance})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
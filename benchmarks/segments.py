@@ -0,0 +1,117 @@
+"""
+Throughput and memory of the per-group churn summary
+(churn_inference.segments.aggregate_segments) against scoring the whole
+file at once and grouping the per-customer results.
+
+Writes a customer file of --rows rows (the raw Telco data repeated), then in
+a fresh process per variant:
+
+    materialized    read all rows, score them in one batch, build the
+                    per-customer risk_level column and group it with pandas
+    chunked-N       aggregate_segments with N scoring threads
+
+and reports rows/s, the peak RSS of the process and whether its summary
+matches the materialized one (counts exactly, average probability to 0.1).
+
+    python -m benchmarks.segments [--rows 1000000] [--workers 1 2 4] [--group-by Contract PaymentMethod risk_level]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+NATIVE_MODEL = ROOT / "artifacts" / "model_trainer" / "model.ubj"
+RAW_DATA = ROOT / "artifacts" / "data_ingestion" / "raw_data" / "WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+
+def write_customers(path: Path, rows: int):
+    import pandas as pd
+
+    df = pd.read_csv(RAW_DATA, dtype=str, keep_default_na=False)
+    repeats = -(-rows // len(df))
+    pd.concat([df] * repeats, ignore_index=True).head(rows).to_csv(path, index=False)
+
+
+def materialized(source: Path, handle, group_by: list) -> dict:
+    import pandas as pd
+    from churn_inference import encode_frame, normalize_frame, risk_levels
+
+    frame = normalize_frame(pd.read_csv(source, dtype=str, keep_default_na=False))
+    probabilities = handle.score(encode_frame(frame))
+    frame["risk_level"] = risk_levels(probabilities)
+    frame["probability"] = probabilities.astype("float64")
+    frame["churn"] = probabilities > handle.threshold
+    grouped = frame.groupby(group_by).agg(
+        count=("probability", "size"), probability=("probability", "mean"), churn=("churn", "sum")
+    )
+    segments = [
+        {**dict(zip(group_by, key if isinstance(key, tuple) else (key,))),
+         "count": int(r["count"]), "avg_churn_probability": round(r["probability"] * 100, 1),
+         "predicted_churn": int(r["churn"])}
+        for key, r in grouped.iterrows()
+    ]
+    return {"segments": segments}
+
+
+def run_variant(variant: str, source: Path, group_by: list) -> dict:
+    from churn_inference import ModelHandle, aggregate_segments
+
+    handle = ModelHandle(NATIVE_MODEL)
+    handle.warm_up()
+    t0 = time.perf_counter()
+    if variant == "materialized":
+        summary = materialized(source, handle, group_by)
+    else:
+        summary = aggregate_segments(source, handle, group_by, workers=int(variant.split("-")[1]))
+    elapsed = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    key = lambda s: tuple(str(s[f]) for f in group_by)
+    return {
+        "seconds": elapsed,
+        "peak_mb": peak_mb,
+        "segments": {"|".join(key(s)): [s["count"], s["avg_churn_probability"]] for s in summary["segments"]},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked per-group churn summary vs materialized scoring")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--group-by", nargs="+", default=["Contract", "PaymentMethod", "risk_level"])
+    parser.add_argument("--child", nargs=2, metavar=("VARIANT", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_variant(args.child[0], Path(args.child[1]), args.group_by)))
+        return
+
+    variants = ["materialized"] + [f"chunked-{n}" for n in args.workers]
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "customers.csv"
+        write_customers(source, args.rows)
+        results = {}
+        for variant in variants:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.segments", "--child", variant, str(source),
+                 "--group-by", *args.group_by],
+                cwd=ROOT, capture_output=True, text=True, check=True,
+            )
+            results[variant] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    reference = results["materialized"]["segments"]
+    print(f"{'variant':<14} {'rows/s':>11} {'peak MB':>9} {'matches':>8}")
+    for variant, r in results.items():
+        matches = r["segments"].keys() == reference.keys() and all(
+            r["segments"][k][0] == reference[k][0] and abs(r["segments"][k][1] - reference[k][1]) <= 0.1
+            for k in reference
+        )
+        print(f"{variant:<14} {args.rows / r['seconds']:>11.0f} {r['peak_mb']:>9.0f} {str(matches):>8}")
+
+
+if __name__ == "__main__":
+    main()
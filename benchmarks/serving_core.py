@@ -0,0 +1,185 @@
+"""
+One benchmark for every serving entry point of the shared inference core
+(churn_inference), so hot-path work is measured the same way everywhere.
+
+Each entry point runs in its own process and scores the same real customers
+(artifacts/data_ingestion/raw_data) through its own public path:
+
+    core        churn_inference: preprocess_input + ModelHandle.score + format_result
+    pipeline    PredictionPipeline.predict_records
+    flask       app.py, POST /predict through Flask's test client
+    fastapi     backend/main.py, POST /predict (form) and /predict/json/batch
+                through FastAPI's TestClient
+
+and reports single-customer latency (p50/p99), batch throughput where the
+entry point has a batch path, and the largest difference of its churn
+probabilities from the core's (all entry points must agree). Entry points
+whose web framework is not installed are reported as skipped.
+
+    python -m benchmarks.serving_core [--n 2000] [--batch 1000] [--entry core pipeline]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+LOCAL_MODEL = ROOT / "artifacts" / "model_trainer" / "model.joblib"
+NATIVE_MODEL = ROOT / "artifacts" / "model_trainer" / "model.ubj"
+CACHED_MODEL = Path("/tmp/model.joblib")
+RAW_DATA = ROOT / "artifacts" / "data_ingestion" / "raw_data" / "WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+# Churn probabilities compared across entry points
+CHECK_ROWS = 200
+
+
+def load_customers(n: int) -> list:
+    """n real customers as JSON-typed records (CustomerRecord fields)"""
+    import pandas as pd
+
+    df = pd.read_csv(RAW_DATA).drop(columns=["customerID", "Churn"])
+    df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce").fillna(0.0)
+    df = df.sample(n=n, replace=n > len(df), random_state=42)
+    return json.loads(df.to_json(orient="records"))
+
+
+def as_form(customer: dict) -> dict:
+    return {key: str(value) for key, value in customer.items()}
+
+
+# ─── Entry Points ─────────────────────────────────────────────────────────────
+# Each returns (single, batch, probabilities): single(customer) serves one
+# customer, batch(customers) a list or None, probabilities(customers) the
+# churn probabilities (percent) its path produces
+def entry_core():
+    from churn_inference import ModelHandle, preprocess_input, format_result, normalize_record, encode_record, rows_to_array
+
+    handle = ModelHandle(NATIVE_MODEL)
+    handle.warm_up()
+    single = lambda c: format_result(
+        handle.score(preprocess_input(as_form(c)))[0], threshold=handle.threshold, risk_bands=handle.risk_bands
+    )
+    batch = lambda cs: handle.score(rows_to_array([encode_record(normalize_record(c)) for c in cs]))
+    probabilities = lambda cs: [single(c)["churn_probability"] for c in cs]
+    return single, batch, probabilities
+
+
+def entry_pipeline():
+    from src.Churn_Predictor.pipeline.prediction_pipeline import PredictionPipeline
+
+    pipeline = PredictionPipeline(NATIVE_MODEL)
+    single = lambda c: pipeline.predict_records([as_form(c)])[0]
+    batch = lambda cs: pipeline.predict_records(cs)
+    probabilities = lambda cs: [r["churn_probability"] for r in pipeline.predict_records(cs)]
+    return single, batch, probabilities
+
+
+def entry_flask():
+    import app
+
+    client = app.app.test_client()
+    app.get_model()
+    single = lambda c: client.post("/predict", data=as_form(c)).data
+    # The route renders HTML; compare what it feeds the template
+    probabilities = lambda cs: [
+        app.format_result(app.MODEL.score(app.preprocess_input(as_form(c)))[0])["churn_probability"] for c in cs
+    ]
+    return single, None, probabilities
+
+
+def entry_fastapi():
+    os.chdir(BACKEND_DIR)
+    sys.path.insert(0, str(BACKEND_DIR))
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    client.__enter__()  # Runs the startup event (model load, warm-up)
+    single = lambda c: client.post("/predict", data=as_form(c)).json()
+    batch = lambda cs: client.post("/predict/json/batch", json={"customers": cs}).json()
+    probabilities = lambda cs: [single(c)["churn_probability"] for c in cs]
+    return single, batch, probabilities
+
+
+ENTRY_POINTS = {
+    "core": entry_core,
+    "pipeline": entry_pipeline,
+    "flask": entry_flask,
+    "fastapi": entry_fastapi,
+}
+
+
+def run_entry(name: str, n: int, batch_size: int) -> dict:
+    customers = load_customers(n)
+    try:
+        single, batch, probabilities = ENTRY_POINTS[name]()
+    except ImportError as e:
+        return {"skipped": f"{e.name} not installed"}
+
+    latencies = []
+    for customer in customers:
+        t0 = time.perf_counter()
+        single(customer)
+        latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+
+    rows_per_s = None
+    if batch is not None:
+        batches = [customers[i:i + batch_size] for i in range(0, len(customers), batch_size)]
+        t0 = time.perf_counter()
+        for chunk in batches:
+            batch(chunk)
+        rows_per_s = len(customers) / (time.perf_counter() - t0)
+
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "single_per_s": len(latencies) / sum(latencies),
+        "batch_rows_per_s": rows_per_s,
+        "probabilities": probabilities(customers[:CHECK_ROWS]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serving benchmark shared by every entry point")
+    parser.add_argument("--n", type=int, default=2000, help="customers scored per entry point")
+    parser.add_argument("--batch", type=int, default=1000, help="customers per batch call")
+    parser.add_argument("--entry", choices=list(ENTRY_POINTS), nargs="+", default=list(ENTRY_POINTS))
+    parser.add_argument("--child", metavar="ENTRY", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_entry(args.child, args.n, args.batch)))
+        return
+
+    if not CACHED_MODEL.exists():
+        shutil.copy(LOCAL_MODEL, CACHED_MODEL)
+
+    results = {}
+    for name in args.entry:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.serving_core", "--child", name,
+             "--n", str(args.n), "--batch", str(args.batch)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        results[name] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    reference = next((r["probabilities"] for r in results.values() if "probabilities" in r), None)
+    print(f"{'entry':<10} {'p50 ms':>8} {'p99 ms':>8} {'single/s':>9} {'batch rows/s':>13} {'max diff':>9}")
+    for name, r in results.items():
+        if "skipped" in r:
+            print(f"{name:<10} skipped ({r['skipped']})")
+            continue
+        diff = max(abs(a - b) for a, b in zip(r["probabilities"], reference))
+        batch = f"{r['batch_rows_per_s']:>13.0f}" if r["batch_rows_per_s"] else f"{'-':>13}"
+        print(f"{name:<10} {r['p50_ms']:>8.3f} {r['p99_ms']:>8.3f} {r['single_per_s']:>9.0f} {batch} {diff:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Memory and throughput of the FastAPI backend at different worker counts.
+
+Starts the production launcher (backend/gunicorn.conf.py) with 1, 2, 4 and 8
+workers, drives POST /predict from a local thread pool and reports requests
+per second together with the total RSS and PSS of the master plus workers.
+PSS (proportional set size) splits shared pages between the processes that
+map them, so it shows how much of the model is actually shared.
+
+    python -m benchmarks.serving_workers [--workers 1 2 4 8] [--duration 15]
+
+Linux only (reads /proc). Uses artifacts/model_trainer/model.joblib when no
+model is cached at /tmp/model.joblib yet.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+LOCAL_MODEL = ROOT / "artifacts" / "model_trainer" / "model.joblib"
+CACHED_MODEL = Path("/tmp/model.joblib")
+
+SAMPLE_CUSTOMER = {
+    "gender": "Female", "SeniorCitizen": 0, "Partner": "Yes", "Dependents": "No",
+    "tenure": 12, "PhoneService": "Yes", "MultipleLines": "No",
+    "InternetService": "Fiber optic", "OnlineSecurity": "No", "OnlineBackup": "Yes",
+    "DeviceProtection": "No", "TechSupport": "No", "StreamingTV": "Yes",
+    "StreamingMovies": "No", "Contract": "Month-to-month", "PaperlessBilling": "Yes",
+    "PaymentMethod": "Electronic check", "MonthlyCharges": 79.85, "TotalCharges": 958.2,
+}
+
+
+# ─── Process Memory ───────────────────────────────────────────────────────────
+def _process_tree(pid: int) -> list:
+    pids = [pid]
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        children = (task / "children").read_text().split()
+        for child in children:
+            pids.extend(_process_tree(int(child)))
+    return pids
+
+
+def _memory_kb(pid: int) -> tuple:
+    rss = pss = 0
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        if line.startswith("Rss:"):
+            rss = int(line.split()[1])
+        elif line.startswith("Pss:"):
+            pss = int(line.split()[1])
+    return rss, pss
+
+
+def tree_memory_mb(pid: int) -> tuple:
+    totals = [_memory_kb(p) for p in _process_tree(pid)]
+    return sum(t[0] for t in totals) / 1024, sum(t[1] for t in totals) / 1024
+
+
+# ─── Load Generation ──────────────────────────────────────────────────────────
+def _wait_until_healthy(url: str, timeout: float = 120.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/health", timeout=2) as resp:
+                if b'"healthy"' in resp.read():
+                    return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("Server did not become healthy in time")
+
+
+def drive_load(url: str, duration: float, concurrency: int) -> float:
+    body = urllib.parse.urlencode(SAMPLE_CUSTOMER).encode()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        done = 0
+        while time.perf_counter() < deadline:
+            request = urllib.request.Request(f"{url}/predict", data=body)
+            with urllib.request.urlopen(request, timeout=30) as resp:
+                resp.read()
+            done += 1
+        return done
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        total = sum(pool.map(lambda _: client(), range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+
+def run(workers: int, duration: float, port: int, preload: bool) -> dict:
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        WEB_CONCURRENCY=str(workers),
+        PRELOAD_MODEL="1" if preload else "0",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_until_healthy(url)
+        drive_load(url, 2.0, workers * 2)  # Warm up every worker
+        rps = drive_load(url, duration, workers * 4)
+        rss, pss = tree_memory_mb(server.pid)
+        return {"workers": workers, "rps": rps, "rss_mb": rss, "pss_mb": pss}
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--no-preload", action="store_true", help="Load the model in every worker instead")
+    args = parser.parse_args()
+
+    if not CACHED_MODEL.exists():
+        shutil.copy(LOCAL_MODEL, CACHED_MODEL)
+
+    print(f"{'workers':>8} {'req/s':>10} {'RSS MB':>10} {'PSS MB':>10}")
+    for n in args.workers:
+        r = run(n, args.duration, args.port, preload=not args.no_preload)
+        print(f"{r['workers']:>8} {r['rps']:>10.1f} {r['rss_mb']:>10.1f} {r['pss_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Tail latency of the FastAPI backend under overload, with and without the
+admission guard (backend/services/admission.py).
+
+Starts the backend once per mode in a single uvicorn process and drives
+POST /predict/json/batch from more client threads than the server can keep
+up with (a closed loop: each client sends its next request as soon as the
+previous one is answered, or after Retry-After when it was rejected):
+
+    off     MAX_CONCURRENT_PREDICTIONS=0, inference inline on the event loop
+    on      the default concurrency limit, wait queue and deadline
+
+and reports the status counts (200 / 429 / 503), goodput and the p50/p99
+latency of the successful responses. With the guard on, p99 must stay near
+the deadline however many clients are waiting.
+
+    python -m benchmarks.slo_guard [--clients 128] [--batch 200] [--duration 15]
+
+Uses artifacts/model_trainer/model.joblib when no model is cached at
+/tmp/model.joblib yet.
+"""
+import argparse
+import http.client
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.serving_core import load_customers
+from benchmarks.serving_workers import BACKEND_DIR, CACHED_MODEL, LOCAL_MODEL, _wait_until_healthy
+
+MODES = {
+    "off": {"MAX_CONCURRENT_PREDICTIONS": "0"},
+    "on": {},
+}
+
+
+def drive_overload(port: int, body: bytes, duration: float, clients: int) -> tuple:
+    """(status counts, latencies of 200 responses) from a closed-loop burst"""
+    deadline = time.perf_counter() + duration
+
+    def client():
+        statuses, latencies = Counter(), []
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            conn.request("POST", "/predict/json/batch", body, {"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            resp.read()
+            statuses[resp.status] += 1
+            if resp.status == 200:
+                latencies.append(time.perf_counter() - t0)
+            elif resp.status in (429, 503):
+                time.sleep(float(resp.getheader("Retry-After", "1")))
+        conn.close()
+        return statuses, latencies
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(lambda _: client(), range(clients)))
+    statuses = sum((r[0] for r in results), Counter())
+    latencies = sorted(l for r in results for l in r[1])
+    return statuses, latencies
+
+
+def run(mode: str, port: int, body: bytes, duration: float, clients: int) -> dict:
+    env = dict(os.environ, **MODES[mode])
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_healthy(f"http://127.0.0.1:{port}")
+        drive_overload(port, body, 2.0, 2)  # Warm up
+        statuses, latencies = drive_overload(port, body, duration, clients)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return {
+        "statuses": statuses,
+        "ok_per_s": statuses[200] / duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000 if latencies else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modes", choices=list(MODES), nargs="+", default=list(MODES))
+    parser.add_argument("--clients", type=int, default=128, help="concurrent client threads")
+    parser.add_argument("--batch", type=int, default=200, help="customers per request")
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    if not CACHED_MODEL.exists():
+        shutil.copy(LOCAL_MODEL, CACHED_MODEL)
+    body = json.dumps({"customers": load_customers(args.batch)}).encode()
+
+    print(f"{'guard':<6} {'200':>7} {'429':>7} {'503':>7} {'ok/s':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for mode in args.modes:
+        r = run(mode, args.port, body, args.duration, args.clients)
+        s = r["statuses"]
+        print(f"{mode:<6} {s[200]:>7} {s[429]:>7} {s[503]:>7} {r['ok_per_s']:>8.1f} "
+              f"{r['p50_ms']:>9.1f} {r['p99_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
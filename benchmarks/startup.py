@@ -0,0 +1,122 @@
+"""
+Cold-start benchmark for the serving entry points, with a regression budget.
+
+Each measurement runs in a fresh interpreter and records:
+
+    import_s             time to import the app module
+    first_prediction_s   time from import end to the first prediction
+    heavy_at_import      heavy modules already loaded right after import
+    training_modules     training-only modules loaded by the first prediction
+
+The run fails (exit code 1) when the median of any timing exceeds its budget,
+when a heavy dependency is imported eagerly, or when serving pulls in a
+training-only dependency, so it can gate CI:
+
+    python -m benchmarks.startup [--runs 5] [--import-budget 1.0] [--first-prediction-budget 4.0]
+"""
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+LOCAL_MODEL = ROOT / "artifacts" / "model_trainer" / "model.joblib"
+CACHED_MODEL = Path("/tmp/model.joblib")
+
+# Must not be imported just by importing a serving module
+DEFERRED_MODULES = ["pandas", "joblib", "requests", "xgboost", "sklearn", "onnxruntime"]
+# Must never be imported on the serving path at all
+TRAINING_MODULES = ["mlflow", "optuna", "dotenv", "kaggle"]
+
+ENTRY_POINTS = {
+    # name: (working directory, import statement, first-prediction statement)
+    "fastapi": (
+        ROOT / "backend",
+        "import main",
+        "from services.churn_predictor import get_model, preprocess_input\n"
+        "get_model().predict_proba(preprocess_input({}))",
+    ),
+    "flask": (
+        ROOT,
+        "import app",
+        "app.get_model().predict_proba(app.preprocess_input(SAMPLE))",
+    ),
+}
+
+SAMPLE = {
+    "gender": "Male", "SeniorCitizen": "0", "Partner": "No", "Dependents": "No",
+    "tenure": "1", "PhoneService": "Yes", "MultipleLines": "No",
+    "InternetService": "Fiber optic", "OnlineSecurity": "No", "OnlineBackup": "No",
+    "DeviceProtection": "No", "TechSupport": "No", "StreamingTV": "No",
+    "StreamingMovies": "No", "Contract": "Month-to-month", "PaperlessBilling": "Yes",
+    "PaymentMethod": "Electronic check", "MonthlyCharges": "70.0", "TotalCharges": "70.0",
+}
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, ".")
+SAMPLE = {sample!r}
+t0 = time.perf_counter()
+{import_stmt}
+t1 = time.perf_counter()
+heavy = [m for m in {deferred!r} if m in sys.modules]
+{predict_stmt}
+t2 = time.perf_counter()
+training = [m for m in {training!r} if m in sys.modules]
+print(json.dumps({{"import_s": t1 - t0, "first_prediction_s": t2 - t1,
+                  "heavy_at_import": heavy, "training_modules": training}}))
+"""
+
+
+def measure(name: str) -> dict:
+    cwd, import_stmt, predict_stmt = ENTRY_POINTS[name]
+    code = CHILD.format(
+        sample=SAMPLE, import_stmt=import_stmt, predict_stmt=predict_stmt,
+        deferred=DEFERRED_MODULES, training=TRAINING_MODULES,
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serving cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=1.0, help="seconds (median)")
+    parser.add_argument("--first-prediction-budget", type=float, default=4.0, help="seconds (median)")
+    parser.add_argument("--entry", choices=sorted(ENTRY_POINTS), nargs="+", default=sorted(ENTRY_POINTS))
+    args = parser.parse_args()
+
+    if not CACHED_MODEL.exists():
+        shutil.copy(LOCAL_MODEL, CACHED_MODEL)
+
+    failures = []
+    print(f"{'entry':<10} {'import s':>10} {'first pred s':>13}  eager heavy / training imports")
+    for name in args.entry:
+        runs = [measure(name) for _ in range(args.runs)]
+        import_s = statistics.median(r["import_s"] for r in runs)
+        first_s = statistics.median(r["first_prediction_s"] for r in runs)
+        heavy = sorted({m for r in runs for m in r["heavy_at_import"]})
+        training = sorted({m for r in runs for m in r["training_modules"]})
+        print(f"{name:<10} {import_s:>10.3f} {first_s:>13.3f}  {heavy or '-'} / {training or '-'}")
+
+        if import_s > args.import_budget:
+            failures.append(f"{name}: import {import_s:.3f}s > budget {args.import_budget}s")
+        if first_s > args.first_prediction_budget:
+            failures.append(f"{name}: first prediction {first_s:.3f}s > budget {args.first_prediction_budget}s")
+        if heavy:
+            failures.append(f"{name}: eagerly imports {', '.join(heavy)}")
+        if training:
+            failures.append(f"{name}: serving path imports training-only {', '.join(training)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
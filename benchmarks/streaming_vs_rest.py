@@ -0,0 +1,138 @@
+"""
+Throughput and latency of the gRPC scoring stream versus the REST path.
+
+Starts the FastAPI backend with GRPC_PORT set (single uvicorn process, so
+both paths share one model), then scores the same customers:
+
+    rest        one keep-alive HTTP/1.1 connection, POST /predict/json per customer
+    rest-batch  POST /predict/json/batch with --batch customers per request
+    grpc        one bidirectional stream, one message per customer
+
+and reports customers/s and per-customer p50/p99 latency.
+
+    python -m benchmarks.streaming_vs_rest [--n 5000] [--batch 256]
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.serving_workers import CACHED_MODEL, LOCAL_MODEL, _wait_until_healthy
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+
+CUSTOMER = {
+    "gender": "Female", "SeniorCitizen": 0, "Partner": "Yes", "Dependents": "No",
+    "tenure": 12, "PhoneService": "Yes", "MultipleLines": "No",
+    "InternetService": "Fiber optic", "OnlineSecurity": "No", "OnlineBackup": "Yes",
+    "DeviceProtection": "No", "TechSupport": "No", "StreamingTV": "Yes",
+    "StreamingMovies": "No", "Contract": "Month-to-month", "PaperlessBilling": "Yes",
+    "PaymentMethod": "Electronic check", "MonthlyCharges": 79.85, "TotalCharges": 958.2,
+}
+
+
+def _summary(name: str, n: int, elapsed: float, latencies: list) -> str:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    return f"{name:<11} {n / elapsed:>12.1f} {p50:>10.2f} {p99:>10.2f}"
+
+
+# ─── REST Clients ─────────────────────────────────────────────────────────────
+def bench_rest(port: int, n: int) -> str:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    body = json.dumps(CUSTOMER)
+    headers = {"Content-Type": "application/json"}
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        conn.request("POST", "/predict/json", body, headers)
+        conn.getresponse().read()
+        latencies.append(time.perf_counter() - t0)
+    return _summary("rest", n, time.perf_counter() - start, latencies)
+
+
+def bench_rest_batch(port: int, n: int, batch: int) -> str:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Content-Type": "application/json"}
+    latencies = []
+    start = time.perf_counter()
+    for offset in range(0, n, batch):
+        size = min(batch, n - offset)
+        body = json.dumps({"customers": [CUSTOMER] * size})
+        t0 = time.perf_counter()
+        conn.request("POST", "/predict/json/batch", body, headers)
+        conn.getresponse().read()
+        # Every customer in the batch waits for the whole request
+        latencies.extend([time.perf_counter() - t0] * size)
+    return _summary("rest-batch", n, time.perf_counter() - start, latencies)
+
+
+# ─── gRPC Client ──────────────────────────────────────────────────────────────
+async def _bench_grpc(port: int, n: int) -> str:
+    import grpc
+
+    sent_at = [0.0] * n
+    latencies = []
+
+    async def requests():
+        for i in range(n):
+            sent_at[i] = time.perf_counter()
+            yield json.dumps({"id": str(i), "customer": CUSTOMER}).encode()
+
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+        call = channel.stream_stream("/churn.ChurnScoring/ScoreStream")(requests())
+        start = time.perf_counter()
+        received = 0
+        async for raw in call:
+            # Responses come back in request order
+            latencies.append(time.perf_counter() - sent_at[received])
+            received += 1
+        elapsed = time.perf_counter() - start
+    return _summary("grpc", n, elapsed, latencies)
+
+
+def bench_grpc(port: int, n: int) -> str:
+    return asyncio.run(_bench_grpc(port, n))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gRPC stream vs REST scoring benchmark")
+    parser.add_argument("--n", type=int, default=5000, help="customers scored per path")
+    parser.add_argument("--batch", type=int, default=256, help="customers per rest-batch request")
+    parser.add_argument("--http-port", type=int, default=8766)
+    parser.add_argument("--grpc-port", type=int, default=50061)
+    args = parser.parse_args()
+
+    if not CACHED_MODEL.exists():
+        shutil.copy(LOCAL_MODEL, CACHED_MODEL)
+
+    env = dict(os.environ, GRPC_PORT=str(args.grpc_port))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.http_port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    try:
+        _wait_until_healthy(f"http://127.0.0.1:{args.http_port}")
+        bench_rest(args.http_port, 200)  # Warm up
+        bench_grpc(args.grpc_port, 200)
+        print(f"{'path':<11} {'customers/s':>12} {'p50 ms':>10} {'p99 ms':>10}")
+        print(bench_rest(args.http_port, args.n))
+        print(bench_rest_batch(args.http_port, args.n, args.batch))
+        print(bench_grpc(args.grpc_port, args.n))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
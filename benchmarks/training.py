@@ -0,0 +1,80 @@
+"""
+Training fit time and peak memory across thread counts and dataset sizes.
+
+Synthetic datasets are bootstrapped from train.csv rows (numeric columns
+jittered so the quantile sketch has real work to do) up to the requested
+size. Every configuration trains in a fresh process, so peak RSS
+(ru_maxrss) covers just that run: data generation plus the training matrix
+plus XGBoost's own buffers. The model uses the params.yaml hyperparameters
+and XGBTraining settings, except for the thread count and dtype under test.
+
+    python -m benchmarks.training [--rows 7000 100000 1000000 10000000]
+                                  [--threads 1 2 4 8] [--dtypes float32 float64]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+NUMERIC = ["tenure", "MonthlyCharges", "TotalCharges"]
+
+
+def synthetic_xy(trainer, rows: int, dtype: str, seed: int = 42):
+    import numpy as np
+    import pandas as pd
+
+    X, y = trainer.load_xy(trainer.config.train_data_path)
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(X), size=rows)
+    columns = {col: X[col].to_numpy(dtype=dtype)[idx] for col in X.columns}
+    for col in NUMERIC:
+        columns[col] *= rng.normal(1.0, 0.02, size=rows).astype(dtype)
+    return pd.DataFrame(columns), y.to_numpy()[idx]
+
+
+def run_one(rows: int, threads: int, dtype: str) -> dict:
+    from src.Churn_Predictor.config.configuration import ConfigurationManager
+    from src.Churn_Predictor.components.model_trainer import ModelTrainer
+
+    trainer = ModelTrainer(config=ConfigurationManager().get_model_trainer_config())
+    X, y = synthetic_xy(trainer, rows, dtype)
+    model = trainer.build_classifier(n_jobs=threads)
+    start = time.perf_counter()
+    model.fit(X, y)
+    fit_seconds = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"rows": rows, "threads": threads, "dtype": dtype, "fit_s": fit_seconds, "peak_rss_mb": peak_mb}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Training throughput and memory")
+    parser.add_argument("--rows", type=int, nargs="+", default=[7_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--dtypes", nargs="+", default=["float32", "float64"])
+    parser.add_argument("--child", nargs=3, metavar=("ROWS", "THREADS", "DTYPE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        rows, threads, dtype = args.child
+        print(json.dumps(run_one(int(rows), int(threads), dtype)))
+        return
+
+    print(f"{'rows':>10} {'threads':>8} {'dtype':>8} {'fit s':>9} {'rows/s':>12} {'peak MB':>9}")
+    for rows in args.rows:
+        for dtype in args.dtypes:
+            for threads in args.threads:
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.training", "--child", str(rows), str(threads), dtype],
+                    capture_output=True, text=True, check=True,
+                )
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                print(
+                    f"{r['rows']:>10} {r['threads']:>8} {r['dtype']:>8} {r['fit_s']:>9.2f} "
+                    f"{r['rows'] / r['fit_s']:>12.0f} {r['peak_rss_mb']:>9.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
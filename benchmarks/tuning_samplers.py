@@ -0,0 +1,91 @@
+"""
+Best validation F1 reached per wall-clock minute by each Optuna sampler at
+several numbers of concurrent trials, through ModelTuner's own study setup
+(search space, pruner and sampler options from config.yaml model_tuner).
+
+    tpe         TPE without constant liar: concurrent workers are suggested
+                near-duplicate points
+    tpe-liar    TPE with constant liar (the config default)
+    cmaes       CMA-ES
+    qmc         scrambled Sobol quasi-random points
+
+Every (sampler, workers) run gets the same wall-clock budget on the same
+train/validation split. Warm starting from params.yaml is off unless
+--warm-start is given, so all samplers start from scratch.
+
+    python -m benchmarks.tuning_samplers [--samplers tpe tpe-liar cmaes qmc] [--workers 1 4 8] [--minutes 3]
+"""
+import argparse
+import dataclasses
+import time
+
+SAMPLERS = {
+    # name: (config sampler, option overrides)
+    "tpe": ("tpe", {"constant_liar": False}),
+    "tpe-liar": ("tpe", {"constant_liar": True}),
+    "cmaes": ("cmaes", {}),
+    "qmc": ("qmc", {}),
+}
+
+
+def run(tuner, data, minutes: float) -> dict:
+    """Best F1 after each full minute, and the trial counts, of one study"""
+    study = tuner.create_study()
+    start = time.perf_counter()
+    finished = []  # (seconds, value) of completed trials
+
+    def record(study, trial):
+        if trial.value is not None:
+            finished.append((time.perf_counter() - start, trial.value))
+
+    study.optimize(
+        lambda trial: tuner.objective(trial, *data),
+        timeout=minutes * 60, n_jobs=tuner.config.n_jobs, callbacks=[record],
+    )
+    marks = [m for m in range(1, int(minutes) + 1)] or [minutes]
+    best_by = [max((v for t, v in finished if t <= m * 60), default=float("nan")) for m in marks]
+    states = [t.state.name for t in study.trials]
+    return {
+        "marks": marks, "best_by": best_by,
+        "complete": states.count("COMPLETE"), "pruned": states.count("PRUNED"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optuna samplers: best F1 per wall-clock minute")
+    parser.add_argument("--samplers", choices=list(SAMPLERS), nargs="+", default=list(SAMPLERS))
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--minutes", type=float, default=3.0, help="wall-clock budget per run")
+    parser.add_argument("--warm-start", action="store_true", help="first trial from params.yaml")
+    args = parser.parse_args()
+
+    import optuna
+    from src.Churn_Predictor.config.configuration import ConfigurationManager
+    from src.Churn_Predictor.components.model_tuner import ModelTuner
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    manager = ConfigurationManager()
+    base = manager.get_model_tuner_config()
+    options = manager.config.model_tuner.sampler_options
+    data = ModelTuner(base).load_split()
+
+    rows = []
+    for name in args.samplers:
+        sampler, overrides = SAMPLERS[name]
+        for workers in args.workers:
+            config = dataclasses.replace(
+                base, sampler=sampler, sampler_options={**dict(options.get(sampler, {})), **overrides},
+                n_jobs=workers, warm_start_params=base.warm_start_params if args.warm_start else {},
+            )
+            rows.append((name, workers, run(ModelTuner(config), data, args.minutes)))
+
+    marks = rows[0][2]["marks"]
+    header = " ".join(f"{f'F1@{m:g}min':>9}" for m in marks)
+    print(f"{'sampler':<9} {'workers':>7} {header} {'complete':>8} {'pruned':>7}")
+    for name, workers, r in rows:
+        best = " ".join(f"{v:>9.4f}" for v in r["best_by"])
+        print(f"{name:<9} {workers:>7} {best} {r['complete']:>8} {r['pruned']:>7}")
+
+
+if __name__ == "__main__":
+    main()
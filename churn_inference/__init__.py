@@ -0,0 +1,28 @@
+"""
+Inference core shared by every serving entry point: the Flask app (app.py),
+the FastAPI backend (backend/services/churn_predictor.py) and
+PredictionPipeline.
+
+    features   raw record <-> 23-feature encoding in training column order,
+               and the customerID hash keying the feature table
+    model      lazily loaded model handle (native XGBoost or ONNX Runtime
+               backend), batch scoring with the sidecar's calibration table,
+               result formatting
+    segments   chunked, parallel scoring of a customer file into per-group
+               risk summaries (mergeable partial aggregates)
+
+Nothing heavy (pandas, joblib, xgboost) is imported until first use, and
+nothing from the training stack is imported at all. Performance work on the
+hot path lands here once; benchmarks/serving_core.py measures it the same
+way through every entry point.
+"""
+from churn_inference.features import (
+    EXPECTED_COLS, EXPECTED_RAW_FIELDS, N_FEATURES, CATEGORIES, normalize_record,
+    encode_record, decode_features, rows_to_array, rows_to_frame, preprocess_input,
+    normalize_frame, encode_frame, KEY_HASH, customer_key_hash, customer_key_hashes
+)
+from churn_inference.model import (
+    BACKENDS, NATIVE_SUFFIXES, DECISION_THRESHOLD, HIGH_RISK_ABOVE, MEDIUM_RISK_ABOVE, RISK_BANDS,
+    ModelHandle, sidecar_path, file_digest, calibration_knots, calibrate, risk_level, format_result
+)
+from churn_inference.segments import GROUP_FIELDS, RISK_LEVELS, risk_levels, aggregate_segments
@@ -0,0 +1,265 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# ─── Feature Layout ───────────────────────────────────────────────────────────
+# Expected columns (must match training)
+EXPECTED_COLS = [
+    'gender', 'SeniorCitizen', 'Partner', 'Dependents', 'tenure',
+    'PhoneService', 'MultipleLines', 'OnlineSecurity', 'OnlineBackup',
+    'DeviceProtection', 'TechSupport', 'StreamingTV', 'StreamingMovies',
+    'PaperlessBilling', 'MonthlyCharges', 'TotalCharges',
+    'InternetService_Fiber optic', 'InternetService_No',
+    'Contract_One year', 'Contract_Two year',
+    'PaymentMethod_Credit card (automatic)',
+    'PaymentMethod_Electronic check',
+    'PaymentMethod_Mailed check'
+]
+N_FEATURES = len(EXPECTED_COLS)
+
+# Raw (pre-encoding) fields of one customer, in dataset order
+EXPECTED_RAW_FIELDS = [
+    'gender', 'SeniorCitizen', 'Partner', 'Dependents', 'tenure',
+    'PhoneService', 'MultipleLines', 'InternetService', 'OnlineSecurity',
+    'OnlineBackup', 'DeviceProtection', 'TechSupport', 'StreamingTV',
+    'StreamingMovies', 'Contract', 'PaperlessBilling', 'PaymentMethod',
+    'MonthlyCharges', 'TotalCharges'
+]
+
+# Canonical Telco spellings per categorical field; the first one is used
+# when the field is missing (normalize_record rejects unrecognized values,
+# normalize_frame maps them to it too)
+YES_NO = ['No', 'Yes']
+YES_NO_INTERNET = ['No', 'Yes', 'No internet service']
+CATEGORIES = {
+    'gender': ['Female', 'Male'],
+    'Partner': YES_NO,
+    'Dependents': YES_NO,
+    'PhoneService': YES_NO,
+    'MultipleLines': ['No', 'Yes', 'No phone service'],
+    'InternetService': ['No', 'DSL', 'Fiber optic'],
+    'OnlineSecurity': YES_NO_INTERNET,
+    'OnlineBackup': YES_NO_INTERNET,
+    'DeviceProtection': YES_NO_INTERNET,
+    'TechSupport': YES_NO_INTERNET,
+    'StreamingTV': YES_NO_INTERNET,
+    'StreamingMovies': YES_NO_INTERNET,
+    'Contract': ['Month-to-month', 'One year', 'Two year'],
+    'PaperlessBilling': YES_NO,
+    'PaymentMethod': [
+        'Bank transfer (automatic)', 'Credit card (automatic)', 'Electronic check', 'Mailed check'
+    ],
+}
+NUMERIC_DEFAULTS = {'SeniorCitizen': 0, 'tenure': 0, 'MonthlyCharges': 0.0, 'TotalCharges': 0.0}
+
+
+def _spellings(values: list) -> dict:
+    """Lower-cased spelling -> canonical value. The first word is accepted
+    too where it is unambiguous ('fiber', 'two', 'electronic', ...)."""
+    first_words = [v.split()[0].lower() for v in values]
+    spellings = {w: v for w, v in zip(first_words, values) if first_words.count(w) == 1}
+    spellings.update({v.lower(): v for v in values})
+    return spellings
+
+_SPELLINGS = {field: _spellings(values) for field, values in CATEGORIES.items()}
+
+# ─── Encoding ─────────────────────────────────────────────────────────────────
+def normalize_record(form_data: dict) -> dict:
+    """Canonical record from loosely formatted input (HTML forms, query
+    strings): keys may be lower-cased, values are matched ignoring case and
+    surrounding whitespace, and missing (or blank) fields get their
+    defaults. Raises ValueError for a category value it does not recognize."""
+    def get_val(key, default=None):
+        val = form_data.get(key, form_data.get(key.lower(), default))
+        return default if val is None else val
+
+    record = {}
+    for field in EXPECTED_RAW_FIELDS:
+        if field in CATEGORIES:
+            val = str(get_val(field, '')).strip()
+            if not val:
+                record[field] = CATEGORIES[field][0]
+            elif val.lower() in _SPELLINGS[field]:
+                record[field] = _SPELLINGS[field][val.lower()]
+            else:
+                raise ValueError(f"Unrecognized {field}: {val!r} (expected one of {CATEGORIES[field]})")
+        elif field in ('SeniorCitizen', 'tenure'):
+            record[field] = int(get_val(field, NUMERIC_DEFAULTS[field]))
+        else:
+            record[field] = float(get_val(field, NUMERIC_DEFAULTS[field]))
+    return record
+
+def encode_record(record: dict) -> list:
+    """Encode a record with canonical category values (normalize_record
+    output, or services.schemas.CustomerRecord in the backend) straight into
+    the EXPECTED_COLS layout"""
+    r = record
+    return [
+        1.0 if r['gender'] == 'Male' else 0.0,
+        float(r['SeniorCitizen']),
+        1.0 if r['Partner'] == 'Yes' else 0.0,
+        1.0 if r['Dependents'] == 'Yes' else 0.0,
+        float(r['tenure']),
+        1.0 if r['PhoneService'] == 'Yes' else 0.0,
+        1.0 if r['MultipleLines'] == 'Yes' else 0.0,
+        1.0 if r['OnlineSecurity'] == 'Yes' else 0.0,
+        1.0 if r['OnlineBackup'] == 'Yes' else 0.0,
+        1.0 if r['DeviceProtection'] == 'Yes' else 0.0,
+        1.0 if r['TechSupport'] == 'Yes' else 0.0,
+        1.0 if r['StreamingTV'] == 'Yes' else 0.0,
+        1.0 if r['StreamingMovies'] == 'Yes' else 0.0,
+        1.0 if r['PaperlessBilling'] == 'Yes' else 0.0,
+        float(r['MonthlyCharges']),
+        float(r['TotalCharges']),
+        1.0 if r['InternetService'] == 'Fiber optic' else 0.0,
+        1.0 if r['InternetService'] == 'No' else 0.0,
+        1.0 if r['Contract'] == 'One year' else 0.0,
+        1.0 if r['Contract'] == 'Two year' else 0.0,
+        1.0 if r['PaymentMethod'] == 'Credit card (automatic)' else 0.0,
+        1.0 if r['PaymentMethod'] == 'Electronic check' else 0.0,
+        1.0 if r['PaymentMethod'] == 'Mailed check' else 0.0,
+    ]
+
+def decode_features(vector) -> dict:
+    """Inverse of encode_record: the canonical record a feature vector
+    (EXPECTED_COLS order) encodes. Lets stored vectors be audited, drift
+    monitored and partially overridden by raw field values."""
+    v = [float(x) for x in vector]
+    yes_no = lambda x: "Yes" if x else "No"
+    no_internet = v[17] == 1.0
+    addon = lambda x: "No internet service" if no_internet else yes_no(x)
+    return {
+        "gender": "Male" if v[0] else "Female",
+        "SeniorCitizen": int(v[1]),
+        "Partner": yes_no(v[2]),
+        "Dependents": yes_no(v[3]),
+        "tenure": int(v[4]),
+        "PhoneService": yes_no(v[5]),
+        "MultipleLines": yes_no(v[6]) if v[5] else "No phone service",
+        "InternetService": "Fiber optic" if v[16] else "No" if no_internet else "DSL",
+        "OnlineSecurity": addon(v[7]),
+        "OnlineBackup": addon(v[8]),
+        "DeviceProtection": addon(v[9]),
+        "TechSupport": addon(v[10]),
+        "StreamingTV": addon(v[11]),
+        "StreamingMovies": addon(v[12]),
+        "Contract": "One year" if v[18] else "Two year" if v[19] else "Month-to-month",
+        "PaperlessBilling": yes_no(v[13]),
+        "PaymentMethod": (
+            "Credit card (automatic)" if v[20] else "Electronic check" if v[21]
+            else "Mailed check" if v[22] else "Bank transfer (automatic)"
+        ),
+        "MonthlyCharges": v[14],
+        "TotalCharges": v[15],
+    }
+
+def rows_to_array(rows) -> "np.ndarray":
+    """Encoded rows as a float32 (n, 23) array in EXPECTED_COLS order.
+    Models accept this directly (no pandas); the booster only checks
+    feature names on inputs that carry them."""
+    import numpy as np
+
+    return np.asarray(rows, dtype=np.float32).reshape(-1, N_FEATURES)
+
+def rows_to_frame(rows) -> "pd.DataFrame":
+    """Wrap encoded rows (list of lists or an (n, 23) array) in a float32
+    DataFrame carrying the training column names the booster validates"""
+    import pandas as pd
+
+    return pd.DataFrame(rows_to_array(rows), columns=EXPECTED_COLS, copy=False)
+
+# Encoded column -> (raw field, value that encodes as 1); the other columns
+# (SeniorCitizen, tenure, charges) are the raw numbers
+_INDICATORS = {
+    'gender': ('gender', 'Male'),
+    **{f: (f, 'Yes') for f in [
+        'Partner', 'Dependents', 'PhoneService', 'MultipleLines', 'OnlineSecurity', 'OnlineBackup',
+        'DeviceProtection', 'TechSupport', 'StreamingTV', 'StreamingMovies', 'PaperlessBilling'
+    ]},
+    **{col: tuple(col.split('_', 1)) for col in EXPECTED_COLS if '_' in col},
+}
+
+def normalize_frame(df: "pd.DataFrame") -> "pd.DataFrame":
+    """normalize_record for a whole table (e.g. a chunk of a customer file):
+    the EXPECTED_RAW_FIELDS columns with canonical values. Unparseable
+    numbers (the blank TotalCharges of new customers) get their defaults
+    instead of failing the chunk."""
+    import pandas as pd
+
+    columns = {c.lower(): c for c in df.columns}
+    frame = {}
+    for field in EXPECTED_RAW_FIELDS:
+        source = field if field in df.columns else columns.get(field.lower())
+        if field in CATEGORIES:
+            if source is None:
+                frame[field] = pd.Series(CATEGORIES[field][0], index=df.index)
+                continue
+            spelled = df[source].astype(str).str.strip().str.lower().map(_SPELLINGS[field])
+            frame[field] = spelled.fillna(CATEGORIES[field][0])
+        else:
+            default = NUMERIC_DEFAULTS[field]
+            values = pd.to_numeric(df[source], errors='coerce') if source is not None else None
+            values = values.fillna(default) if values is not None else pd.Series(default, index=df.index)
+            frame[field] = values.astype(type(default))
+    return pd.DataFrame(frame, index=df.index)
+
+def encode_frame(frame: "pd.DataFrame") -> "np.ndarray":
+    """encode_record for a normalize_frame table: a float32 (n, 23) array in
+    EXPECTED_COLS order"""
+    import numpy as np
+
+    out = np.empty((len(frame), N_FEATURES), dtype=np.float32)
+    for i, col in enumerate(EXPECTED_COLS):
+        if col in _INDICATORS:
+            field, value = _INDICATORS[col]
+            out[:, i] = frame[field].to_numpy() == value
+        else:
+            out[:, i] = frame[col].to_numpy(dtype=np.float64)
+    return out
+
+def preprocess_input(form_data: dict) -> "pd.DataFrame":
+    """Transform form data into model-ready format"""
+    return rows_to_frame([encode_record(normalize_record(form_data))])
+
+# ─── Feature Table Keys ───────────────────────────────────────────────────────
+# 64-bit FNV-1a over the UTF-8 bytes of a customerID, then the murmur3 fmix64
+# finalizer so the low bits (the slot) depend on every byte. Simple enough to
+# compute for a whole ID column at once (customer_key_hashes) and per lookup
+# in plain Python (customer_key_hash); the two must agree.
+KEY_HASH = 'fnv1a-64-fmix'
+_MASK64 = (1 << 64) - 1
+_FNV_OFFSET = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+_FMIX = (0xff51afd7ed558ccd, 0xc4ceb9fe1a85ec53)
+
+def customer_key_hash(customer_id: str) -> int:
+    """64-bit key hash of a customerID, the slot key of the feature table
+    DataTransformation writes and the backend's feature store reads"""
+    h = _FNV_OFFSET
+    for byte in customer_id.encode('utf-8'):
+        h = ((h ^ byte) * _FNV_PRIME) & _MASK64
+    for multiplier in _FMIX:
+        h = ((h ^ (h >> 33)) * multiplier) & _MASK64
+    return h ^ (h >> 33)
+
+def customer_key_hashes(ids) -> "np.ndarray":
+    """customer_key_hash of every ID in a fixed-width UTF-8 bytes array
+    (numpy 'S' dtype, NUL-padded), as uint64, one byte column at a time"""
+    import numpy as np
+
+    ids = np.asarray(ids)
+    width = ids.dtype.itemsize
+    data = np.ascontiguousarray(ids).view(np.uint8).reshape(len(ids), width)
+    nonzero = data != 0
+    lengths = np.where(nonzero.any(axis=1), width - np.argmax(nonzero[:, ::-1], axis=1), 0)
+    h = np.full(len(ids), _FNV_OFFSET, dtype=np.uint64)
+    prime = np.uint64(_FNV_PRIME)
+    with np.errstate(over='ignore'):
+        for j in range(width):
+            active = lengths > j
+            h[active] = (h[active] ^ data[active, j]) * prime
+        for multiplier in _FMIX:
+            h = (h ^ (h >> np.uint64(33))) * np.uint64(multiplier)
+    return h ^ (h >> np.uint64(33))
@@ -0,0 +1,222 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from churn_inference.features import EXPECTED_COLS, preprocess_input
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# native: XGBClassifier from XGBoost's own model format (model.ubj plus the
+#         model.meta.json sidecar) or, for older artifacts, a joblib pickle
+# onnx:   the ModelTrainer ONNX export, scored with ONNX Runtime
+BACKENDS = ("native", "onnx")
+NATIVE_SUFFIXES = (".ubj", ".json")
+
+# Same cut-offs XGBClassifier.predict and the risk bands use. A model's
+# sidecar overrides them with the profit-optimal values ModelEvaluation
+# finds for the configured cost matrix and campaign capacity.
+DECISION_THRESHOLD = 0.5
+HIGH_RISK_ABOVE = 70
+MEDIUM_RISK_ABOVE = 40
+RISK_BANDS = (HIGH_RISK_ABOVE, MEDIUM_RISK_ABOVE)
+
+# A sidecar may also carry a calibration table ({"method", "x", "y"}): knots
+# of a non-decreasing piecewise-linear map from the model's raw probability
+# to a calibrated one, fit by the ModelCalibration stage. score() applies it,
+# so the threshold and risk bands above are cut points on calibrated
+# probabilities.
+
+# ─── Model Handle ─────────────────────────────────────────────────────────────
+class ModelHandle:
+    """A model file that is loaded on first use, plus the version label
+    predictions are tagged with (explicit, or a hash of the file)"""
+
+    def __init__(self, path: Path, threads: int = 0, version: Optional[str] = None, backend: str = "native"):
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        self.path = Path(path)
+        self.threads = threads
+        self.backend = backend
+        self._version = version
+        self._threshold = DECISION_THRESHOLD
+        self._risk_bands = RISK_BANDS
+        self._calibration = None
+        self._model = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self):
+        """The model, loading it on the first call"""
+        if self._model is None:
+            # joblib / onnxruntime are only imported here, so importing a
+            # front end stays fast
+            model = self._load_onnx() if self.backend == "onnx" else self._load_native()
+            self._version = self._version or file_digest(self.path)
+            self._model = model
+        return self._model
+
+    def _load_native(self):
+        if self.path.suffix in NATIVE_SUFFIXES:
+            model = self._load_booster()
+        else:
+            import joblib
+
+            model = joblib.load(self.path)
+        # Inference threads per process (0 = library default)
+        if self.threads and hasattr(model, "set_params"):
+            model.set_params(n_jobs=self.threads)
+        return model
+
+    def _load_booster(self):
+        """XGBClassifier from the native format. Unlike a pickle this reads
+        across xgboost releases; the sidecar carries what the booster file
+        does not (threshold, version) and pins the feature order."""
+        from xgboost import XGBClassifier
+
+        meta = json.loads(sidecar_path(self.path).read_text())
+        if meta["feature_names"] != EXPECTED_COLS:
+            raise ValueError(f"{self.path} was trained on different features than EXPECTED_COLS")
+        model = XGBClassifier()
+        model.load_model(self.path)
+        self._apply_sidecar(meta)
+        self._version = self._version or meta.get("version")
+        return model
+
+    def _apply_sidecar(self, meta: dict):
+        """Decision threshold, risk bands (percent) and calibration table from
+        a sidecar"""
+        self._threshold = meta.get("threshold", DECISION_THRESHOLD)
+        bands = meta.get("risk_bands") or {}
+        self._risk_bands = (bands.get("high_above", HIGH_RISK_ABOVE), bands.get("medium_above", MEDIUM_RISK_ABOVE))
+        self._calibration = calibration_knots(meta.get("calibration"))
+
+    def _load_onnx(self):
+        import onnxruntime as ort
+
+        # The export sits next to the native model and shares its sidecar
+        # (model.onnx -> model.meta.json) when there is one
+        if sidecar_path(self.path).exists():
+            self._apply_sidecar(json.loads(sidecar_path(self.path).read_text()))
+
+        options = ort.SessionOptions()
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+        return ort.InferenceSession(str(self.path), options, providers=["CPUExecutionProvider"])
+
+    @property
+    def model(self):
+        return self.load()
+
+    @property
+    def version(self) -> str:
+        self.load()
+        return self._version
+
+    @property
+    def threshold(self) -> float:
+        """Decision threshold on the churn probability (from the sidecar of a
+        native model file, DECISION_THRESHOLD otherwise)"""
+        self.load()
+        return self._threshold
+
+    @property
+    def risk_bands(self) -> tuple:
+        """(high, medium) risk band cut points in percent (from the sidecar,
+        RISK_BANDS otherwise)"""
+        self.load()
+        return self._risk_bands
+
+    @property
+    def calibrated(self) -> bool:
+        """Whether score() maps raw probabilities through a calibration table"""
+        self.load()
+        return self._calibration is not None
+
+    @property
+    def calibration(self) -> Optional[tuple]:
+        """(x, y) knots of the sidecar's calibration table, or None"""
+        self.load()
+        return self._calibration
+
+    def score(self, processed) -> "np.ndarray":
+        """Churn probabilities (0-1) for a batch of model-ready rows (an
+        EXPECTED_COLS frame or a float32 array), calibrated when the sidecar
+        has a calibration table"""
+        model = self.load()
+        if self.backend == "onnx":
+            import numpy as np
+
+            # The ONNX graph takes a plain float32 (n, 23) tensor
+            probabilities = model.run(["probabilities"], {"input": np.asarray(processed, dtype=np.float32)})[0][:, 1]
+        else:
+            probabilities = model.predict_proba(processed)[:, 1]
+        if self._calibration is not None:
+            probabilities = calibrate(probabilities, self._calibration)
+        return probabilities
+
+    def warm_up(self):
+        """Run one dummy prediction so the first real request doesn't pay for
+        the deferred pandas import and xgboost's first-call allocations"""
+        self.score(preprocess_input({}))
+
+
+def sidecar_path(path: Path) -> Path:
+    """JSON sidecar of a native model file (model.ubj -> model.meta.json)"""
+    return Path(path).with_suffix(".meta.json")
+
+
+def calibration_knots(table: Optional[dict]):
+    """(x, y) float64 knot arrays of a sidecar calibration table, or None"""
+    if not table:
+        return None
+    import numpy as np
+
+    x = np.asarray(table["x"], dtype=np.float64)
+    y = np.asarray(table["y"], dtype=np.float64)
+    if x.ndim != 1 or x.shape != y.shape or len(x) < 2 or np.any(np.diff(x) < 0):
+        raise ValueError("calibration table needs matching x / y knot lists with x ascending")
+    return x, y
+
+
+def calibrate(probabilities, knots: tuple) -> "np.ndarray":
+    """Raw probabilities mapped through calibration knots: one vectorized
+    linear interpolation (a binary search per row over a few hundred knots
+    at most), clamped to the end knots outside their range"""
+    import numpy as np
+
+    return np.interp(probabilities, *knots)
+
+
+def file_digest(path: Path) -> str:
+    """Short content hash used as the model version when none is configured"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+# ─── Results ──────────────────────────────────────────────────────────────────
+def risk_level(percent: float, risk_bands: tuple = RISK_BANDS) -> str:
+    high, medium = risk_bands
+    return "High Risk" if percent > high else "Medium Risk" if percent > medium else "Low Risk"
+
+def format_result(probability: float, detailed: bool = False, threshold: float = DECISION_THRESHOLD,
+                  risk_bands: tuple = RISK_BANDS) -> dict:
+    """Response payload for one customer from its churn probability (0-1);
+    detailed adds the stay probability and the confidence of the prediction"""
+    prediction = int(probability > threshold)
+    percent = float(probability) * 100
+    result = {
+        "prediction": prediction,
+        "churn": "Yes - Customer will likely churn" if prediction == 1 else "No - Customer will likely stay",
+        "churn_probability": round(percent, 1),
+        "risk_level": risk_level(percent, risk_bands)
+    }
+    if detailed:
+        result["no_churn_probability"] = round(100 - percent, 1)
+        result["confidence"] = round(max(percent, 100 - percent), 1)
+    return result
@@ -0,0 +1,112 @@
+"""
+Churn risk aggregated over a whole customer file without keeping a result
+per customer.
+
+The file is read in chunks; each chunk is normalized, encoded and scored as
+one batch and immediately reduced to a partial aggregate: per group (the
+values of the group_by fields) the customer count, the sum of churn
+probabilities and the number predicted to churn. Partials are plain dicts
+that merge by addition, so chunks are scored in parallel and only the
+group table ever outlives a chunk.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, List
+
+from churn_inference.features import CATEGORIES, encode_frame, normalize_frame
+from churn_inference.model import RISK_BANDS, ModelHandle
+
+if TYPE_CHECKING:
+    import numpy as np
+
+RISK_LEVELS = ("Low Risk", "Medium Risk", "High Risk")
+
+# Fields a summary can be grouped by: the low-cardinality raw fields plus the
+# risk band format_result assigns
+GROUP_FIELDS = ["risk_level", "SeniorCitizen", *CATEGORIES]
+
+CHUNK_ROWS = 50_000
+
+
+def risk_levels(probabilities: "np.ndarray", risk_bands: tuple = RISK_BANDS) -> "np.ndarray":
+    """format_result's risk_level for a batch of churn probabilities (0-1)"""
+    import numpy as np
+
+    high, medium = risk_bands
+    percent = np.asarray(probabilities, dtype=np.float64) * 100
+    codes = (percent > medium).astype(np.int8) + (percent > high)
+    return np.asarray(RISK_LEVELS, dtype=object)[codes]
+
+
+def validate_group_by(group_by: Iterable[str]) -> List[str]:
+    group_by = list(group_by)
+    unknown = [f for f in group_by if f not in GROUP_FIELDS]
+    if unknown or not group_by:
+        raise ValueError(f"group_by must be one or more of {GROUP_FIELDS}, got {group_by}")
+    return group_by
+
+
+def partial_aggregate(chunk, handle: ModelHandle, group_by: List[str]) -> dict:
+    """{group values: [count, probability sum, predicted churners]} for one
+    chunk of raw customer rows"""
+    frame = normalize_frame(chunk)
+    probabilities = handle.score(encode_frame(frame))
+    if "risk_level" in group_by:
+        frame["risk_level"] = risk_levels(probabilities, handle.risk_bands)
+    frame["_probability"] = probabilities.astype("float64")
+    frame["_churn"] = probabilities > handle.threshold
+    grouped = frame.groupby(group_by, sort=False, observed=True).agg(
+        count=("_probability", "size"), probability=("_probability", "sum"), churn=("_churn", "sum"),
+    )
+    keys = grouped.index if len(group_by) > 1 else ((k,) for k in grouped.index)
+    plain = lambda key: tuple(v.item() if hasattr(v, "item") else v for v in key)  # numpy -> JSON types
+    return {
+        plain(k): [int(c), float(p), int(n)]
+        for k, c, p, n in zip(keys, grouped["count"], grouped["probability"], grouped["churn"])
+    }
+
+
+def merge_partials(total: dict, partial: dict) -> dict:
+    """Add one partial aggregate into another (in place) and return it"""
+    for key, (count, probability, churn) in partial.items():
+        acc = total.setdefault(key, [0, 0.0, 0])
+        acc[0] += count
+        acc[1] += probability
+        acc[2] += churn
+    return total
+
+
+def aggregate_segments(source, handle: ModelHandle, group_by: Iterable[str] = ("risk_level",),
+                       chunk_rows: int = CHUNK_ROWS, workers: int = 2) -> dict:
+    """Score a raw customer CSV (path or binary file object, Telco columns)
+    chunk by chunk and summarize it per group_by group"""
+    import pandas as pd
+
+    group_by = validate_group_by(group_by)
+    handle.load()  # Once, before the scoring threads share it
+    total, pending = {}, []
+    # Read the next chunks while earlier ones are scored; at most 2 * workers
+    # chunks are held in memory at a time
+    with ThreadPoolExecutor(max(1, workers), thread_name_prefix="segments") as pool:
+        for chunk in pd.read_csv(source, chunksize=chunk_rows, dtype=str, keep_default_na=False):
+            pending.append(pool.submit(partial_aggregate, chunk, handle, group_by))
+            if len(pending) >= 2 * max(1, workers):
+                merge_partials(total, pending.pop(0).result())
+        for future in pending:
+            merge_partials(total, future.result())
+
+    segments = [
+        {
+            **dict(zip(group_by, key)),
+            "count": count,
+            "avg_churn_probability": round(probability / count * 100, 1),
+            "predicted_churn": churn,
+            "predicted_churn_rate": round(churn / count * 100, 1),
+        }
+        for key, (count, probability, churn) in sorted(total.items(), key=lambda kv: tuple(map(str, kv[0])))
+    ]
+    return {
+        "model_version": handle.version,
+        "group_by": group_by,
+        "customers": sum(s["count"] for s in segments),
+        "segments": segments,
+    }
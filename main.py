@@ -4,6 +4,7 @@ from src.Churn_Predictor.pipeline.data_validation_pipeline import DataValidation
 from src.Churn_Predictor.pipeline.data_transformation_pipeline import DataTransformationPipeline
 from src.Churn_Predictor.pipeline.model_tuner_pipeline import ModelTunerPipeline
 from src.Churn_Predictor.pipeline.model_trainer_pipeline import ModelTrainerPipeline
+from src.Churn_Predictor.pipeline.model_calibration_pipeline import ModelCalibrationPipeline
 from src.Churn_Predictor import logger
 from dotenv import load_dotenv
 
@@ -11,6 +12,9 @@ load_dotenv()
 
 RUN_HYPERPARAMETER_TUNING = True
 
+# Hyperparameters for the trainer; None = config.yaml model_trainer.params_source
+PARAMS_SOURCE = None
+
 STAGE_NAME = "Data Ingestion Stage"
 try:
     logger.info(f">>>>>>> Stage {STAGE_NAME} started <<<<<<<")
@@ -54,7 +58,8 @@ if RUN_HYPERPARAMETER_TUNING:
         
         logger.info(f"Best validation F1 score: {best_score:.4f}")
         logger.info(f"Best parameters saved to: artifacts/model_tuner/best_params.yaml")
-        logger.info(f"Copy these params to params.yaml for production use")
+        logger.info(f"Training with the tuned parameters")
+        PARAMS_SOURCE = "tuned"
         logger.info(f">>>>>>> {STAGE_NAME} completed <<<<<<<\nx==========x\n")
     except Exception as e:
         logger.exception(e)
@@ -67,17 +72,27 @@ else:
 STAGE_NAME = "Model Trainer stage"
 try:
    logger.info(f">>>>>> stage: {STAGE_NAME} started <<<<<<") 
-   model_trainer = ModelTrainerPipeline()
+   model_trainer = ModelTrainerPipeline(params_source=PARAMS_SOURCE)
    model_trainer.initiate_model_trainer()
    logger.info(f">>>>>> stage: {STAGE_NAME} completed <<<<<<\n\nx==========x")
 except Exception as e:
         logger.exception(e)
         raise e
 
+STAGE_NAME = "Model Calibration Stage"
+try:
+    logger.info(f">>>>>> stage: {STAGE_NAME} started <<<<<<") 
+    model_calibration = ModelCalibrationPipeline(params_source=PARAMS_SOURCE)
+    model_calibration.initiate_model_calibration()
+    logger.info(f">>>>>> stage: {STAGE_NAME} completed <<<<<<\n\nx==========x")
+except Exception as e:
+        logger.exception(e)
+        raise e
+
 STAGE_NAME = "Model Evaluation Stage"
 try:
     logger.info(f">>>>>> stage: {STAGE_NAME} started <<<<<<") 
-    model_evaluation_pipeline = ModelEvaluationPipeline()
+    model_evaluation_pipeline = ModelEvaluationPipeline(params_source=PARAMS_SOURCE)
     model_evaluation_pipeline.initiate_model_evaluation()
     logger.info(f">>>>>> stage: {STAGE_NAME} completed <<<<<<\n\nx==========x")
 except Exception as e:
@@ -0,0 +1,252 @@
+import os
+import shutil
+import tempfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.Churn_Predictor import logger
+from src.Churn_Predictor.utils.common import save_json, load_json
+
+# Columns are generated in this order, each conditioned on its parents.
+# Categorical columns sample from the observed value frequencies of rows
+# sharing their parents' values; numeric columns sample from the observed
+# quantiles. Groups too small to trust fall back to fewer parents (dropping
+# the last one first), down to the column's marginal distribution.
+CATEGORICAL = {
+    "gender": (),
+    "SeniorCitizen": (),
+    "Partner": ("SeniorCitizen",),
+    "Dependents": ("Partner", "SeniorCitizen"),
+    "Contract": ("SeniorCitizen", "Partner"),
+    "InternetService": ("Contract",),
+    "PhoneService": ("InternetService",),
+    "MultipleLines": ("PhoneService", "InternetService", "Contract"),
+    "OnlineSecurity": ("InternetService", "Contract"),
+    "OnlineBackup": ("InternetService", "Contract"),
+    "DeviceProtection": ("InternetService", "Contract"),
+    "TechSupport": ("InternetService", "Contract", "OnlineSecurity"),
+    "StreamingTV": ("InternetService", "Contract"),
+    "StreamingMovies": ("InternetService", "StreamingTV"),
+    "PaperlessBilling": ("Contract", "InternetService"),
+    "PaymentMethod": ("Contract", "PaperlessBilling"),
+    "Churn": ("Contract", "tenure_band", "InternetService", "PaymentMethod"),
+}
+NUMERIC = {
+    "tenure": ("Contract",),
+    "MonthlyCharges": ("InternetService", "PhoneService", "MultipleLines", "StreamingTV", "StreamingMovies", "tenure_band"),
+    # TotalCharges / (MonthlyCharges * tenure): how far billing drifted from
+    # the current monthly price over the customer's lifetime
+    "charge_ratio": (),
+}
+ORDER = [
+    "gender", "SeniorCitizen", "Partner", "Dependents", "Contract", "tenure", "tenure_band",
+    "InternetService", "PhoneService", "MultipleLines", "OnlineSecurity", "OnlineBackup",
+    "DeviceProtection", "TechSupport", "StreamingTV", "StreamingMovies", "PaperlessBilling",
+    "PaymentMethod", "MonthlyCharges", "charge_ratio", "Churn",
+]
+# Upper tenure bounds (months) of the bands Churn is conditioned on
+TENURE_BANDS = [6, 12, 24, 48]
+
+
+def tenure_band(tenure) -> np.ndarray:
+    return np.digitize(np.asarray(tenure), TENURE_BANDS)
+
+
+def _key(values) -> str:
+    return "|".join(str(v) for v in values) if len(values) else "*"
+
+
+class SyntheticDataGenerator:
+    """Fits per-column conditional distributions on the real Telco CSV and
+    samples arbitrarily many rows from them"""
+
+    def __init__(self, profile: dict):
+        self.profile = profile
+
+    @classmethod
+    def fit(cls, df, n_quantiles=101, min_group=30):
+        df = df.copy()
+        df["tenure_band"] = tenure_band(df["tenure"])
+        total = pd.to_numeric(df["TotalCharges"], errors="coerce")
+        billed = df["MonthlyCharges"] * df["tenure"]
+        df["charge_ratio"] = (total / billed).where(df["tenure"] > 0)
+        grid = np.linspace(0, 1, n_quantiles)
+
+        def categorical(values):
+            counts = values.value_counts().sort_index()
+            return {"values": counts.index.tolist(), "p": (counts / counts.sum()).round(6).tolist()}
+
+        def numeric(values):
+            return np.quantile(values.dropna(), grid).round(4).tolist()
+
+        columns = {}
+        for column, parents in list(CATEGORICAL.items()) + list(NUMERIC.items()):
+            summarise = categorical if column in CATEGORICAL else numeric
+            table = {"*": summarise(df[column])}
+            for depth in range(1, len(parents) + 1):
+                for key, group in df.groupby(list(parents[:depth])):
+                    if group[column].notna().sum() >= min_group:
+                        table[_key(key)] = summarise(group[column])
+            columns[column] = {"parents": list(parents), "table": table}
+
+        logger.info(f"Fitted synthetic data profile on {len(df)} rows")
+        output_columns = [c for c in df.columns if c not in ("tenure_band", "charge_ratio")]
+        return cls({"source_rows": len(df), "output_columns": output_columns, "columns": columns})
+
+    @classmethod
+    def load(cls, path: Path):
+        return cls(load_json(Path(path)).to_dict())
+
+    def save(self, path: Path):
+        save_json(path=Path(path), data=self.profile)
+
+    def _lookup(self, column, parent_values):
+        spec = self.profile["columns"][column]
+        for depth in range(len(spec["parents"]), -1, -1):
+            dist = spec["table"].get(_key(parent_values[:depth]))
+            if dist is not None:
+                return dist
+
+    def _levels(self, column):
+        """Possible values of a categorical column; sampled columns hold codes into these"""
+        return self.profile["columns"][column]["table"]["*"]["values"]
+
+    def _parent_radix(self, column):
+        return len(TENURE_BANDS) + 1 if column == "tenure_band" else len(self._levels(column))
+
+    def _parent_value(self, column, code):
+        return int(code) if column == "tenure_band" else self._levels(column)[code]
+
+    def _sample_column(self, column, data, n, rng):
+        parents = self.profile["columns"][column]["parents"]
+        is_categorical = column in CATEGORICAL
+        out = np.empty(n, dtype=np.int16 if is_categorical else np.float64)
+        # Rows sharing every parent value share one distribution: combine the
+        # parent codes into one integer group code per row and split on it
+        combined = np.zeros(n, dtype=np.int64)
+        for p in parents:
+            combined = combined * self._parent_radix(p) + data[p]
+        order = np.argsort(combined, kind="stable")
+        _, bounds = np.unique(combined[order], return_index=True)
+        for rows in np.split(order, bounds[1:]):
+            dist = self._lookup(column, [self._parent_value(p, data[p][rows[0]]) for p in parents])
+            if is_categorical:
+                levels = self._levels(column)
+                codes = np.array([levels.index(v) for v in dist["values"]])
+                p = np.asarray(dist["p"])
+                out[rows] = rng.choice(codes, size=len(rows), p=p / p.sum())
+            else:
+                quantiles = np.asarray(dist)
+                out[rows] = np.interp(rng.random(len(rows)), np.linspace(0, 1, len(quantiles)), quantiles)
+        return out
+
+    def sample(self, n: int, rng: np.random.Generator, start: int = 0):
+        """n rows in the real CSV's layout; customerIDs are unique across chunks
+        with different `start` offsets"""
+        data = {}
+        for column in ORDER:
+            if column == "tenure_band":
+                data[column] = tenure_band(data["tenure"])
+                continue
+            data[column] = self._sample_column(column, data, n, rng)
+            if column == "tenure":
+                data[column] = np.rint(data[column]).astype(np.int64)
+            elif column == "MonthlyCharges":
+                data[column] = data[column].round(2)
+
+        total = (data["MonthlyCharges"] * data["tenure"] * data["charge_ratio"]).round(2)
+        # The real file leaves TotalCharges blank for customers in their first month
+        data["TotalCharges"] = np.where(data["tenure"] > 0, total.astype(str), " ")
+        data["customerID"] = customer_ids(start, n)
+        for column in CATEGORICAL:
+            levels = self._levels(column)
+            if isinstance(levels[0], str):
+                data[column] = pd.Categorical.from_codes(data[column], categories=levels)
+            else:
+                data[column] = np.asarray(levels)[data[column]]
+        return pd.DataFrame({c: data[c] for c in self.profile["output_columns"]})
+
+
+def customer_ids(start: int, n: int) -> np.ndarray:
+    """Unique IDs shaped like the real ones (e.g. 0042-KQZVA)"""
+    index = np.arange(start, start + n, dtype=np.int64)
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    ids = np.char.zfill((index // 26**5).astype(str), 4)
+    ids = np.char.add(ids, "-")
+    for power in range(4, -1, -1):
+        ids = np.char.add(ids, letters[(index // 26**power) % 26])
+    return ids
+
+
+def _write_chunk(profile, start, n, seed, path, fmt):
+    frame = SyntheticDataGenerator(profile).sample(n, np.random.default_rng(seed), start)
+    if fmt == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False, header=start == 0)
+    return len(frame)
+
+
+def generate(profile_path: Path, out_path: Path, rows: int, seed: int = 42,
+             workers: int = 0, fmt: str = "csv", chunk_rows: int = 250_000):
+    """
+    Write `rows` synthetic rows to out_path as CSV or Parquet.
+
+    Chunks are generated in parallel worker processes, each with its own
+    child of SeedSequence(seed), so the output is identical for a given seed
+    and chunk_rows no matter how many workers run.
+    """
+    profile = SyntheticDataGenerator.load(profile_path).profile
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    n_chunks = max(1, -(-rows // chunk_rows))
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    parts_dir = Path(tempfile.mkdtemp(dir=out_path.parent, prefix=".synthetic-"))
+    parts = [parts_dir / f"part-{i:05d}.{fmt}" for i in range(n_chunks)]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            jobs = [
+                pool.submit(_write_chunk, profile, i * chunk_rows, min(chunk_rows, rows - i * chunk_rows),
+                            seeds[i], parts[i], fmt)
+                for i in range(n_chunks)
+            ]
+            written = sum(job.result() for job in jobs)
+
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            writer = None
+            for part in parts:
+                table = pq.read_table(part)
+                writer = writer or pq.ParquetWriter(out_path, table.schema)
+                writer.write_table(table)
+            writer.close()
+        else:
+            with open(out_path, "wb") as out:
+                for part in parts:
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, out, 16 * 1024 * 1024)
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+    logger.info(f"Generated {written} synthetic rows at {out_path}")
+    return out_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Telco churn dataset")
+    parser.add_argument("--profile", type=Path, default=Path("artifacts/data_ingestion/synthetic_profile.json"))
+    parser.add_argument("--fit", type=Path, help="Fit (and save) the profile from this real CSV first")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=0, help="0 = one per CPU")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--out", type=Path, required=True)
+    args = parser.parse_args()
+
+    if args.fit:
+        SyntheticDataGenerator.fit(pd.read_csv(args.fit)).save(args.profile)
+    generate(args.profile, args.out, args.rows, args.seed, args.workers, args.format)
@@ -1,6 +1,8 @@
 import os
 import zipfile
+from pathlib import Path
 from src.Churn_Predictor.entity.config_entity import DataIngestionConfig
+from src.Churn_Predictor.components.data_sources import get_source, download, extract_changed, sha256_file
 from src.Churn_Predictor import logger
 
 
@@ -9,52 +11,115 @@ class DataIngestion:
         self.config = config
 
     def download_data(self):
-        """Download datasets from kaggle using kaggle API"""
-        if not os.path.exists(self.config.local_data_file):
-            try:
-                from kaggle.api.kaggle_api_extended import KaggleApi
+        """Fetch the dataset archive unless a verified copy is already present"""
+        if self._archive_is_valid():
+            logger.info(f"Dataset already exists at: {self.config.local_data_file}")
+            return
 
-                api = KaggleApi()
-                api.authenticate()
+        if self.config.mode == "url":
+            download(
+                get_source(self.config.source_url),
+                Path(self.config.local_data_file),
+                part_size=int(self.config.download_part_mb * 1024 * 1024),
+                workers=self.config.download_workers,
+                expected_sha256=self.config.source_sha256 or None
+            )
+            return
 
-                logger.info(f"Downloading dataset: {self.config.dataset_slug}")
-                api.dataset_download_files(
-                    self.config.dataset_slug, 
-                    path=self.config.root_dir, 
-                    unzip=False
-                )
-                
-                # Rename the downloaded file
-                downloaded_file = os.path.join(
-                    self.config.root_dir, 
-                    f"{self.config.dataset_slug.split('/')[-1]}.zip"
-                )
-                
-                if os.path.exists(downloaded_file):
-                    os.rename(downloaded_file, self.config.local_data_file)
-                
-                logger.info(f"Dataset downloaded successfully to: {self.config.local_data_file}")
-
-            except Exception as e:
-                logger.error(f"Error downloading dataset: {e}")
-                raise e
+        try:
+            from kaggle.api.kaggle_api_extended import KaggleApi
+
+            api = KaggleApi()
+            api.authenticate()
+
+            logger.info(f"Downloading dataset: {self.config.dataset_slug}")
+            api.dataset_download_files(
+                self.config.dataset_slug, 
+                path=self.config.root_dir, 
+                unzip=False
+            )
+            
+            # Rename the downloaded file
+            downloaded_file = os.path.join(
+                self.config.root_dir, 
+                f"{self.config.dataset_slug.split('/')[-1]}.zip"
+            )
+            
+            if os.path.exists(downloaded_file):
+                os.rename(downloaded_file, self.config.local_data_file)
+            
+            if not self._archive_is_valid():
+                raise ValueError(f"Downloaded dataset failed verification: {self.config.local_data_file}")
+            logger.info(f"Dataset downloaded successfully to: {self.config.local_data_file}")
+
+        except Exception as e:
+            logger.error(f"Error downloading dataset: {e}")
+            raise e
+
+    def _archive_is_valid(self) -> bool:
+        """True if the archive exists and matches source_sha256 (or, without a
+        configured checksum, is a complete zip whose member CRCs all check out)"""
+        path = Path(self.config.local_data_file)
+        if not path.exists():
+            return False
+        if self.config.source_sha256:
+            valid = sha256_file(path) == self.config.source_sha256.lower()
         else:
-            logger.info(f"Dataset already exists at: {self.config.local_data_file}")
+            try:
+                with zipfile.ZipFile(path) as zf:
+                    valid = zf.testzip() is None
+            except zipfile.BadZipFile:
+                valid = False
+        if not valid:
+            logger.warning(f"{path} is truncated or corrupt; downloading it again")
+            path.unlink()
+        return valid
     
-    def extract_zip_file(self):  # ← Fixed indentation (was nested inside download_data)
-        """Extract the downloaded zip file"""
-        unzip_path = self.config.unzip_dir
-        os.makedirs(unzip_path, exist_ok=True)
-        
+    def extract_zip_file(self):
+        """Extract the downloaded zip file if it changed since the last extraction"""
         try:
-            with zipfile.ZipFile(self.config.local_data_file, 'r') as zip_ref:
-                zip_ref.extractall(unzip_path)
-            logger.info(f"Dataset extracted successfully to: {unzip_path}")
+            extract_changed(
+                Path(self.config.local_data_file),
+                Path(self.config.unzip_dir),
+                Path(self.config.root_dir) / "extract_manifest.json"
+            )
         except Exception as e:
             logger.error(f"Error extracting dataset: {e}")
             raise e
-    
+
+    def generate_data(self):
+        """Generate a synthetic dataset (synthetic_data_file) instead of
+        downloading; the real data_file is only read, to fit the profile"""
+        from src.Churn_Predictor.components.data_generator import SyntheticDataGenerator, generate
+        import pandas as pd
+
+        profile_path = Path(self.config.synthetic_profile_path)
+        data_file = Path(self.config.data_file)
+        if not profile_path.exists():
+            # Learn the distributions from the real file
+            if not data_file.exists():
+                raise FileNotFoundError(
+                    f"No synthetic profile at {profile_path} and no real data at {data_file} to fit one; "
+                    "run ingestion once with mode: kaggle"
+                )
+            logger.info(f"Fitting synthetic data profile on {data_file}")
+            SyntheticDataGenerator.fit(pd.read_csv(data_file)).save(profile_path)
+
+        logger.info(f"Generating {self.config.synthetic_rows} synthetic rows (seed {self.config.synthetic_seed})")
+        generate(
+            profile_path,
+            Path(self.config.synthetic_data_file),
+            rows=self.config.synthetic_rows,
+            seed=self.config.synthetic_seed,
+            workers=self.config.synthetic_workers
+        )
+
     def fetch_and_prepare_data(self):
-        """Main method: download and extract data"""
-        self.download_data()
-        self.extract_zip_file()
\ No newline at end of file
+        """Main method: download and extract data, or generate it"""
+        if self.config.mode == "synthetic":
+            self.generate_data()
+        elif self.config.mode in ("kaggle", "url"):
+            self.download_data()
+            self.extract_zip_file()
+        else:
+            raise ValueError(f"Unknown data ingestion mode: {self.config.mode}")
\ No newline at end of file
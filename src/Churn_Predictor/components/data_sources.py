@@ -0,0 +1,226 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+from src.Churn_Predictor import logger
+
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class RemoteFile:
+    size: int
+    etag: str
+    supports_ranges: bool
+
+
+class LocalSource:
+    """A file on a local or mounted filesystem (plain path or file:// URL)"""
+
+    def __init__(self, url: str):
+        parsed = urlparse(url)
+        self.path = Path(parsed.path if parsed.scheme == "file" else url)
+
+    def stat(self) -> RemoteFile:
+        st = self.path.stat()
+        return RemoteFile(size=st.st_size, etag=f"{st.st_size}-{st.st_mtime_ns}", supports_ranges=True)
+
+    def read_range(self, start: int, end: int):
+        """Yield bytes start..end (inclusive)"""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise IOError(f"{self.path} ended early at byte {end - remaining + 1}")
+                remaining -= len(chunk)
+                yield chunk
+
+
+class HTTPSource:
+    """An http(s) URL; ranged requests are used when the server advertises them"""
+
+    def __init__(self, url: str, timeout: float = 60):
+        self.url = url
+        self.timeout = timeout
+
+    def stat(self) -> RemoteFile:
+        request = urllib.request.Request(self.url, method="HEAD")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return RemoteFile(
+                size=int(response.headers.get("Content-Length", -1)),
+                etag=response.headers.get("ETag") or response.headers.get("Last-Modified") or "",
+                supports_ranges=response.headers.get("Accept-Ranges", "").lower() == "bytes",
+            )
+
+    def read_range(self, start: int, end: int = None):
+        headers = {} if end is None else {"Range": f"bytes={start}-{end}"}
+        request = urllib.request.Request(self.url, headers=headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if end is not None and response.status != 206:
+                raise IOError(f"{self.url} ignored the range request (HTTP {response.status})")
+            while chunk := response.read(CHUNK_SIZE):
+                yield chunk
+
+
+class S3Source:
+    """An object in S3 or an S3-compatible store (MinIO, GCS interop, R2...).
+    The endpoint comes from AWS_ENDPOINT_URL like any other boto3 client."""
+
+    def __init__(self, url: str):
+        try:
+            import boto3
+        except ImportError as e:
+            raise ImportError("boto3 is required for s3:// data sources") from e
+        parsed = urlparse(url)
+        self.bucket, self.key = parsed.netloc, parsed.path.lstrip("/")
+        self.client = boto3.client("s3")
+
+    def stat(self) -> RemoteFile:
+        head = self.client.head_object(Bucket=self.bucket, Key=self.key)
+        return RemoteFile(size=head["ContentLength"], etag=head.get("ETag", ""), supports_ranges=True)
+
+    def read_range(self, start: int, end: int):
+        body = self.client.get_object(Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end}")["Body"]
+        yield from body.iter_chunks(CHUNK_SIZE)
+
+
+SOURCES = {
+    "": LocalSource,
+    "file": LocalSource,
+    "http": HTTPSource,
+    "https": HTTPSource,
+    "s3": S3Source,
+}
+
+
+def get_source(url: str):
+    scheme = urlparse(url).scheme
+    if scheme not in SOURCES:
+        raise ValueError(f"No data source registered for '{scheme}://' URLs")
+    return SOURCES[scheme](url)
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def download(source, dest: Path, part_size: int = 8 * CHUNK_SIZE, workers: int = 4, expected_sha256: str = None) -> str:
+    """
+    Download a source to dest in parallel ranged parts and return its sha256.
+
+    Parts are written in place into dest.part and finished parts are recorded
+    in dest.part.json, so an interrupted download resumes with the missing
+    parts only (as long as the remote file's size and ETag are unchanged).
+    dest only appears, via an atomic rename, once the checksum is verified.
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    partial = dest.with_name(dest.name + ".part")
+    state_path = dest.with_name(dest.name + ".part.json")
+    remote = source.stat()
+
+    if not remote.supports_ranges or remote.size <= 0:
+        logger.info("Source does not support ranged reads; downloading in one stream")
+        with open(partial, "wb") as f:
+            for chunk in source.read_range(0, None if remote.size <= 0 else remote.size - 1):
+                f.write(chunk)
+    else:
+        n_parts = -(-remote.size // part_size)
+        state = {"size": remote.size, "etag": remote.etag, "part_size": part_size, "done": []}
+        if partial.exists() and state_path.exists():
+            saved = json.loads(state_path.read_text())
+            if all(saved.get(k) == state[k] for k in ("size", "etag", "part_size")):
+                state["done"] = saved["done"]
+        if not state["done"]:
+            with open(partial, "wb") as f:
+                f.truncate(remote.size)
+        done = set(state["done"])
+        pending = [i for i in range(n_parts) if i not in done]
+        logger.info(f"Downloading {remote.size} bytes in {n_parts} parts ({len(pending)} remaining)")
+
+        lock = threading.Lock()
+        fd = os.open(partial, os.O_WRONLY)
+
+        def fetch_part(i):
+            offset = i * part_size
+            end = min(offset + part_size, remote.size) - 1
+            for chunk in source.read_range(offset, end):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+            if offset != end + 1:
+                raise IOError(f"Part {i} is short: got {offset - i * part_size} bytes")
+            with lock:
+                state["done"].append(i)
+                state_path.write_text(json.dumps(state))
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for future in [pool.submit(fetch_part, i) for i in pending]:
+                    future.result()
+        finally:
+            os.close(fd)
+
+    digest = sha256_file(partial)
+    if expected_sha256 and digest != expected_sha256.lower():
+        partial.unlink()
+        state_path.unlink(missing_ok=True)
+        raise ValueError(f"Checksum mismatch for {dest}: expected {expected_sha256}, got {digest}")
+    os.replace(partial, dest)
+    state_path.unlink(missing_ok=True)
+    logger.info(f"Downloaded {dest} (sha256 {digest})")
+    return digest
+
+
+def extract_changed(archive: Path, target_dir: Path, manifest_path: Path) -> bool:
+    """
+    Extract archive into target_dir unless the manifest says this exact
+    archive was already extracted and its members are still in place.
+    Members are streamed to disk one at a time via a temp file and rename.
+    Returns True if anything was extracted.
+    """
+    import zipfile
+
+    archive, target_dir, manifest_path = Path(archive), Path(target_dir), Path(manifest_path)
+    digest = sha256_file(archive)
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    members = manifest.get("members", {})
+    if manifest.get("archive_sha256") == digest and all(
+        (target_dir / name).is_file() and (target_dir / name).stat().st_size == size
+        for name, size in members.items()
+    ):
+        logger.info(f"{archive} unchanged since last extraction; skipping")
+        return False
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+    root = target_dir.resolve()
+    members = {}
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            out = (target_dir / info.filename).resolve()
+            if root not in out.parents:
+                raise ValueError(f"Refusing to extract {info.filename} outside {target_dir}")
+            out.parent.mkdir(parents=True, exist_ok=True)
+            tmp = out.with_name(out.name + ".tmp")
+            # zipfile checks each member's CRC as it is read
+            with zf.open(info) as src, open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            os.replace(tmp, out)
+            members[info.filename] = info.file_size
+
+    manifest_path.write_text(json.dumps({"archive_sha256": digest, "members": members}, indent=4))
+    logger.info(f"Extracted {len(members)} files from {archive} to {target_dir}")
+    return True
@@ -1,55 +1,153 @@
 import os
+import shutil
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
+import numpy as np
 import pandas as pd
+from pathlib import Path
 from src.Churn_Predictor.entity.config_entity import DataTransformationConfig
 from src.Churn_Predictor import logger
+from src.Churn_Predictor.utils.common import save_json, file_digest, read_csv_typed
+from churn_inference import KEY_HASH, customer_key_hashes
 
 
 class DataTransformation:
     def __init__(self, config: DataTransformationConfig):
         self.config = config
+        self.total_charges_fill = None
     
 
     def initiate_data_transformation(self):
-        logger.info("Reading data from csv file")
-        df = pd.read_csv(self.config.data_path)
-
-
-        logger.info("Dropping the 'customerID' column from the dataset")
-        df.drop('customerID', axis=1, inplace=True)
+        logger.info("Reading data from csv file, skipping the 'customerID' column")
+        df = read_csv_typed(
+            Path(self.config.data_path),
+            self.config.raw_dtypes,
+            usecols=lambda col: col != 'customerID'
+        )
+        logger.info(f"Raw frame memory: {df.memory_usage(deep=True).sum() / 1e6:.1f} MB")
 
         logger.info("Finding Null values in the dataset")
         null_counts = df.isnull().sum()
         logger.info(f"Null value counts:\n{null_counts}")
 
+        # Before the mean fill: a blank TotalCharges must fingerprint the same
+        # in every load, whatever the mean of that load is
+        logger.info("Finding the Duplicated values in the dataset")
+        df = self.drop_duplicate_rows(df)
+        logger.info("Duplicated values dropped")
+
+        return self.clean_total_charges(df)
+
+    def clean_total_charges(self, df):
+        """TotalCharges as numbers, blanks (new customers) filled with the
+        mean of the training load. The mean is kept, so the feature table
+        (save_feature_table) is imputed exactly as the training data was."""
         logger.info("Converting 'TotalCharges' to numeric, coercing errors to NaN")
         df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
-        logger.info("Finding Null values in 'TotalCharges' after conversion")
         total_charges_null_count = df['TotalCharges'].isnull().sum()
         logger.info(f"Null value count in 'TotalCharges' after conversion: {total_charges_null_count}")
 
-        logger.info("Filling mean_values in 'TotalCharges' Null Rows")
-        mean_total_charges = df['TotalCharges'].mean()
-        df['TotalCharges'].fillna(mean_total_charges, inplace=True)
-        logger.info("Mean value filled in 'TotalCharges' Null Rows")
+        if self.total_charges_fill is None:
+            self.total_charges_fill = float(df['TotalCharges'].mean())
+        logger.info(f"Filling 'TotalCharges' Null Rows with the mean {self.total_charges_fill:.2f}")
+        df['TotalCharges'] = df['TotalCharges'].fillna(self.total_charges_fill).astype(self.config.feature_dtypes['TotalCharges'])
+        return df
 
-        logger.info("Finding the Duplicated values in the dataset")
-        duplicated_count = df.duplicated().sum()
-        logger.info(f"Duplicated value count: {duplicated_count}")
+    def drop_duplicate_rows(self, df):
+        """Drop repeated rows using one 64-bit fingerprint per row.
 
-        logger.info("Dropping the Duplicated values in the dataset")
-        df.drop_duplicates(keep='first', inplace=True)
-        logger.info("Duplicated values dropped")
+        Rows are hashed column-wise in a single vectorized pass and duplicates
+        are found on the uint64 fingerprints, not on the row values. Missing
+        values hash to a fixed sentinel, so rows are fingerprinted before any
+        imputation. The sorted
+        unique fingerprints are saved to row_hash_index_path. With
+        dedup_mode=incremental, rows already in that index from earlier loads
+        are dropped as well, and only the new fingerprints are merged in.
+        """
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        keep = ~pd.Series(hashes).duplicated(keep='first').to_numpy()
+        logger.info(f"Duplicated value count: {int((~keep).sum())}")
 
-        return df
+        if self.config.dedup_mode not in ('snapshot', 'incremental'):
+            raise ValueError(f"Unknown dedup_mode: {self.config.dedup_mode}")
+        index_path = Path(self.config.row_hash_index_path)
+        source = file_digest(Path(self.config.data_path))
+        seen, sources = np.unique(hashes), [source]
+        if self.config.dedup_mode == 'incremental' and index_path.exists():
+            with np.load(index_path) as index:
+                seen, sources = index['hashes'], index['sources'].tolist()
+            if source in sources:
+                logger.warning(f"{self.config.data_path} ({source}) is already in the row index; deduplicating within this load only")
+            else:
+                # The index is sorted, so membership is a binary search per row
+                positions = np.searchsorted(seen, hashes)
+                inside = positions < len(seen)
+                already_seen = np.zeros(len(hashes), dtype=bool)
+                already_seen[inside] = seen[positions[inside]] == hashes[inside]
+                logger.info(f"Rows already seen in earlier loads: {int((already_seen & keep).sum())}")
+                keep &= ~already_seen
+                seen = np.union1d(seen, hashes[keep])
+                sources.append(source)
+
+        tmp = index_path.with_name(index_path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(f, hashes=seen, sources=np.array(sources))
+        os.replace(tmp, index_path)
+        logger.info(f"Row hash index with {len(seen)} rows saved to {index_path}")
+        return df[keep]
     
+    def save_reference_profile(self, df, n_bins=10, max_categories=50):
+        """Save per-feature distributions of the cleaned raw data as the
+        reference the serving-side drift monitor compares live inputs against"""
+        logger.info("Building reference profile for drift monitoring")
+        features = {}
+        for col in df.columns.drop('Churn', errors='ignore'):
+            values = df[col]
+            if pd.api.types.is_numeric_dtype(values) and values.nunique() > n_bins:
+                # Quantile bin edges so every reference bin holds similar mass
+                edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+                bins = np.searchsorted(edges, values.to_numpy(), side='right')
+                counts = np.bincount(bins, minlength=len(edges) + 1)
+                features[col] = {
+                    'type': 'numeric',
+                    'edges': edges.tolist(),
+                    'proportions': (counts / counts.sum()).tolist(),
+                    'min': float(values.min()),
+                    'max': float(values.max()),
+                }
+            else:
+                proportions = values.astype(str).value_counts(normalize=True).head(max_categories)
+                features[col] = {
+                    'type': 'categorical',
+                    'proportions': {str(k): float(v) for k, v in proportions.items()},
+                }
+
+        profile = {'n_rows': int(len(df)), 'features': features}
+        save_json(path=Path(self.config.reference_profile_path), data=profile)
+        logger.info(f"Reference profile saved to {self.config.reference_profile_path}")
+        return profile
+
+    @staticmethod
+    def _merge_categories(values, mapping):
+        """Categorical replace that may merge categories, done on the codes
+        (no strings materialized). Categories come out sorted, so the codes
+        equal what LabelEncoder would assign."""
+        values = values.astype('category')
+        renamed = values.cat.categories.map(lambda c: mapping.get(c, c))
+        merged = pd.Index(sorted(set(renamed)))
+        recode = merged.get_indexer(renamed)
+        codes = values.cat.codes.to_numpy()
+        return pd.Series(
+            pd.Categorical.from_codes(np.where(codes < 0, -1, recode[codes]), categories=merged),
+            index=values.index
+        )
+
     def initiate_data_preprocessing(self, df):
         logger.info("Preparing data for preproceesing")
-        df = df.replace({
+        replacements = {
             'No internet service': 'No',
             'No phone service': 'No'
-            })
+            }
         
         binary_cols = ['gender', 'Partner', 'Dependents', 'PhoneService', 
                'PaperlessBilling', 'MultipleLines', 'OnlineSecurity', 
@@ -58,18 +156,21 @@ class DataTransformation:
         
         multi_cols = ['InternetService', 'Contract', 'PaymentMethod']
 
-        le_target = LabelEncoder()
-        df['Churn'] = le_target.fit_transform(df['Churn'])
+        # Label-encode via the (sorted) category codes: same 0/1 values as
+        # LabelEncoder, without an object array per column
+        df['Churn'] = self._merge_categories(df['Churn'], {}).cat.codes
 
         for cols in binary_cols:
-            le = LabelEncoder()
-            df[cols] = le.fit_transform(df[cols])
+            df[cols] = self._merge_categories(df[cols], replacements).cat.codes
         
         df = pd.get_dummies(data=df, columns=multi_cols, drop_first=True)
+        dtypes = self.config.feature_dtypes
+        df = df.astype({col: dtypes[col] for col in df.columns if col in dtypes})
         logger.info("Data preprocessing completed")
 
         logger.info(f"Final info of the dataframe after preprocessing: {df.shape}")
         logger.info(f"Final columns of the dataframe after preprocessing: {df.columns.to_list()}")
+        logger.info(f"Processed frame memory: {df.memory_usage(deep=True).sum() / 1e6:.1f} MB")
         return df
 
     def initiate_train_test_split(self, df):
@@ -83,4 +184,76 @@ class DataTransformation:
         logger.info(f"Train and test data saved in {self.config.root_dir}")
         logger.info(f"Train data shape: {train.shape}")
         logger.info(f"Test data shape: {test.shape}")
-        
\ No newline at end of file
+        
+    @staticmethod
+    def slot_table(ids, capacity: int):
+        """Linear-probing slot table (int64 row numbers, -1 = empty) of the
+        fixed-width ID array, built on arrays: every round, each row still
+        waiting claims its current slot if that is empty (one row per slot),
+        and the others move one slot on. A repeated ID keeps its latest row."""
+        mask = capacity - 1
+        slots = np.full(capacity, -1, dtype=np.int64)
+        _, last = np.unique(ids[::-1], return_index=True)
+        rows = np.sort(len(ids) - 1 - last)
+        position = (customer_key_hashes(ids[rows]) & np.uint64(mask)).astype(np.int64)
+        while len(rows):
+            free = slots[position] == -1
+            # First waiting row per free slot wins it
+            _, first = np.unique(position[free], return_index=True)
+            winners = np.flatnonzero(free)[first]
+            slots[position[winners]] = rows[winners]
+            waiting = np.ones(len(rows), dtype=bool)
+            waiting[winners] = False
+            rows, position = rows[waiting], (position[waiting] + 1) & mask
+        return slots
+
+    def save_feature_table(self):
+        """
+        Write every customer's encoded feature vector keyed by customerID, for
+        point lookups at serving time (backend/services/feature_store.py):
+
+            features.npy   float32 (n, 23) in training column order
+            ids.npy        customerIDs as fixed-width bytes
+            slots.npy      open-addressing hash table (customer_key_hash of
+                           the ID, linear probing) of row numbers, -1 = empty
+            meta.json      column order, row count, source data version
+
+        All arrays are plain .npy so the backend can memory-map them. The
+        table is built in a temp directory and swapped in whole.
+        """
+        logger.info("Building customer feature table")
+        raw = read_csv_typed(Path(self.config.data_path), self.config.raw_dtypes)
+        ids = np.char.encode(raw.pop('customerID').to_numpy(dtype=str), 'utf-8')
+        raw = self.clean_total_charges(raw)
+
+        columns = [col for col in self.config.feature_dtypes if col != 'Churn']
+        encoded = self.initiate_data_preprocessing(raw)
+        features = encoded.reindex(columns=columns, fill_value=0).to_numpy(dtype=np.float32)
+
+        # Power-of-two capacity at least twice the rows keeps probe chains short
+        capacity = 1 << max(1, (2 * len(ids) - 1).bit_length())
+        slots = self.slot_table(ids, capacity)
+
+        table_dir = Path(self.config.feature_table_dir)
+        tmp_dir = table_dir.with_name(table_dir.name + '.tmp')
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        np.save(tmp_dir / 'features.npy', features)
+        np.save(tmp_dir / 'ids.npy', ids)
+        np.save(tmp_dir / 'slots.npy', slots)
+        save_json(path=tmp_dir / 'meta.json', data={
+            'columns': columns,
+            'n_rows': int(len(ids)),
+            'capacity': capacity,
+            'hash': KEY_HASH,
+            'data_version': file_digest(Path(self.config.data_path)),
+        })
+
+        # Open memory maps keep reading the old files until they reload
+        old_dir = table_dir.with_name(table_dir.name + '.old')
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if table_dir.exists():
+            os.replace(table_dir, old_dir)
+        os.replace(tmp_dir, table_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        logger.info(f"Feature table with {len(ids)} customers saved to {table_dir}")
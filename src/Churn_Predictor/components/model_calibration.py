@@ -0,0 +1,147 @@
+import numpy as np
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from src.Churn_Predictor.entity.config_entity import ModelCalibrationConfig
+from src.Churn_Predictor.components.model_trainer import ModelTrainer
+from src.Churn_Predictor import logger
+from src.Churn_Predictor.utils.common import save_json, load_json, load_classifier, file_digest
+from churn_inference import calibration_knots, calibrate, sidecar_path
+from datetime import datetime, timezone
+from pathlib import Path
+import time
+
+METHODS = ("isotonic", "platt", "none")
+
+
+def reliability(probabilities, actual, n_bins: int = 10) -> list:
+    """Reliability diagram over n_bins equal-width probability bins: rows,
+    mean predicted probability and observed churn rate of each non-empty bin"""
+    p = np.asarray(probabilities, dtype=np.float64)
+    y = np.asarray(actual, dtype=np.float64)
+    bins = np.minimum((p * n_bins).astype(int), n_bins - 1)
+    count = np.bincount(bins, minlength=n_bins)
+    predicted = np.bincount(bins, weights=p, minlength=n_bins)
+    observed = np.bincount(bins, weights=y, minlength=n_bins)
+    return [
+        {
+            "bin": [int(i) / n_bins, (int(i) + 1) / n_bins],
+            "rows": int(count[i]),
+            "mean_predicted": float(predicted[i] / count[i]),
+            "observed_rate": float(observed[i] / count[i]),
+        }
+        for i in np.flatnonzero(count)
+    ]
+
+
+def expected_calibration_error(probabilities, actual, n_bins: int = 10) -> float:
+    """Row-weighted mean |mean predicted - observed rate| over the bins"""
+    table = reliability(probabilities, actual, n_bins)
+    n = sum(b["rows"] for b in table)
+    return float(sum(b["rows"] * abs(b["mean_predicted"] - b["observed_rate"]) for b in table) / n)
+
+
+def calibration_summary(probabilities, actual, n_bins: int = 10) -> dict:
+    """ECE, Brier score and reliability table of one set of probabilities"""
+    p = np.asarray(probabilities, dtype=np.float64)
+    return {
+        "ece": expected_calibration_error(p, actual, n_bins),
+        "brier": float(np.mean((p - np.asarray(actual)) ** 2)),
+        "reliability": reliability(p, actual, n_bins),
+    }
+
+
+class ModelCalibration:
+    """Maps the trained model's raw probabilities (inflated by
+    scale_pos_weight) to calibrated ones. The map is fit on out-of-fold
+    predictions over train_data_path, from models refit with the trainer's
+    hyperparameters and tree count, so it never sees a row scored by a model
+    that trained on it; the final model is left untouched."""
+
+    def __init__(self, config: ModelCalibrationConfig, trainer: ModelTrainer):
+        self.config = config
+        self.trainer = trainer
+
+    def out_of_fold_probabilities(self, X, y, n_estimators: int):
+        """Churn probability of every training row from a model fit on the
+        other cv_folds - 1 folds"""
+        folds = StratifiedKFold(n_splits=self.config.cv_folds, shuffle=True, random_state=self.trainer.config.random_state)
+        probabilities = np.empty(len(y), dtype=np.float64)
+        for train_idx, held_out in folds.split(X, y):
+            xgb = self.trainer.build_classifier(n_estimators=n_estimators)
+            xgb.fit(X.iloc[train_idx], y.iloc[train_idx])
+            probabilities[held_out] = xgb.predict_proba(X.iloc[held_out])[:, 1]
+        return probabilities
+
+    def fit_table(self, probabilities, actual) -> dict:
+        """Calibration table: knots of a non-decreasing piecewise-linear map
+
+        isotonic  the isotonic regression's own breakpoints (exact)
+        platt     a sigmoid on the raw log-odds, tabulated at table_size
+                  quantiles of the raw probabilities plus 0 and 1
+        """
+        if self.config.method == "isotonic":
+            iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip").fit(probabilities, actual)
+            x, y = iso.X_thresholds_, iso.y_thresholds_
+        elif self.config.method == "platt":
+            eps = 1e-6
+            logit = lambda p: np.log(p / (1 - p))
+            raw = logit(np.clip(probabilities, eps, 1 - eps)).reshape(-1, 1)
+            platt = LogisticRegression(C=1e6).fit(raw, actual)
+            x = np.unique(np.concatenate([[0.0, 1.0], np.quantile(probabilities, np.linspace(0, 1, self.config.table_size))]))
+            y = platt.predict_proba(logit(np.clip(x, eps, 1 - eps)).reshape(-1, 1))[:, 1]
+        else:
+            raise ValueError(f"method must be one of {METHODS}, got {self.config.method!r}")
+        return {"method": self.config.method, "x": [float(v) for v in x], "y": [float(v) for v in y]}
+
+    def write_sidecar(self, table):
+        """Put the table in the model's sidecar (None removes it), where
+        ModelHandle picks it up"""
+        sidecar = sidecar_path(Path(self.config.model_path))
+        if not sidecar.exists():
+            logger.warning(f"No sidecar at {sidecar}; serving stays uncalibrated")
+            return
+        meta = dict(load_json(sidecar))
+        meta.pop("calibration", None)
+        if table is not None:
+            meta["calibration"] = table
+        save_json(path=sidecar, data=meta)
+
+    def calibrate_model(self):
+        if self.config.method == "none":
+            logger.info("Calibration disabled (method: none); serving raw probabilities")
+            self.write_sidecar(None)
+            return None
+
+        start = time.perf_counter()
+        model = load_classifier(Path(self.config.model_path))
+        n_estimators = int(model.get_booster().num_boosted_rounds())
+        X, y = self.trainer.load_xy(self.config.train_data_path)
+        raw = self.out_of_fold_probabilities(X, y, n_estimators)
+        table = self.fit_table(raw, y.to_numpy())
+        calibrated = calibrate(raw, calibration_knots(table))
+        before = expected_calibration_error(raw, y, self.config.reliability_bins)
+        after = expected_calibration_error(calibrated, y, self.config.reliability_bins)
+        seconds = time.perf_counter() - start
+
+        self.write_sidecar(table)
+        save_json(path=Path(self.config.calibration_file_name), data={
+            **table,
+            "knots": len(table["x"]),
+            "model_version": file_digest(Path(self.config.model_path)),
+            "calibrated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "fit_seconds": round(seconds, 3),
+            "training_data": {
+                "path": str(self.config.train_data_path),
+                "version": file_digest(Path(self.config.train_data_path)),
+                "rows": int(len(y)),
+            },
+            "cv_folds": self.config.cv_folds,
+            # On the out-of-fold predictions the map was fit to (optimistic
+            # for the calibrated side); ModelEvaluation reports the test set
+            "out_of_fold": {"ece_raw": before, "ece_calibrated": after},
+        })
+        logger.info(f"{self.config.method} calibration with {len(table['x'])} knots fit on {len(y)} out-of-fold "
+                    f"predictions in {seconds:.1f}s (ECE {before:.4f} -> {after:.4f}); saved to "
+                    f"{self.config.calibration_file_name} and {sidecar_path(Path(self.config.model_path))}")
+        return table
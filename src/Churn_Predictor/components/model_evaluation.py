@@ -1,18 +1,38 @@
 import os
+import numpy as np
 import pandas as pd
-import joblib
-import mlflow
-import mlflow.sklearn
-from dotenv import load_dotenv
 from urllib.parse import urlparse
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 from src.Churn_Predictor.entity.config_entity import ModelEvaluationConfig
 from pathlib import Path
 from src.Churn_Predictor import logger
-from src.Churn_Predictor.utils.common import save_json
+from src.Churn_Predictor.utils.common import save_json, load_json, read_csv_typed, load_classifier, file_digest
+from src.Churn_Predictor.components.model_calibration import calibration_summary
+from churn_inference import DECISION_THRESHOLD, RISK_BANDS, sidecar_path, calibration_knots, calibrate
 
-# Load environment variables at module level
-load_dotenv()
+
+def profit_curve(probabilities, actual, cost_matrix: dict):
+    """Expected campaign profit for every possible threshold in one pass.
+
+    Targeting the k most likely churners earns true_positive or
+    false_positive on those k and false_negative or true_negative on the
+    rest; after one sort that is a base sum plus a cumulative sum of per-row
+    gains. Only cuts between distinct probabilities are kept (a threshold
+    cannot split ties); each sits midway between its neighbours.
+
+    Returns (cuts, targeted, profit): candidate thresholds, from 1.0 (nobody)
+    down to 0.0 (everybody), with the customers above each and the profit.
+    """
+    p = np.asarray(probabilities, dtype=np.float64)
+    order = np.argsort(-p, kind="stable")
+    p, y = p[order], np.asarray(actual)[order].astype(bool)
+    cm = cost_matrix
+    gain = np.where(y, cm['true_positive'] - cm['false_negative'], cm['false_positive'] - cm['true_negative'])
+    base = np.where(y, cm['false_negative'], cm['true_negative']).sum()
+    profit = base + np.concatenate([[0.0], np.cumsum(gain)])  # profit[k]: top k targeted
+    targeted = np.flatnonzero(np.concatenate([[True], p[:-1] > p[1:], [True]]))
+    cuts = np.concatenate([[1.0], (p[:-1] + p[1:]) / 2, [0.0]])[targeted]
+    return cuts, targeted, profit[targeted]
 
 
 class ModelEvaluation:
@@ -33,6 +53,131 @@ class ModelEvaluation:
             "f1_score": f1
         }
     
+    def test_probabilities(self, model, test_x):
+        """Raw (uncalibrated) churn probabilities on the test set, cached in
+        probabilities_cache and reused while the model file and the test data
+        are unchanged"""
+        cache = Path(self.config.probabilities_cache)
+        key = {
+            "model_version": file_digest(Path(self.config.model_path)),
+            "data_version": file_digest(Path(self.config.test_data_path)),
+        }
+        if cache.exists():
+            cached = np.load(cache)
+            if all(str(cached[k]) == v for k, v in key.items()):
+                logger.info(f"Using cached test probabilities from {cache}")
+                return cached["probabilities"]
+
+        probabilities = model.predict_proba(test_x)[:, 1]
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(cache, probabilities=probabilities, **key)
+        logger.info(f"Test probabilities cached at {cache}")
+        return probabilities
+
+    def served_probabilities(self, probabilities):
+        """Test probabilities as the serving layer reports them: mapped
+        through the sidecar's calibration table when there is one. Returns
+        (probabilities, calibration method or None)."""
+        sidecar = sidecar_path(Path(self.config.model_path))
+        table = dict(load_json(sidecar)).get("calibration") if sidecar.exists() else None
+        if not table:
+            return probabilities, None
+        return calibrate(probabilities, calibration_knots(table)), table["method"]
+
+    def calibration_report(self, raw, calibrated, actual, method):
+        """Reliability table, ECE and Brier score before and after
+        calibration, saved to calibration_report_name"""
+        bins = self.config.reliability_bins
+        report = {
+            "method": method,
+            "bins": bins,
+            "customers": len(actual),
+            "raw": calibration_summary(raw, actual, bins),
+            "calibrated": calibration_summary(calibrated, actual, bins) if method else None,
+        }
+        save_json(path=Path(self.config.calibration_report_name), data=report)
+        if method:
+            logger.info(f"Test ECE {report['raw']['ece']:.4f} -> {report['calibrated']['ece']:.4f}, Brier "
+                        f"{report['raw']['brier']:.4f} -> {report['calibrated']['brier']:.4f} ({method} calibration)")
+        else:
+            logger.info(f"Test ECE {report['raw']['ece']:.4f}, Brier {report['raw']['brier']:.4f} (uncalibrated model)")
+        return report
+
+    def optimize_thresholds(self, probabilities, actual):
+        """Decision threshold and risk bands maximizing expected profit under
+        the cost matrix and campaign capacity:
+
+        threshold    best cut with no capacity limit: every customer above it
+                     is worth an offer (prediction 1); also the Medium Risk cut
+        High Risk    best cut among those targeting at most
+                     campaign_capacity of the customers (the top-K)
+
+        When the capacity does not bind both cuts coincide and there is no
+        Medium Risk band."""
+        cuts, targeted, profit = profit_curve(probabilities, actual, self.config.cost_matrix)
+        capacity = int(self.config.campaign_capacity * len(probabilities))
+        best = int(np.argmax(profit))
+        within = np.flatnonzero(targeted <= capacity)
+        best_capped = int(within[np.argmax(profit[within])])
+
+        # Profit at the fixed DECISION_THRESHOLD, for comparison (a strict
+        # threshold always targets a whole prefix of tied probabilities)
+        default_k = int((np.asarray(probabilities) > DECISION_THRESHOLD).sum())
+        default_profit = float(profit[np.searchsorted(targeted, default_k)])
+
+        threshold = float(cuts[best])
+        high = max(float(cuts[best_capped]), threshold)
+        return {
+            "threshold": threshold,
+            "risk_bands": {"high_above": round(high * 100, 2), "medium_above": round(threshold * 100, 2)},
+            "cost_matrix": dict(self.config.cost_matrix),
+            "campaign_capacity": self.config.campaign_capacity,
+            "customers": len(probabilities),
+            "targeted": {"threshold": int(targeted[best]), "high_risk": int(targeted[best_capped])},
+            "expected_profit": {
+                "threshold": float(profit[best]),
+                "high_risk": float(profit[best_capped]),
+                "default_threshold": default_profit,
+            },
+            "metrics_at_threshold": self.evaluate_model(actual, np.asarray(probabilities) > threshold),
+        }
+
+    def write_thresholds(self, result):
+        """Save the optimization result and put threshold and risk bands in
+        the model's sidecar, where ModelHandle picks them up"""
+        save_json(path=Path(self.config.threshold_file_name), data=result)
+        sidecar = sidecar_path(Path(self.config.model_path))
+        if not sidecar.exists():
+            logger.warning(f"No sidecar at {sidecar}; serving keeps the default threshold and risk bands")
+            return
+        meta = dict(load_json(sidecar))
+        meta["threshold"] = result["threshold"]
+        meta["risk_bands"] = result["risk_bands"]
+        save_json(path=sidecar, data=meta)
+        logger.info(f"Threshold {result['threshold']:.4f} and risk bands {result['risk_bands']} written to {sidecar}")
+
+    def served_threshold(self, thresholds=None) -> float:
+        """Decision threshold serving applies: the one just optimized, else
+        the sidecar's, else DECISION_THRESHOLD"""
+        if thresholds is not None:
+            return thresholds["threshold"]
+        sidecar = sidecar_path(Path(self.config.model_path))
+        meta = dict(load_json(sidecar)) if sidecar.exists() else {}
+        return float(meta.get("threshold", DECISION_THRESHOLD))
+
+    def decision_metrics(self, raw, probabilities, actual, threshold: float) -> dict:
+        """Metrics of the decisions serving makes (calibrated probabilities
+        above the served threshold), plus the same metrics for raw
+        probabilities at DECISION_THRESHOLD (suffix _raw_default) for
+        comparison with earlier runs"""
+        served = self.evaluate_model(actual, np.asarray(probabilities) > threshold)
+        default = self.evaluate_model(actual, np.asarray(raw) > DECISION_THRESHOLD)
+        return {
+            **served,
+            "threshold": threshold,
+            **{f"{name}_raw_default": value for name, value in default.items()},
+        }
+
     def setup_mlflow_auth(self):
         """Setup MLflow authentication from environment variables"""
         username = os.getenv('MLFLOW_TRACKING_USERNAME')
@@ -51,14 +196,20 @@ class ModelEvaluation:
     
     def initiate_model_evaluation(self):
         """Evaluate model and log to MLflow"""
+        # Imported here so that importing this module stays cheap
+        import mlflow
+        import mlflow.sklearn
+        from dotenv import load_dotenv
+
+        load_dotenv()
         logger.info("Starting model evaluation")
         
         # Load test data and model
         logger.info(f"Loading test data from: {self.config.test_data_path}")
-        test_data = pd.read_csv(self.config.test_data_path)
+        test_data = read_csv_typed(Path(self.config.test_data_path), self.config.feature_dtypes)
         
         logger.info(f"Loading model from: {self.config.model_path}")
-        model = joblib.load(self.config.model_path)
+        model = load_classifier(Path(self.config.model_path))
 
         # Prepare test data
         test_x = test_data.drop(self.config.target_column, axis=1)
@@ -67,6 +218,23 @@ class ModelEvaluation:
         logger.info(f"Test data shape: {test_x.shape}")
         logger.info(f"Target column: {self.config.target_column}")
 
+        # Thresholds are cut points on the probabilities serving reports, so
+        # they are optimized after calibration
+        raw = self.test_probabilities(model, test_x)
+        probabilities, method = self.served_probabilities(raw)
+        calibration = self.calibration_report(raw, probabilities, test_y.to_numpy(), method)
+
+        thresholds = None
+        if self.config.optimize_threshold:
+            thresholds = self.optimize_thresholds(probabilities, test_y.to_numpy())
+            profit = thresholds["expected_profit"]
+            logger.info(f"Profit-optimal threshold {thresholds['threshold']:.4f} (expected profit {profit['threshold']:.0f} "
+                        f"vs {profit['default_threshold']} at {DECISION_THRESHOLD}); risk bands {thresholds['risk_bands']} "
+                        f"(default {RISK_BANDS})")
+            self.write_thresholds(thresholds)
+
+        metrics = self.decision_metrics(raw, probabilities, test_y.to_numpy(), self.served_threshold(thresholds))
+
         # Setup MLflow authentication
         auth_success = self.setup_mlflow_auth()
         
@@ -85,14 +253,8 @@ class ModelEvaluation:
             with mlflow.start_run():
                 logger.info("MLflow run started")
                 
-                # Make predictions
-                pred = model.predict(test_x)
-                
-                # Calculate metrics
-                metrics = self.evaluate_model(test_y, pred)
-                
                 logger.info("=" * 50)
-                logger.info("MODEL EVALUATION METRICS")
+                logger.info(f"MODEL EVALUATION METRICS (threshold {metrics['threshold']:.4f})")
                 logger.info("=" * 50)
                 logger.info(f"Accuracy:  {metrics['accuracy']:.4f}")
                 logger.info(f"Precision: {metrics['precision']:.4f}")
@@ -102,7 +264,20 @@ class ModelEvaluation:
 
                 # Log parameters and metrics to MLflow
                 mlflow.log_params(self.config.all_params)
+                mlflow.set_tags({"params_source": self.config.params_source, "params_version": self.config.params_version})
                 mlflow.log_metrics(metrics)
+                if thresholds is not None:
+                    mlflow.log_metrics({
+                        "optimal_threshold": thresholds["threshold"],
+                        "expected_profit": thresholds["expected_profit"]["threshold"],
+                        "expected_profit_high_risk": thresholds["expected_profit"]["high_risk"],
+                    })
+                mlflow.log_metrics({"ece_raw": calibration["raw"]["ece"], "brier_raw": calibration["raw"]["brier"]})
+                if calibration["calibrated"] is not None:
+                    mlflow.log_metrics({
+                        "ece_calibrated": calibration["calibrated"]["ece"],
+                        "brier_calibrated": calibration["calibrated"]["brier"],
+                    })
                 
                 # Save metrics locally
                 save_json(path=Path(self.config.metric_file_name), data=metrics)
@@ -129,7 +304,6 @@ class ModelEvaluation:
             logger.warning("Continuing without MLflow tracking")
             
             # Save metrics locally even if MLflow fails
-            metrics = self.evaluate_model(test_y, model.predict(test_x))
             save_json(path=self.config.metric_file_name, data=metrics)
             logger.info(f"Metrics saved locally to: {self.config.metric_file_name}")
             
@@ -1,24 +1,44 @@
+import copy
+import numpy as np
 import pandas as pd
+import xgboost
 from xgboost import XGBClassifier
 from src.Churn_Predictor.entity.config_entity import ModelTrainerConfig
 from src.Churn_Predictor import logger
+from src.Churn_Predictor.utils.common import save_json, load_json, file_digest, read_csv_typed, load_classifier
+from churn_inference import DECISION_THRESHOLD, sidecar_path
+from datetime import datetime, timezone
+from pathlib import Path
 import joblib
-import os
+import time
 
 class ModelTrainer:
     def __init__(self, config: ModelTrainerConfig):
         self.config = config
 
-    def train_model(self):
-        train_data = pd.read_csv(self.config.train_data_path)
-        test_data = pd.read_csv(self.config.test_data_path)
+    @property
+    def model_path(self) -> Path:
+        return Path(self.config.root_dir) / self.config.model_name
+
+    @property
+    def booster_path(self) -> Path:
+        return Path(self.config.root_dir) / self.config.booster_name
+
+    @property
+    def metadata_path(self) -> Path:
+        return Path(self.config.root_dir) / self.config.metadata_name
 
-        X_train = train_data.drop(columns=[self.config.target_column])
-        y_train = train_data[self.config.target_column]
-        X_test = test_data.drop(columns=[self.config.target_column])
-        y_test = test_data[self.config.target_column]
+    @property
+    def onnx_model_path(self) -> Path:
+        return Path(self.config.root_dir) / self.config.onnx_model_name
 
-        xgb = XGBClassifier(
+    def build_classifier(self, **overrides) -> XGBClassifier:
+        """XGBClassifier with the resolved hyperparameters (params.yaml or
+        tuned, see params_source) and training settings (plus overrides)"""
+        params = dict(
+            tree_method=self.config.tree_method,
+            n_jobs=self.config.n_jobs,
+            max_bin=self.config.max_bin,
             learning_rate=self.config.learning_rate,
             max_depth=self.config.max_depth,
             n_estimators=self.config.n_estimators,
@@ -31,7 +51,217 @@ class ModelTrainer:
             reg_alpha=self.config.reg_alpha,
             reg_lambda=self.config.reg_lambda
         )
-        xgb.fit(X_train, y_train)
-        logger.info("Model training completed.")
-    
-        joblib.dump(xgb, os.path.join(self.config.root_dir, self.config.model_name))
\ No newline at end of file
+        params.update(overrides)
+        return XGBClassifier(**params)
+
+    def load_xy(self, path):
+        """Features parsed straight into the schema.yaml FEATURE_DTYPES (int8
+        flags, bool dummies, float32 charges; anything unlisted gets the
+        XGBTraining dtype) with no float64/int64 intermediate. With
+        tree_method=hist, fit() quantizes this once without another full copy."""
+        header = pd.read_csv(path, nrows=0).columns
+        dtypes = {col: self.config.feature_dtypes.get(col, self.config.dtype) for col in header}
+        dtypes[self.config.target_column] = "int8"
+        data = read_csv_typed(Path(path), dtypes)
+        return data.drop(columns=[self.config.target_column]), data[self.config.target_column]
+
+    def fit_full(self, X, y) -> XGBClassifier:
+        xgb = self.build_classifier()
+        xgb.fit(X, y)
+        return xgb
+
+    def load_tuned_model(self, data_path):
+        """The model tuner's best-trial model, when it can stand in for a full
+        fit: tuned params are in use, reuse_tuned_model is on and the training
+        data is the file the tuner saw. None otherwise."""
+        path = self.config.tuned_model_path
+        if path is None:
+            return None
+        if not Path(path).exists():
+            logger.warning(f"Tuned model {path} is missing; fitting from scratch")
+            return None
+        if file_digest(Path(data_path)) != self.config.tuned_data_version:
+            logger.info(f"{data_path} changed since tuning; fitting from scratch")
+            return None
+        logger.info(f"Training data unchanged since tuning; reusing the tuned model {path}")
+        return load_classifier(Path(path))
+
+    def fit_incremental(self, previous: XGBClassifier, X, y, strategy=None) -> XGBClassifier:
+        """Warm-start from a trained model on new data.
+
+        continue: boost incremental_rounds more trees on top of the previous booster
+        refresh:  keep every tree's structure and re-fit the leaf values to the new data
+        """
+        strategy = strategy or self.config.incremental_strategy
+        booster = previous.get_booster()
+        if strategy == "continue":
+            xgb = self.build_classifier(n_estimators=self.config.incremental_rounds)
+            xgb.fit(X, y, xgb_model=booster)
+            return xgb
+        if strategy == "refresh":
+            return self.refresh_leaves(booster, X, y)
+        raise ValueError(f"Unknown incremental_strategy: {strategy}")
+
+    def refresh_leaves(self, booster, X, y) -> XGBClassifier:
+        """Re-estimate the leaf values of every tree on (X, y). The refresh
+        updater cannot read the QuantileDMatrix the sklearn fit() builds for
+        tree_method=hist, so this goes through xgboost.train with a plain
+        DMatrix and wraps the result in an XGBClassifier."""
+        params = self.build_classifier().get_xgb_params()
+        params.update(process_type="update", updater="refresh", refresh_leaf=True)
+        refreshed = xgboost.train(
+            params, xgboost.DMatrix(X, label=y),
+            num_boost_round=booster.num_boosted_rounds(), xgb_model=booster
+        )
+        xgb = self.build_classifier(n_estimators=refreshed.num_boosted_rounds())
+        xgb.load_model(bytearray(refreshed.save_raw("ubj")))
+        return xgb
+
+    def train_model(self):
+        incremental = self.config.training_mode == "incremental"
+        reused = False
+        previous_path = self.booster_path if self.booster_path.exists() else self.model_path
+        if incremental and not previous_path.exists():
+            logger.warning(f"No existing model at {self.booster_path}; falling back to full training")
+            incremental = False
+
+        start = time.perf_counter()
+        if incremental:
+            logger.info(f"Incremental training ({self.config.incremental_strategy}) on {self.config.new_data_path}")
+            data_path = self.config.new_data_path
+            X_train, y_train = self.load_xy(data_path)
+            previous = load_classifier(previous_path)
+            parent = self._read_metadata() or {"version": file_digest(previous_path)}
+            xgb = self.fit_incremental(previous, X_train, y_train)
+        else:
+            data_path = self.config.train_data_path
+            X_train, y_train = self.load_xy(data_path)
+            parent = None
+            xgb = self.load_tuned_model(data_path)
+            reused = xgb is not None
+            if not reused:
+                xgb = self.fit_full(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+        logger.info(f"Model training completed in {fit_seconds:.1f}s.")
+
+        joblib.dump(xgb, self.model_path)
+        self.save_booster(xgb)
+        onnx_path = self.export_onnx(xgb) if self.config.export_onnx else None
+        self._write_metadata(xgb, data_path, len(X_train), fit_seconds, parent, incremental, onnx_path, reused)
+        return xgb
+
+    def save_booster(self, xgb):
+        """Write the model in XGBoost's own UBJSON format (portable across
+        xgboost releases, unlike the pickle) and its JSON sidecar"""
+        xgb.save_model(self.booster_path)
+        booster = xgb.get_booster()
+        sidecar = {
+            "format": self.booster_path.suffix.lstrip("."),
+            "feature_names": list(booster.feature_names or []),
+            "feature_types": list(booster.feature_types or []),
+            "threshold": DECISION_THRESHOLD,
+            "version": file_digest(self.booster_path),
+            "xgboost_version": xgboost.__version__,
+        }
+        save_json(path=sidecar_path(self.booster_path), data=sidecar)
+        logger.info(f"Native model {sidecar['version']} saved to {self.booster_path}")
+        return self.booster_path
+
+    def export_onnx(self, xgb, path=None):
+        """Write the model as ONNX with one float32 input of shape (n, 23)
+        and outputs label / probabilities, then check it against the native
+        model on test_data_path. Needs the optional onnxmltools (and
+        onnxruntime for the check); skipped with a warning without them."""
+        path = Path(path or self.onnx_model_path)
+        try:
+            from onnxmltools import convert_xgboost
+            from onnxmltools.convert.common.data_types import FloatTensorType
+        except ImportError:
+            logger.warning("onnxmltools is not installed; skipping the ONNX export")
+            return None
+
+        # The converter only reads positional (f0, f1, ...) features without
+        # indicator types; the column order is fixed by the input instead
+        booster = xgb.get_booster()
+        n_features = booster.num_features()
+        positional = copy.deepcopy(xgb)
+        positional.get_booster().feature_names = None
+        positional.get_booster().feature_types = None
+        onnx_model = convert_xgboost(
+            positional, name="churn_xgboost",
+            initial_types=[("input", FloatTensorType([None, n_features]))]
+        )
+        path.write_bytes(onnx_model.SerializeToString())
+        logger.info(f"ONNX model saved to {path}")
+
+        max_diff = self.check_onnx_parity(xgb, path)
+        if max_diff is not None and max_diff > self.config.onnx_parity_tolerance:
+            path.unlink()
+            raise ValueError(
+                f"ONNX export disagrees with the native model by {max_diff:.2e} "
+                f"(tolerance {self.config.onnx_parity_tolerance}); removed {path}"
+            )
+        return path
+
+    def check_onnx_parity(self, xgb, path):
+        """Largest absolute churn probability difference between the native
+        and the ONNX model over test_data_path (None without onnxruntime)"""
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            logger.warning("onnxruntime is not installed; skipping the ONNX parity check")
+            return None
+
+        X_test, _ = self.load_xy(self.config.test_data_path)
+        X_test = X_test[xgb.get_booster().feature_names].to_numpy(dtype=np.float32)
+        session = ort.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+        onnx_proba = session.run(["probabilities"], {"input": X_test})[0][:, 1]
+        native_proba = xgb.predict_proba(X_test)[:, 1]
+        max_diff = float(np.abs(onnx_proba - native_proba).max())
+        labels_agree = float(np.mean(session.run(["label"], {"input": X_test})[0] == xgb.predict(X_test)))
+        logger.info(f"ONNX parity on {len(X_test)} test rows: max |p_onnx - p_native| = {max_diff:.2e}, labels agree {labels_agree:.2%}")
+        return max_diff
+
+    def _read_metadata(self):
+        if not self.metadata_path.exists():
+            return None
+        metadata = dict(load_json(self.metadata_path))
+        # Metadata written before the native digest became the version
+        native = metadata.get("native_model") or {}
+        metadata["version"] = native.get("version") or metadata.get("version")
+        return metadata
+
+    def _write_metadata(self, xgb, data_path, n_rows, fit_seconds, parent, incremental, onnx_path=None, reused=False):
+        """Record what this model was trained from and what it was derived from"""
+        lineage = []
+        if parent is not None:
+            lineage = list(parent.get("lineage", [])) + [{
+                "version": parent.get("version"),
+                "mode": parent.get("mode"),
+                "trained_at": parent.get("trained_at"),
+            }]
+        metadata = {
+            # The native model's digest: the version the sidecar, /models,
+            # metrics and audit rows report for this model
+            "version": file_digest(self.booster_path),
+            "mode": f"incremental:{self.config.incremental_strategy}" if incremental else "tuned" if reused else "full",
+            "trained_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "fit_seconds": round(fit_seconds, 3),
+            "training_data": {
+                "path": str(data_path),
+                "version": file_digest(Path(data_path)),
+                "rows": int(n_rows),
+            },
+            "num_trees": int(xgb.get_booster().num_boosted_rounds()),
+            "feature_names": list(xgb.get_booster().feature_names or []),
+            "native_model": {"path": str(self.booster_path), "version": file_digest(self.booster_path)},
+            "onnx_model": {"path": str(onnx_path), "version": file_digest(onnx_path)} if onnx_path else None,
+            "params_source": self.config.params_source,
+            "params_version": self.config.params_version,
+            "tuned_model": str(self.config.tuned_model_path) if reused else None,
+            "params": {k: v for k, v in xgb.get_params().items() if v is not None and isinstance(v, (int, float, str, bool))},
+            "parent_version": parent.get("version") if parent else None,
+            "lineage": lineage,
+        }
+        save_json(path=self.metadata_path, data=metadata)
+        logger.info(f"Model {metadata['version']} ({metadata['mode']}) metadata saved to {self.metadata_path}")
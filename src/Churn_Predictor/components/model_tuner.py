@@ -1,22 +1,57 @@
 import os
+import threading
 import pandas as pd
 import yaml
-import mlflow
-import optuna
+from datetime import datetime, timezone
 from pathlib import Path
 from xgboost import XGBClassifier
+from xgboost.callback import TrainingCallback
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import f1_score
-from dotenv import load_dotenv
 from src.Churn_Predictor import logger
 from src.Churn_Predictor.entity.config_entity import ModelTunerConfig
+from src.Churn_Predictor.utils.common import read_csv_typed, file_digest
 
-load_dotenv()
+
+SAMPLERS = ('tpe', 'cmaes', 'qmc', 'random')
+PRUNERS = ('median', 'hyperband', 'none')
+
+
+class _PruningCallback(TrainingCallback):
+    """Reports validation AUC to the trial after every boosting round and
+    stops the fit once the pruner gives up on the trial"""
+
+    def __init__(self, trial):
+        self.trial = trial
+
+    def after_iteration(self, model, epoch, evals_log):
+        import optuna
+
+        self.trial.report(evals_log['validation_0']['auc'][-1], epoch)
+        if self.trial.should_prune():
+            raise optuna.TrialPruned(f"Pruned at boosting round {epoch}")
+        return False
 
 
 class ModelTuner:
     def __init__(self, config: ModelTunerConfig):
         self.config = config
+        # (trial number, F1, model) of the best trial so far; trials may run
+        # concurrently
+        self._best = None
+        self._best_lock = threading.Lock()
+
+    def suggest_params(self, trial):
+        """Sample one point of the configured search space"""
+        params = {}
+        for name, spec in self.config.search_space.items():
+            if spec['type'] == 'int':
+                params[name] = trial.suggest_int(name, spec['low'], spec['high'], log=spec.get('log', False))
+            elif spec['type'] == 'float':
+                params[name] = trial.suggest_float(name, spec['low'], spec['high'], log=spec.get('log', False))
+            else:
+                raise ValueError(f"search_space.{name}.type must be int or float, got {spec['type']!r}")
+        return params
         
     def objective(self, trial, X_train, y_train, X_val, y_val):
         """
@@ -25,27 +60,19 @@ class ModelTuner:
         trial: Optuna trial object
         Returns: F1 score (to be maximized)
         """
-        # Define parameter search space
-        params = {
-            'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
-            'max_depth': trial.suggest_int('max_depth', 3, 10),
-            'n_estimators': trial.suggest_int('n_estimators', 50, 300),
-            'scale_pos_weight': trial.suggest_float('scale_pos_weight', 1, 5),
-            'subsample': trial.suggest_float('subsample', 0.6, 1.0),
-            'colsample_bytree': trial.suggest_float('colsample_bytree', 0.6, 1.0),
-            'min_child_weight': trial.suggest_int('min_child_weight', 1, 7),
-            'gamma': trial.suggest_float('gamma', 0, 0.5),
-            'reg_alpha': trial.suggest_float('reg_alpha', 0, 1),
-            'reg_lambda': trial.suggest_float('reg_lambda', 0, 1)
-        }
+        params = self.suggest_params(trial)
+        callbacks = [_PruningCallback(trial)] if self.config.pruner != 'none' else None
         
         # Train model with suggested parameters
         model = XGBClassifier(
             **params,
             random_state=42,
             use_label_encoder=False,
-            eval_metric='logloss',
+            # Early stopping watches the last metric (logloss); AUC feeds the pruner
+            eval_metric=['auc', 'logloss'],
             early_stopping_rounds=10,
+            n_jobs=max(1, (os.cpu_count() or 1) // self.config.n_jobs),  # Share cores between concurrent trials
+            callbacks=callbacks,
             verbosity=0  # Suppress XGBoost output
         )
         
@@ -58,18 +85,79 @@ class ModelTuner:
         # Predict and calculate F1 score
         y_pred = model.predict(X_val)
         f1 = f1_score(y_val, y_pred)
+        self._keep_if_best(trial.number, f1, model)
         
         return f1
-    
-    def tune_hyperparameters(self):
-        """
-        Main tuning method using Optuna
-        """
-        logger.info("Starting hyperparameter tuning with Optuna")
-        
-        # Load data
+
+    def _keep_if_best(self, number, f1, model):
+        with self._best_lock:
+            if self._best is None or f1 > self._best[1]:
+                self._best = (number, f1, model)
+
+    def _save_best_model(self, study):
+        """Write the best trial's model, cut to its early-stopping round so it
+        scores (and exports to ONNX) exactly as it was evaluated"""
+        if self._best is None or self._best[0] != study.best_trial.number:
+            return None
+        model = self._best[2]
+        booster = model.get_booster()
+        if model.best_iteration is not None:
+            booster = booster[: model.best_iteration + 1]
+        path = Path(self.config.best_model_path)
+        booster.save_model(path)
+        logger.info(f"Best trial's model ({booster.num_boosted_rounds()} trees) saved to: {path}")
+        return path
+
+    def create_sampler(self):
+        """The configured Optuna sampler (model_tuner.sampler in config.yaml)"""
+        import optuna
+
+        samplers = {
+            'tpe': optuna.samplers.TPESampler,
+            'cmaes': optuna.samplers.CmaEsSampler,
+            'qmc': optuna.samplers.QMCSampler,
+            'random': optuna.samplers.RandomSampler,
+        }
+        if self.config.sampler not in samplers:
+            raise ValueError(f"sampler must be one of {SAMPLERS}, got {self.config.sampler!r}")
+        return samplers[self.config.sampler](seed=self.config.sampler_seed, **self.config.sampler_options)
+
+    def create_pruner(self):
+        """The configured Optuna pruner (model_tuner.pruner in config.yaml)"""
+        import optuna
+
+        pruners = {
+            'median': optuna.pruners.MedianPruner,
+            'hyperband': optuna.pruners.HyperbandPruner,
+            'none': optuna.pruners.NopPruner,
+        }
+        if self.config.pruner not in pruners:
+            raise ValueError(f"pruner must be one of {PRUNERS}, got {self.config.pruner!r}")
+        return pruners[self.config.pruner](**self.config.pruner_options)
+
+    def create_study(self):
+        """Study with the configured sampler and pruner, seeded with the
+        current params.yaml values when warm_start is on"""
+        import optuna
+
+        logger.info(f"Creating Optuna study: {self.config.study_name} "
+                    f"(sampler={self.config.sampler}, pruner={self.config.pruner})")
+        study = optuna.create_study(
+            direction='maximize',  # Maximize F1 score
+            study_name=self.config.study_name,
+            sampler=self.create_sampler(),
+            pruner=self.create_pruner()
+        )
+        warm_start = {k: v for k, v in self.config.warm_start_params.items() if k in self.config.search_space}
+        if warm_start:
+            logger.info(f"Warm start: first trial uses the current params.yaml values {warm_start}")
+            study.enqueue_trial(warm_start, skip_if_exists=True)
+        return study
+
+    def load_split(self):
+        """Train/validation split of the transformed training data"""
         logger.info(f"Loading training data from: {self.config.train_data_path}")
-        train_data = pd.read_csv(self.config.train_data_path)
+        train_data = read_csv_typed(Path(self.config.train_data_path), self.config.feature_dtypes)
         
         # Split features and target
         X = train_data.drop(columns=[self.config.target_column])
@@ -87,6 +175,20 @@ class ModelTuner:
         )
         
         logger.info(f"Train set: {X_train.shape}, Validation set: {X_val.shape}")
+        return X_train, y_train, X_val, y_val
+    
+    def tune_hyperparameters(self):
+        """
+        Main tuning method using Optuna
+        """
+        # Imported here so that importing this module stays cheap
+        import mlflow
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        logger.info("Starting hyperparameter tuning with Optuna")
+        
+        X_train, y_train, X_val, y_val = self.load_split()
         
         # Setup MLflow
         mlflow.set_tracking_uri(self.config.mlflow_uri)
@@ -101,20 +203,16 @@ class ModelTuner:
         )
         
         # Create Optuna study
-        logger.info(f"Creating Optuna study: {self.config.study_name}")
-        study = optuna.create_study(
-            direction='maximize',  # Maximize F1 score
-            study_name=self.config.study_name,
-            sampler=optuna.samplers.TPESampler(seed=42)  # Tree-structured Parzen Estimator
-        )
+        study = self.create_study()
         
         # Run optimization
-        logger.info(f"Starting optimization with {self.config.n_trials} trials...")  # ✅ Fixed typo
+        logger.info(f"Starting optimization with {self.config.n_trials} trials on {self.config.n_jobs} worker(s)...")
         logger.info("This may take a while...")
         
         study.optimize(
             lambda trial: self.objective(trial, X_train, y_train, X_val, y_val),
             n_trials=self.config.n_trials,  # ✅ Fixed typo
+            n_jobs=self.config.n_jobs,
             callbacks=[mlflc],
             show_progress_bar=True
         )
@@ -134,29 +232,34 @@ class ModelTuner:
         logger.info("=" * 70)
         
         # Save best parameters to YAML
-        self._save_best_params(best_params)
+        self._save_best_params(best_params, study, self._save_best_model(study))
         
         # Generate optimization visualizations
         self._generate_visualizations(study)
 
         return best_params, best_score
     
-    def _save_best_params(self, best_params):
-        """Save best parameters to YAML file"""
+    def _save_best_params(self, best_params, study, model_path=None):
+        """Save best parameters to YAML file, with a record of the study and
+        training data they came from (read by the trainer with
+        params_source: tuned)"""
         # Format parameters for YAML (matching params.yaml structure)
+        cast = {'int': int, 'float': float}
         yaml_params = {
             'XGBBoost': {
-                'n_estimators': int(best_params['n_estimators']),
-                'max_depth': int(best_params['max_depth']),
-                'learning_rate': float(best_params['learning_rate']),
-                'scale_pos_weight': float(best_params['scale_pos_weight']),
-                'subsample': float(best_params['subsample']),
-                'colsample_bytree': float(best_params['colsample_bytree']),
-                'min_child_weight': int(best_params['min_child_weight']),
-                'gamma': float(best_params['gamma']),
-                'reg_alpha': float(best_params['reg_alpha']),
-                'reg_lambda': float(best_params['reg_lambda']),
+                **{name: cast[spec['type']](best_params[name]) for name, spec in self.config.search_space.items()},
                 'random_state': 42
+            },
+            'tuning': {
+                'study_name': self.config.study_name,
+                'sampler': self.config.sampler,
+                'best_trial': study.best_trial.number,
+                'best_f1': float(study.best_value),
+                'n_trials': len(study.trials),
+                'tuned_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'train_data_path': str(self.config.train_data_path),
+                'train_data_version': file_digest(Path(self.config.train_data_path)),
+                'model_path': str(model_path) if model_path else None
             }
         }
         
@@ -165,10 +268,12 @@ class ModelTuner:
             yaml.dump(yaml_params, f, default_flow_style=False)
         
         logger.info(f"Best parameters saved to: {self.config.best_params_path}")
-        logger.info("You can now copy these to params.yaml to use them in training!")
+        logger.info("Train with them by setting model_trainer.params_source: tuned (main.py does after tuning)")
     
     def _generate_visualizations(self, study):
         """Generate Optuna visualization plots and log to MLflow"""
+        import mlflow
+
         try:
             from optuna.visualization import (
                 plot_optimization_history,
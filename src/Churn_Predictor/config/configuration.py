@@ -1,6 +1,7 @@
 from src.Churn_Predictor.constants import *
-from src.Churn_Predictor.entity.config_entity import DataIngestionConfig, DataValidationConfig, DataTransformationConfig, ModelTunerConfig,ModelEvaluationConfig, ModelTrainerConfig
-from src.Churn_Predictor.utils.common import read_yaml, create_directories
+from src.Churn_Predictor.entity.config_entity import DataIngestionConfig, DataValidationConfig, DataTransformationConfig, ModelTunerConfig,ModelEvaluationConfig, ModelTrainerConfig, ModelCalibrationConfig
+from src.Churn_Predictor.utils.common import read_yaml, create_directories, params_digest, load_json, file_digest
+from src.Churn_Predictor import logger
 from pathlib import Path
 import os
 
@@ -26,10 +27,27 @@ class ConfigurationManager:
             root_dir=config.root_dir,
             dataset_slug=config.dataset_slug,
             local_data_file=config.local_data_file,
-            unzip_dir=config.unzip_dir
+            unzip_dir=config.unzip_dir,
+            mode=config.mode,
+            source_url=config.source_url,
+            source_sha256=config.source_sha256,
+            download_workers=config.download_workers,
+            download_part_mb=config.download_part_mb,
+            data_file=config.data_file,
+            synthetic_profile_path=config.synthetic_profile_path,
+            synthetic_data_file=config.synthetic_data_file,
+            synthetic_rows=config.synthetic_rows,
+            synthetic_seed=config.synthetic_seed,
+            synthetic_workers=config.synthetic_workers
         )
 
         return data_ingestion_config
+
+    def ingested_data_file(self) -> Path:
+        """The CSV data ingestion produced: the synthetic file in synthetic
+        mode, the extracted Kaggle / URL file otherwise"""
+        config = self.config.data_ingestion
+        return Path(config.synthetic_data_file if config.mode == "synthetic" else config.data_file)
     
     def get_data_validation_config(self) -> DataValidationConfig:
         config = self.config.data_validation
@@ -40,7 +58,7 @@ class ConfigurationManager:
         data_validation_config = DataValidationConfig(
             root_dir=config.root_dir,
             STATUS_FILE=config.STATUS_FILE,
-            unzipped_data_dir=config.unzipped_data_dir,
+            unzipped_data_dir=self.ingested_data_file(),
             all_schema=schema
         )
 
@@ -53,7 +71,13 @@ class ConfigurationManager:
 
         data_transformation_config = DataTransformationConfig(
             root_dir=config.root_dir,
-            data_path=config.data_path
+            data_path=self.ingested_data_file(),
+            reference_profile_path=config.reference_profile_path,
+            row_hash_index_path=config.row_hash_index_path,
+            dedup_mode=config.dedup_mode,
+            feature_table_dir=config.feature_table_dir,
+            raw_dtypes=dict(self.schema.RAW_DTYPES),
+            feature_dtypes=dict(self.schema.FEATURE_DTYPES)
         )
         return data_transformation_config 
     
@@ -68,16 +92,51 @@ class ConfigurationManager:
             test_data_path=config.test_data_path,
             target_column=target_column,
             n_trials=config.n_trials,
+            n_jobs=config.n_jobs,
             study_name=config.study_name,
             best_params_path=config.best_params_path,
-            mlflow_uri=os.getenv('MLFLOW_TRACKING_URI', 'file:./mlruns')  
+            best_model_path=config.best_model_path,
+            mlflow_uri=os.getenv('MLFLOW_TRACKING_URI', 'file:./mlruns'),
+            feature_dtypes=dict(self.schema.FEATURE_DTYPES),
+            sampler=config.sampler,
+            sampler_seed=config.sampler_seed,
+            sampler_options=dict(config.sampler_options.get(config.sampler, {})),
+            pruner=config.pruner,
+            pruner_options=dict(config.pruner_options.get(config.pruner, {})),
+            search_space={name: dict(spec) for name, spec in config.search_space.items()},
+            warm_start_params=dict(self.params.XGBBoost) if config.warm_start else {}
         )
         print(model_tuner_config)
         return model_tuner_config
     
-    def get_model_trainer_config(self) -> ModelTrainerConfig:
+    def resolve_training_params(self, source: str, tuned_params_path: Path):
+        """XGBBoost hyperparameters for training from the given source, as
+        (params, source used, version, tuning record). Tuned values override
+        params.yaml key by key; the version is a hash of the result."""
+        params = dict(self.params.XGBBoost)
+        tuning = {}
+        if source == 'tuned':
+            if tuned_params_path.exists():
+                tuned = read_yaml(tuned_params_path)
+                params.update(dict(tuned.XGBBoost))
+                tuning = dict(tuned.get('tuning') or {})
+            else:
+                logger.warning(f"No tuned parameters at {tuned_params_path}; using params.yaml")
+                source = 'params_yaml'
+        elif source != 'params_yaml':
+            raise ValueError(f"params_source must be params_yaml or tuned, got {source!r}")
+        version = params_digest(params)
+        logger.info(f"Training hyperparameters: {source} (version {version})")
+        return params, source, version, tuning
+
+    def get_model_trainer_config(self, params_source=None) -> ModelTrainerConfig:
+        """params_source overrides config.yaml model_trainer.params_source"""
         model_trainer_config = self.config.model_trainer
-        model_trainer_params = self.params.XGBBoost
+        model_trainer_params, params_source, params_version, tuning = self.resolve_training_params(
+            params_source or model_trainer_config.params_source, Path(model_trainer_config.tuned_params_path)
+        )
+        reuse = params_source == 'tuned' and model_trainer_config.reuse_tuned_model and tuning.get('model_path')
+        training_params = self.params.XGBTraining
         target_column = list(self.schema.TARGET_COLUMN.keys())[0]
         create_directories([model_trainer_config.root_dir])
         
@@ -86,25 +145,78 @@ class ConfigurationManager:
             train_data_path=model_trainer_config.train_data_path,
             test_data_path=model_trainer_config.test_data_path,
             model_name=model_trainer_config.model_name,
+            booster_name=model_trainer_config.booster_name,
+            metadata_name=model_trainer_config.metadata_name,
+            export_onnx=model_trainer_config.export_onnx,
+            onnx_model_name=model_trainer_config.onnx_model_name,
+            onnx_parity_tolerance=model_trainer_config.onnx_parity_tolerance,
             target_column=target_column,
-            learning_rate=model_trainer_params.learning_rate,
-            max_depth=model_trainer_params.max_depth,
-            n_estimators=model_trainer_params.n_estimators,
-            scale_pos_weight=model_trainer_params.scale_pos_weight,
-            subsample=model_trainer_params.subsample,
-            colsample_bytree=model_trainer_params.colsample_bytree,
-            random_state=model_trainer_params.random_state,
-            reg_lambda=model_trainer_params.reg_lambda,
-            reg_alpha=model_trainer_params.reg_alpha,
-            gamma=model_trainer_params.gamma,
-            min_child_weight=model_trainer_params.min_child_weight
+            params_source=params_source,
+            params_version=params_version,
+            tuned_model_path=Path(tuning['model_path']) if reuse else None,
+            tuned_data_version=tuning.get('train_data_version') if reuse else None,
+            training_mode=model_trainer_config.training_mode,
+            new_data_path=model_trainer_config.new_data_path,
+            incremental_strategy=model_trainer_config.incremental_strategy,
+            incremental_rounds=model_trainer_config.incremental_rounds,
+            learning_rate=model_trainer_params['learning_rate'],
+            max_depth=model_trainer_params['max_depth'],
+            n_estimators=model_trainer_params['n_estimators'],
+            scale_pos_weight=model_trainer_params['scale_pos_weight'],
+            subsample=model_trainer_params['subsample'],
+            colsample_bytree=model_trainer_params['colsample_bytree'],
+            random_state=model_trainer_params['random_state'],
+            reg_lambda=model_trainer_params['reg_lambda'],
+            reg_alpha=model_trainer_params['reg_alpha'],
+            gamma=model_trainer_params['gamma'],
+            min_child_weight=model_trainer_params['min_child_weight'],
+            tree_method=training_params.tree_method,
+            n_jobs=training_params.n_jobs,
+            max_bin=training_params.max_bin,
+            dtype=training_params.dtype,
+            feature_dtypes=dict(self.schema.FEATURE_DTYPES)
         )
         
         return model_trainer_config
 
-    def get_model_evaluation_config(self) -> ModelEvaluationConfig:
+    def get_model_calibration_config(self) -> ModelCalibrationConfig:
+        config = self.config.model_calibration
+
+        create_directories([config.root_dir])
+
+        model_calibration_config = ModelCalibrationConfig(
+            root_dir=config.root_dir,
+            model_path=Path(config.model_path),
+            train_data_path=Path(config.train_data_path),
+            method=config.method,
+            cv_folds=config.cv_folds,
+            table_size=config.table_size,
+            reliability_bins=config.reliability_bins,
+            calibration_file_name=Path(config.calibration_file_name)
+        )
+        return model_calibration_config
+
+    def evaluated_model_params(self, model_path: Path, params_source=None):
+        """Hyperparameters the model at model_path was trained with, as
+        (params, source, version): from the trainer's model_metadata.json
+        when it describes this model file, else resolved the way the trainer
+        would (params_source, default: config.yaml)"""
+        trainer = self.config.model_trainer
+        metadata_path = Path(trainer.root_dir) / trainer.metadata_name
+        if metadata_path.exists() and model_path.exists():
+            metadata = load_json(metadata_path)
+            if metadata.get("native_model", {}).get("version") == file_digest(model_path):
+                return dict(metadata.params), metadata.params_source, metadata.params_version
+        params, source, version, _ = self.resolve_training_params(
+            params_source or trainer.params_source, Path(trainer.tuned_params_path)
+        )
+        return params, source, version
+
+    def get_model_evaluation_config(self, params_source=None) -> ModelEvaluationConfig:
+        """params_source: where the evaluated model's hyperparameters came
+        from, used when model_metadata.json does not describe it"""
         config = self.config.model_evaluation
-        params = self.params.XGBBoost
+        params, params_source, params_version = self.evaluated_model_params(Path(config.model_path), params_source)
         target_column = list(self.schema.TARGET_COLUMN.keys())[0]
         
         create_directories([config.root_dir])
@@ -114,9 +226,19 @@ class ConfigurationManager:
             test_data_path=config.test_data_path,
             model_path=config.model_path,
             all_params=params,
+            params_source=params_source,
+            params_version=params_version,
             metric_file_name=Path(config.metric_file_name),
             target_column=target_column,
-            mlflow_uri=os.getenv("MLFLOW_TRACKING_URI")
+            mlflow_uri=os.getenv("MLFLOW_TRACKING_URI"),
+            feature_dtypes=dict(self.schema.FEATURE_DTYPES),
+            probabilities_cache=Path(config.probabilities_cache),
+            calibration_report_name=Path(config.calibration_report_name),
+            reliability_bins=config.reliability_bins,
+            optimize_threshold=config.optimize_threshold,
+            threshold_file_name=Path(config.threshold_file_name),
+            cost_matrix=dict(config.cost_matrix),
+            campaign_capacity=float(config.campaign_capacity)
         )
         return model_evaluation_config
 
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 
 @dataclass(frozen=True)
@@ -8,6 +9,17 @@ class DataIngestionConfig:
     dataset_slug: str
     local_data_file: Path
     unzip_dir: Path
+    mode: str
+    source_url: str
+    source_sha256: str
+    download_workers: int
+    download_part_mb: float
+    data_file: Path
+    synthetic_profile_path: Path
+    synthetic_data_file: Path
+    synthetic_rows: int
+    synthetic_seed: int
+    synthetic_workers: int
 
 @dataclass(frozen=True)
 class DataValidationConfig:
@@ -20,6 +32,12 @@ class DataValidationConfig:
 class DataTransformationConfig:
     root_dir: Path
     data_path: Path
+    reference_profile_path: Path
+    row_hash_index_path: Path
+    dedup_mode: str
+    feature_table_dir: Path
+    raw_dtypes: dict
+    feature_dtypes: dict
     
 @dataclass(frozen=True)
 class ModelTunerConfig:
@@ -28,9 +46,19 @@ class ModelTunerConfig:
     test_data_path: Path
     target_column: str
     n_trials: int
+    n_jobs: int
     study_name: str
     best_params_path: Path
+    best_model_path: Path
     mlflow_uri: str     
+    feature_dtypes: dict
+    sampler: str
+    sampler_seed: int
+    sampler_options: dict
+    pruner: str
+    pruner_options: dict
+    search_space: dict
+    warm_start_params: dict
 
 @dataclass(frozen=True)
 class ModelTrainerConfig:
@@ -38,7 +66,20 @@ class ModelTrainerConfig:
     train_data_path: Path
     test_data_path: Path
     model_name: str
+    booster_name: str
+    metadata_name: str
+    export_onnx: bool
+    onnx_model_name: str
+    onnx_parity_tolerance: float
     target_column: str
+    params_source: str
+    params_version: str
+    tuned_model_path: Optional[Path]
+    tuned_data_version: Optional[str]
+    training_mode: str
+    new_data_path: Path
+    incremental_strategy: str
+    incremental_rounds: int
     learning_rate: float
     max_depth: int
     n_estimators: int
@@ -50,6 +91,22 @@ class ModelTrainerConfig:
     reg_alpha: float
     gamma: float
     min_child_weight: int
+    tree_method: str
+    n_jobs: int
+    max_bin: int
+    dtype: str
+    feature_dtypes: dict
+
+@dataclass(frozen=True)
+class ModelCalibrationConfig:
+    root_dir: Path
+    model_path: Path
+    train_data_path: Path
+    method: str
+    cv_folds: int
+    table_size: int
+    reliability_bins: int
+    calibration_file_name: Path
 
 @dataclass 
 class ModelEvaluationConfig:
@@ -57,6 +114,16 @@ class ModelEvaluationConfig:
     test_data_path: Path
     model_path: Path
     all_params: dict
+    params_source: str
+    params_version: str
     metric_file_name: Path
     target_column: str
-    mlflow_uri: str
\ No newline at end of file
+    mlflow_uri: str
+    feature_dtypes: dict
+    probabilities_cache: Path
+    calibration_report_name: Path
+    reliability_bins: int
+    optimize_threshold: bool
+    threshold_file_name: Path
+    cost_matrix: dict
+    campaign_capacity: float
\ No newline at end of file
@@ -13,8 +13,7 @@ class DataIngestionPipeline:
             config = ConfigurationManager()
             data_ingestion_config = config.get_data_ingestion_config()
             data_ingestion = DataIngestion(config=data_ingestion_config)
-            data_ingestion.download_data()
-            data_ingestion.extract_zip_file()
+            data_ingestion.fetch_and_prepare_data()
         except Exception as e:
             logger.error(f"Error in {STAGE_NAME} stage: {e}")
             raise e
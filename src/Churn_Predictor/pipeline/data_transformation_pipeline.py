@@ -14,8 +14,10 @@ class DataTransformationPipeline:
             data_transformation_config = config.get_data_transformation_config()
             data_transformation = DataTransformation(config=data_transformation_config)
             df = data_transformation.initiate_data_transformation()
+            data_transformation.save_reference_profile(df)
             df = data_transformation.initiate_data_preprocessing(df)
             data_transformation.initiate_train_test_split(df)
+            data_transformation.save_feature_table()
         except Exception as e:
             logger.exception(f"An error occurred during data transformation: {e}")
         
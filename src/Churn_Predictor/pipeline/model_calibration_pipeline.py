@@ -0,0 +1,33 @@
+from src.Churn_Predictor.config.configuration import ConfigurationManager
+from src.Churn_Predictor.components.model_trainer import ModelTrainer
+from src.Churn_Predictor.components.model_calibration import ModelCalibration
+from src.Churn_Predictor import logger
+
+STAGE_NAME = "Model Calibration Stage"
+
+class ModelCalibrationPipeline:
+    def __init__(self, params_source=None):
+        """params_source: the hyperparameters the model was trained with
+        (params_yaml or tuned, default: config.yaml), for the out-of-fold refits"""
+        self.params_source = params_source
+
+    def initiate_model_calibration(self):
+        try:
+            config = ConfigurationManager()
+            model_calibration_config = config.get_model_calibration_config()
+            trainer = ModelTrainer(config=config.get_model_trainer_config(params_source=self.params_source))
+            model_calibration = ModelCalibration(config=model_calibration_config, trainer=trainer)
+            model_calibration.calibrate_model()
+        except Exception as e:
+            logger.exception(f"Error in {STAGE_NAME}: {e}")
+            raise e
+
+if __name__ == "__main__":
+    try:
+        logger.info(f"Starting {STAGE_NAME}")
+        model_calibration_pipeline = ModelCalibrationPipeline()
+        model_calibration_pipeline.initiate_model_calibration()
+        logger.info(f"Completed {STAGE_NAME}")
+    except Exception as e:
+        logger.exception(f"Error in {STAGE_NAME}: {e}")
+        raise e
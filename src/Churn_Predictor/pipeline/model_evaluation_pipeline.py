@@ -3,17 +3,20 @@ from src.Churn_Predictor import logger
 from src.Churn_Predictor.config.configuration import ConfigurationManager
 from src.Churn_Predictor.components.model_evaluation import ModelEvaluation
 
+load_dotenv()
+
 STAGE_NAME = "Model Evaluation Stage"
 
 class ModelEvaluationPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, params_source=None):
+        """params_source: the hyperparameters the model was trained with
+        (params_yaml or tuned), logged when model_metadata.json is missing"""
+        self.params_source = params_source
 
     def initiate_model_evaluation(self):
         try:
-            from dotenv import load_dotenv
             config = ConfigurationManager()
-            model_evaluation_config = config.get_model_evaluation_config()
+            model_evaluation_config = config.get_model_evaluation_config(params_source=self.params_source)
             model_evaluation = ModelEvaluation(config=model_evaluation_config)
             model_evaluation.initiate_model_evaluation()
         except Exception as e:
@@ -5,13 +5,14 @@ from src.Churn_Predictor import logger
 STAGE_NAME = "Model Trainer Stage"
 
 class ModelTrainerPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, params_source=None):
+        """params_source: params_yaml or tuned (default: config.yaml)"""
+        self.params_source = params_source
 
     def initiate_model_trainer(self):
         try:
             config = ConfigurationManager()
-            modeltrainer_config = config.get_model_trainer_config()
+            modeltrainer_config = config.get_model_trainer_config(params_source=self.params_source)
             modeltrainer = ModelTrainer(config=modeltrainer_config)
             modeltrainer.train_model()
         except Exception as e:
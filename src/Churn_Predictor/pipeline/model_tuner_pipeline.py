@@ -1,7 +1,9 @@
+from dotenv import load_dotenv
 from src.Churn_Predictor import logger
 from src.Churn_Predictor.config.configuration import ConfigurationManager
 from src.Churn_Predictor.components.model_tuner import ModelTuner
 
+load_dotenv()
 
 STAGE_NAME = "Model Tuner Stage"
 
@@ -1,14 +1,25 @@
-import joblib
-import numpy as np
-import pandas as pd
 from pathlib import Path
+from churn_inference import (
+    ModelHandle, normalize_record, encode_record, rows_to_array, format_result
+)
 
 
 class PredictionPipeline:
-    def __init__(self):
-        self.model = joblib.load(Path('artifacts/model_trainer/model.joblib'))
+    def __init__(self, model_path=Path('artifacts/model_trainer/model.ubj'), backend='native'):
+        """backend='onnx' scores model_path (e.g. model.onnx) with ONNX Runtime"""
+        self.handle = ModelHandle(model_path, backend=backend)
+        self.model = self.handle.load()
 
     def predict(self,data):
-        prediction = self.model.predict(data)
+        """Class labels (0/1) for model-ready rows (EXPECTED_COLS frame or array)"""
+        prediction = (self.handle.score(data) > self.handle.threshold).astype(int)
 
-        return prediction
\ No newline at end of file
+        return prediction
+
+    def predict_records(self, records):
+        """Scored results (same payload as the web front ends) for raw customer records"""
+        rows = [encode_record(normalize_record(record)) for record in records]
+        return [
+            format_result(probability, threshold=self.handle.threshold, risk_bands=self.handle.risk_bands)
+            for probability in self.handle.score(rows_to_array(rows))
+        ]
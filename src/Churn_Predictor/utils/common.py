@@ -1,4 +1,5 @@
 import os
+import hashlib
 import yaml
 from src.Churn_Predictor import logger
 import json
@@ -101,4 +102,73 @@ def load_bin(path: Path) -> Any:
     """
     data = joblib.load(path)
     logger.info(f"binary file loaded from: {path}")
-    return data
\ No newline at end of file
+    return data
+
+@ensure_annotations
+def load_classifier(path: Path):
+    """load a trained XGBClassifier
+
+    Args:
+        path (Path): native model file (.ubj / .json, what ModelTrainer
+            writes as booster_name) or a joblib pickle of older artifacts
+
+    Returns:
+        XGBClassifier: the model
+    """
+    if path.suffix in (".ubj", ".json"):
+        from xgboost import XGBClassifier
+
+        model = XGBClassifier()
+        model.load_model(path)
+    else:
+        model = joblib.load(path)
+    logger.info(f"model loaded from: {path}")
+    return model
+
+@ensure_annotations
+def file_digest(path: Path, length: int = 12) -> str:
+    """short sha256 content hash, used as model / data version
+
+    Args:
+        path (Path): path to file
+        length (int, optional): number of hex characters kept. Defaults to 12.
+
+    Returns:
+        str: hex digest prefix
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
+
+@ensure_annotations
+def params_digest(params: dict, length: int = 12) -> str:
+    """short sha256 hash of a hyperparameter set, used as params version
+
+    Args:
+        params (dict): parameter name -> value
+        length (int, optional): number of hex characters kept. Defaults to 12.
+
+    Returns:
+        str: hex digest prefix (independent of key order)
+    """
+    canonical = json.dumps(dict(params), sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:length]
+
+@ensure_annotations
+def read_csv_typed(path: Path, dtypes: dict, **kwargs):
+    """read a csv with a dtype policy (schema.yaml RAW_DTYPES / FEATURE_DTYPES)
+
+    Args:
+        path (Path): path to csv file
+        dtypes (dict): column -> dtype; columns not in the file are ignored
+
+    Returns:
+        pd.DataFrame: data parsed straight into the compact dtypes
+    """
+    import pandas as pd
+
+    header = pd.read_csv(path, nrows=0, **kwargs).columns
+    dtype = {col: dtypes[col] for col in header if col in dtypes}
+    return pd.read_csv(path, dtype=dtype, **kwargs)
@@ -0,0 +1,172 @@
+"""
+Dataset download and extraction (src/Churn_Predictor/components/data_sources.py
+and DataIngestion) against a local HTTP stand-in for the dataset host.
+
+The stand-in is http.server on a random port serving one fixture archive
+with ETag, Accept-Ranges and single-range (206) responses, recording every
+range it was asked for and optionally failing a chosen one.
+"""
+import hashlib
+import io
+import json
+import random
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.Churn_Predictor.components.data_sources import HTTPSource, download, extract_changed
+from src.Churn_Predictor.components.data_ingestion import DataIngestion
+from src.Churn_Predictor.entity.config_entity import DataIngestionConfig
+
+PART_SIZE = 16 * 1024
+
+
+def make_archive() -> bytes:
+    """A zip with one CSV member large enough to span several download parts"""
+    rng = random.Random(0)
+    rows = ["customerID,tenure,MonthlyCharges,Churn"] + [
+        f"{rng.randrange(10 ** 9):09d},{rng.randrange(72)},{rng.uniform(18, 120):.2f},{rng.choice('YN')}"
+        for _ in range(20000)
+    ]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("telco.csv", "\n".join(rows))
+    return buffer.getvalue()
+
+
+ARCHIVE = make_archive()
+ARCHIVE_SHA256 = hashlib.sha256(ARCHIVE).hexdigest()
+
+
+class FixtureServer(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RangeHandler)
+        self.body = ARCHIVE
+        self.ranges = []        # (start, end) of every ranged GET served
+        self.fail_ranges = set()  # starts answered with HTTP 500 (once each)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/telco.zip"
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _headers(self, status: int, length: int, extra=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", '"fixture"')
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._headers(200, len(self.server.body))
+
+    def do_GET(self):
+        body = self.server.body
+        header = self.headers.get("Range")
+        if header is None:
+            self._headers(200, len(body))
+            self.wfile.write(body)
+            return
+        start, end = (int(v) for v in header.removeprefix("bytes=").split("-"))
+        if start in self.server.fail_ranges:
+            self.server.fail_ranges.discard(start)
+            self._headers(500, 0)
+            return
+        self.server.ranges.append((start, end))
+        chunk = body[start:end + 1]
+        self._headers(206, len(chunk), {"Content-Range": f"bytes {start}-{end}/{len(body)}"})
+        self.wfile.write(chunk)
+
+
+@pytest.fixture
+def server():
+    srv = FixtureServer()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_download_resumes_from_part_file(server, tmp_path):
+    dest = tmp_path / "telco.zip"
+    n_parts = -(-len(ARCHIVE) // PART_SIZE)
+    assert n_parts >= 4
+    failing = 2 * PART_SIZE
+    server.fail_ranges.add(failing)
+
+    with pytest.raises(Exception):
+        download(HTTPSource(server.url), dest, part_size=PART_SIZE, workers=1)
+    assert not dest.exists()
+    state = json.loads((tmp_path / "telco.zip.part.json").read_text())
+    # The other parts finished; the failed one is all that is missing
+    assert sorted(state["done"]) == [i for i in range(n_parts) if i != 2]
+
+    server.ranges.clear()
+    digest = download(HTTPSource(server.url), dest, part_size=PART_SIZE, workers=1, expected_sha256=ARCHIVE_SHA256)
+    assert digest == ARCHIVE_SHA256
+    assert dest.read_bytes() == ARCHIVE
+    # Only the part missing from the .part file was requested again
+    assert [start for start, _ in server.ranges] == [failing]
+    assert not (tmp_path / "telco.zip.part").exists()
+    assert not (tmp_path / "telco.zip.part.json").exists()
+
+
+def test_download_rejects_checksum_mismatch(server, tmp_path):
+    dest = tmp_path / "telco.zip"
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        download(HTTPSource(server.url), dest, part_size=PART_SIZE, workers=2, expected_sha256="0" * 64)
+    assert not dest.exists()
+    assert not (tmp_path / "telco.zip.part").exists()
+    assert not (tmp_path / "telco.zip.part.json").exists()
+
+
+def ingestion_config(tmp_path, url: str) -> DataIngestionConfig:
+    return DataIngestionConfig(
+        root_dir=tmp_path, dataset_slug="", local_data_file=tmp_path / "data.zip",
+        unzip_dir=tmp_path / "raw_data", mode="url", source_url=url, source_sha256="",
+        download_workers=2, download_part_mb=PART_SIZE / 1024 / 1024, data_file=tmp_path / "raw_data" / "telco.csv",
+        synthetic_profile_path=tmp_path / "profile.json", synthetic_data_file=tmp_path / "raw_data" / "synthetic.csv",
+        synthetic_rows=0, synthetic_seed=0, synthetic_workers=1,
+    )
+
+
+def test_truncated_archive_is_fetched_again(server, tmp_path):
+    config = ingestion_config(tmp_path, server.url)
+    config.local_data_file.write_bytes(ARCHIVE[: len(ARCHIVE) // 2])
+
+    DataIngestion(config).download_data()
+    assert config.local_data_file.read_bytes() == ARCHIVE
+    assert server.ranges, "the truncated archive was not downloaded again"
+
+    server.ranges.clear()
+    DataIngestion(config).download_data()
+    assert server.ranges == [], "a valid archive was downloaded again"
+
+
+def test_extraction_skipped_while_manifest_unchanged(tmp_path):
+    archive = tmp_path / "telco.zip"
+    archive.write_bytes(ARCHIVE)
+    target, manifest = tmp_path / "raw_data", tmp_path / "extract_manifest.json"
+
+    assert extract_changed(archive, target, manifest) is True
+    assert (target / "telco.csv").read_bytes() == zipfile.ZipFile(archive).read("telco.csv")
+    assert extract_changed(archive, target, manifest) is False
+
+    # A missing member, or a different archive, extracts again
+    (target / "telco.csv").unlink()
+    assert extract_changed(archive, target, manifest) is True
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("telco.csv", "customerID,Churn\n1,Y\n")
+    archive.write_bytes(buffer.getvalue())
+    assert extract_changed(archive, target, manifest) is True
+    assert (target / "telco.csv").read_text() == "customerID,Churn\n1,Y\n"
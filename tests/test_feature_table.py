@@ -0,0 +1,45 @@
+"""
+Feature table keys: the vectorized ID hashing and slot table
+DataTransformation builds against the per-lookup hash the backend's feature
+store probes with (churn_inference.customer_key_hash).
+"""
+import numpy as np
+
+from churn_inference import customer_key_hash, customer_key_hashes
+from src.Churn_Predictor.components.data_transformation import DataTransformation
+
+
+def encode(ids) -> np.ndarray:
+    return np.char.encode(np.array(ids), "utf-8")
+
+
+def probe(slots, ids, customer_id: str):
+    """The backend's lookup: linear probing from the key's home slot"""
+    mask = len(slots) - 1
+    slot = customer_key_hash(customer_id) & mask
+    while slots[slot] >= 0:
+        if ids[slots[slot]] == customer_id.encode("utf-8"):
+            return int(slots[slot])
+        slot = (slot + 1) & mask
+    return None
+
+
+def test_vectorized_hash_matches_scalar():
+    ids = ["7590-VHVEG", "", "a", "0002-ORFBO", "ü-ß-ç", "x" * 40]
+    assert customer_key_hashes(encode(ids)).tolist() == [customer_key_hash(i) for i in ids]
+
+
+def test_slot_table_finds_every_id():
+    ids = [f"{i:04d}-{'ABCDEFGHIJ'[i % 10] * 5}" for i in range(5000)]
+    encoded = encode(ids)
+    # A small capacity forces long probe chains and many collisions
+    slots = DataTransformation.slot_table(encoded, 8192)
+    assert all(probe(slots, encoded, customer_id) == row for row, customer_id in enumerate(ids))
+    assert probe(slots, encoded, "unknown") is None
+
+
+def test_repeated_id_keeps_latest_row():
+    encoded = encode(["a", "b", "a", "c"])
+    slots = DataTransformation.slot_table(encoded, 8)
+    assert sorted(slots[slots >= 0].tolist()) == [1, 2, 3]
+    assert probe(slots, encoded, "a") == 2